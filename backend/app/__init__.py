@@ -1,19 +1,42 @@
 from flask import Flask
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from app.utils.replica import RoutingSession
+from app.utils.tokens import JWTManager
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 
-def create_app():
+def create_app(config_object="app.config.config.Config"):
     app = Flask(__name__)
-    app.config.from_object("app.config.config.Config")
+    app.config.from_object(config_object)
 
     CORS(app)
     db.init_app(app)
     jwt.init_app(app)
 
+    # SQLite: FKs, WAL y pragmas en cada conexión; mantenimiento periódico
+    from app.utils.sqlite import init_sqlite
+    init_sqlite(app, db)
+
+    # Réplica de lectura opcional para las peticiones GET
+    from app.utils.replica import init_replica
+    init_replica(app)
+
+    from app.utils.metrics import init_metrics
+    init_metrics(app)
+
+    from app.utils.cache import init_cache
+    init_cache(app)
+
+    # Eventos de órdenes para los tableros (SSE)
+    from app.utils.events import init_order_events
+    init_order_events(app)
+
+    from app.utils.profiling import init_slow_query_log, init_request_profiler
+    init_slow_query_log(app, db)
+    init_request_profiler(app)
+
     from app.routes.health import health_bp
     app.register_blueprint(health_bp)
 
@@ -29,19 +52,20 @@ def create_app():
     from app.routes.reports import reports_bp
     app.register_blueprint(reports_bp)
 
-    from app.routes.ai import ai_bp
-    app.register_blueprint(ai_bp)
-
     from app.routes.payments import payments_bp
     app.register_blueprint(payments_bp)
 
     from app.routes.vehicles import vehicles_bp
     app.register_blueprint(vehicles_bp)
 
-    from app.routes.marketplace import marketplace_bp
-    app.register_blueprint(marketplace_bp)
+    from app.routes.sync import sync_bp
+    app.register_blueprint(sync_bp)
+
+    from app.routes.batch import batch_bp
+    app.register_blueprint(batch_bp)
 
-    from app.routes.users import users_bp
-    app.register_blueprint(users_bp)
+    # Blueprints poco usados (ai, marketplace, users): se importan al primer uso
+    from app.routes import register_lazy_blueprints
+    register_lazy_blueprints(app)
 
     return app
@@ -2,10 +2,80 @@
 import os
 from dotenv import load_dotenv
 # 
-load_dotenv()
+# Ruta explícita: evita que find_dotenv recorra la pila y el disco al importar
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
 # 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-super-secret")
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI") or os.getenv("DATABASE_URL") or "sqlite:///local.db"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Réplica de lectura opcional: los GET leen de ella salvo tras una escritura reciente
+    SQLALCHEMY_REPLICA_URI = os.getenv("SQLALCHEMY_REPLICA_URI")
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "10"))
+
+    # Instrumentación: métricas por ruta en /metrics y header Server-Timing opcional
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+    # Acceso a /metrics: IPs permitidas (por defecto solo localhost), token Bearer
+    # para el scraper o METRICS_PUBLIC=true para abrirlo a todos
+    METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1")
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+
+    # Diagnóstico: log de consultas lentas (0 = desactivado) y perfilado ?__profile=1 (solo admin)
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0"))
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_DIR = os.getenv("PROFILE_DIR")
+
+    # Caché de lecturas: 'memory' (LRU por proceso) o 'redis' (compartida entre workers)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+    CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", "60"))
+
+    # Eventos de órdenes (SSE): intervalo de lectura de la tabla, duración de
+    # cada conexión, keep-alive y retención de eventos
+    EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "1"))
+    EVENTS_STREAM_TIMEOUT = float(os.getenv("EVENTS_STREAM_TIMEOUT", "300"))
+    EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+    EVENTS_RETENTION_HOURS = float(os.getenv("EVENTS_RETENTION_HOURS", "24"))
+    # Cada stream ocupa un hilo del worker: máximo por proceso (gunicorn usa 4
+    # hilos; en modo ASGI se puede subir) y vida del ticket de ?ticket=
+    EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", "2"))
+    EVENTS_TICKET_TTL = int(os.getenv("EVENTS_TICKET_TTL", "60"))
+
+    # Sync incremental (/api/sync): antigüedad mínima de un cambio para entregarlo
+    # (margen para transacciones que aún no confirmaron)
+    SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", "2"))
+
+    # /api/batch: sub-peticiones por lote e hilos para lotes de solo lectura en paralelo
+    BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+    # Archivo histórico: meses que quedan en las tablas activas y carpeta de los
+    # meses exportados a .jsonl.gz
+    ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "12"))
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(BASE_DIR, "archive"))
+
+    # SQLite (sqlite:///local.db): WAL para que las lecturas no esperen a las
+    # escrituras, pragmas por conexión y PRAGMA optimize/checkpoint periódicos
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_MAINTENANCE_INTERVAL = float(os.getenv("SQLITE_MAINTENANCE_INTERVAL", "3600"))
+
+    # Migraciones: tiempo máximo de espera por locks en Postgres (evita bloquear el taller)
+    MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+
+    # Modo ASGI (asgi.py): hilos del pool que ejecutan handlers por proceso
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", "32"))
+
+    # Arranque: registra ai, marketplace y users sin importarlos hasta su primer uso
+    LAZY_BLUEPRINTS = os.getenv("LAZY_BLUEPRINTS", "true").lower() == "true"
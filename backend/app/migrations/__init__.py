@@ -0,0 +1,349 @@
+import importlib
+import pkgutil
+from datetime import datetime
+
+from sqlalchemy import (
+    CheckConstraint, Column, DateTime, ForeignKeyConstraint, Integer, MetaData, String, Table,
+    UniqueConstraint, inspect, select, text,
+)
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+# ==============================================================================
+# Migraciones de Esquema Versionadas
+# ==============================================================================
+# Cada archivo en app/migrations/versions/ es una migración con:
+#   revision (str):       Versión, p. ej. "0003". Define el orden de aplicación.
+#   description (str):    Texto corto para el historial.
+#   transactional (bool): False si la migración debe correr fuera de una
+#                         transacción (p. ej. CREATE INDEX CONCURRENTLY).
+#   upgrade(op) / downgrade(op): Reciben un objeto Operations.
+#
+# Las migraciones no importan app.models: las tablas que crean se definen en
+# el propio archivo (sqlalchemy.Table) o se leen de la base (op.reflect_table),
+# para que una revisión haga siempre lo mismo aunque los modelos cambien.
+#
+# El historial se guarda en la tabla `schema_migrations`.
+# ==============================================================================
+
+VERSIONS_PACKAGE = 'app.migrations.versions'
+
+history_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', history_metadata,
+    Column('version', String(32), primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+class MigrationError(Exception):
+    """Error al descubrir o aplicar migraciones."""
+
+
+class Operations:
+    """
+    Operaciones de esquema seguras para ejecutar en línea.
+
+    - En Postgres, los índices se crean con CONCURRENTLY cuando la migración no
+      es transaccional, y las migraciones transaccionales usan lock_timeout para
+      no bloquear el taller esperando un lock.
+    - En SQLite, las alteraciones que ALTER TABLE no soporta se hacen en modo
+      "batch": se reconstruye la tabla y se copian los datos (rebuild_table).
+    """
+
+    def __init__(self, connection, transactional=True):
+        self.connection = connection
+        self.transactional = transactional
+
+    @property
+    def dialect(self):
+        return self.connection.dialect.name
+
+    @property
+    def is_postgres(self):
+        return self.dialect == 'postgresql'
+
+    @property
+    def is_sqlite(self):
+        return self.dialect == 'sqlite'
+
+    def execute(self, sql, **params):
+        """Ejecuta SQL literal con parámetros con nombre."""
+        if isinstance(sql, str):
+            sql = text(sql)
+        return self.connection.execute(sql, params)
+
+    # --- Introspección -------------------------------------------------------
+    def has_table(self, table_name):
+        return inspect(self.connection).has_table(table_name)
+
+    def has_column(self, table_name, column_name):
+        columns = inspect(self.connection).get_columns(table_name)
+        return any(c['name'] == column_name for c in columns)
+
+    def has_index(self, table_name, index_name):
+        indexes = inspect(self.connection).get_indexes(table_name)
+        return any(i['name'] == index_name for i in indexes)
+
+    # --- Tablas ----------------------------------------------------------------
+    def create_table(self, table):
+        """Crea una tabla (objeto sqlalchemy.Table) si no existe."""
+        table.create(self.connection, checkfirst=True)
+
+    def create_all(self, metadata):
+        """Crea todas las tablas de un MetaData que aún no existan."""
+        metadata.create_all(self.connection, checkfirst=True)
+
+    def add_column(self, table_name, column):
+        """
+        Agrega una columna (objeto sqlalchemy.Column) si no existe.
+        Solo se copian la FK y el default del servidor; los índices van aparte.
+        """
+        if self.has_column(table_name, column.name):
+            return
+        ddl = str(CreateColumn(column).compile(dialect=self.connection.dialect))
+        for fk in column.foreign_keys:
+            ref_table, ref_column = fk.target_fullname.split('.')
+            ddl += f" REFERENCES {ref_table}({ref_column})"
+            if fk.ondelete:
+                ddl += f" ON DELETE {fk.ondelete}"
+        self.execute(f"ALTER TABLE {table_name} ADD COLUMN {ddl}")
+
+    def drop_column(self, table_name, column_name):
+        if not self.has_column(table_name, column_name):
+            return
+        if self.is_sqlite:
+            # SQLite no puede eliminar columnas con FK o índices: modo batch
+            self.rebuild_table(self.reflect_table(table_name), exclude=(column_name,))
+            return
+        self.execute(f"ALTER TABLE {table_name} DROP COLUMN {column_name}")
+
+    def reflect_table(self, table_name):
+        """Lee la definición actual de una tabla desde la base de datos."""
+        return Table(table_name, MetaData(), autoload_with=self.connection)
+
+    def rebuild_table(self, table, exclude=()):
+        """
+        Modo batch de SQLite: reconstruye la tabla según la definición de
+        `table` (columnas, FKs, restricciones), omitiendo las columnas de
+        `exclude`, y copia los datos de las columnas comunes.
+        Se usa para cambios que SQLite no permite con ALTER TABLE.
+        """
+        name = table.name
+        existing = {c['name'] for c in inspect(self.connection).get_columns(name)}
+        tmp = _batch_copy(table, f"_batch_{name}", exclude)
+        shared = [c.name for c in tmp.columns if c.name in existing]
+
+        self.connection.execute(CreateTable(tmp))
+        column_list = ', '.join(shared)
+        self.execute(f"INSERT INTO _batch_{name} ({column_list}) SELECT {column_list} FROM {name}")
+        self.execute(f"DROP TABLE {name}")
+        self.execute(f"ALTER TABLE _batch_{name} RENAME TO {name}")
+        for index in table.indexes:
+            if not any(c.name in exclude for c in index.columns):
+                index.create(self.connection, checkfirst=True)
+
+    # --- Índices ---------------------------------------------------------------
+    def create_index(self, name, table_name, columns, unique=False, where=None):
+        """
+        Crea un índice si no existe.
+
+        Args:
+            name (str): Nombre del índice.
+            table_name (str): Tabla.
+            columns (list[str]): Columnas o expresiones (ej: "created_at DESC").
+            unique (bool): Índice único.
+            where (str, optional): Condición para índice parcial.
+        """
+        concurrently = ' CONCURRENTLY' if self.is_postgres and not self.transactional else ''
+        sql = (f"CREATE {'UNIQUE ' if unique else ''}INDEX{concurrently} IF NOT EXISTS {name} "
+               f"ON {table_name} ({', '.join(columns)})")
+        if where:
+            sql += f" WHERE {where}"
+        self.execute(sql)
+
+    def drop_index(self, name):
+        concurrently = ' CONCURRENTLY' if self.is_postgres and not self.transactional else ''
+        self.execute(f"DROP INDEX{concurrently} IF EXISTS {name}")
+
+
+def _batch_copy(table, name, exclude=()):
+    """
+    Copia la definición de `table` con otro nombre y sin las columnas de
+    `exclude`. Las tablas referenciadas por FKs se agregan como tablas mínimas
+    para que el DDL compile sin depender del MetaData original.
+    """
+    metadata = MetaData()
+    columns = []
+    for column in table.columns:
+        if column.name in exclude:
+            continue
+        columns.append(Column(
+            column.name, column.type,
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            autoincrement=column.autoincrement,
+            server_default=column.server_default.arg if column.server_default is not None else None,
+        ))
+
+    constraints = []
+    for constraint in table.constraints:
+        keys = [c.name for c in constraint.columns]
+        if any(k in exclude for k in keys):
+            continue
+        if isinstance(constraint, ForeignKeyConstraint):
+            targets = [fk.target_fullname for fk in constraint.elements]
+            ref_table = targets[0].split('.')[0]
+            if ref_table not in metadata.tables and ref_table != table.name:
+                Table(ref_table, metadata, *[Column(t.split('.')[1], Integer) for t in targets])
+            targets = [t.replace(f"{table.name}.", f"{name}.", 1) if t.startswith(f"{table.name}.") else t
+                       for t in targets]
+            constraints.append(ForeignKeyConstraint(keys, targets, ondelete=constraint.ondelete,
+                                                    onupdate=constraint.onupdate))
+        elif isinstance(constraint, UniqueConstraint):
+            constraints.append(UniqueConstraint(*keys))
+        elif isinstance(constraint, CheckConstraint):
+            constraints.append(CheckConstraint(constraint.sqltext))
+
+    return Table(name, metadata, *columns, *constraints)
+
+
+class Migration:
+    """Envoltorio de un módulo de migración."""
+
+    def __init__(self, module):
+        self.module = module
+        self.revision = module.revision
+        self.description = getattr(module, 'description', module.__name__)
+        self.transactional = getattr(module, 'transactional', True)
+
+    def __repr__(self):
+        return f"<Migration {self.revision} {self.description}>"
+
+
+class MigrationRunner:
+    """
+    Descubre, aplica y revierte migraciones sobre un engine.
+
+    Args:
+        engine: Engine de SQLAlchemy.
+        package (str): Paquete con los archivos de versiones.
+        lock_timeout (str): lock_timeout de Postgres para migraciones transaccionales.
+    """
+
+    def __init__(self, engine, package=VERSIONS_PACKAGE, lock_timeout='5s'):
+        self.engine = engine
+        self.package = package
+        self.lock_timeout = lock_timeout
+
+    def discover(self):
+        """Retorna las migraciones disponibles ordenadas por revisión."""
+        pkg = importlib.import_module(self.package)
+        migrations = []
+        for info in pkgutil.iter_modules(pkg.__path__):
+            module = importlib.import_module(f"{self.package}.{info.name}")
+            if hasattr(module, 'revision'):
+                migrations.append(Migration(module))
+        migrations.sort(key=lambda m: m.revision)
+
+        revisions = [m.revision for m in migrations]
+        if len(revisions) != len(set(revisions)):
+            raise MigrationError(f"Revisiones duplicadas: {revisions}")
+        return migrations
+
+    def applied(self):
+        """Retorna {version: applied_at} de las migraciones ya aplicadas."""
+        with self.engine.begin() as conn:
+            history_metadata.create_all(conn, checkfirst=True)
+            rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at))
+            return {version: applied_at for version, applied_at in rows}
+
+    def pending(self):
+        applied = self.applied()
+        return [m for m in self.discover() if m.revision not in applied]
+
+    def status(self):
+        """Lista de (migración, fecha de aplicación o None)."""
+        applied = self.applied()
+        return [(m, applied.get(m.revision)) for m in self.discover()]
+
+    def upgrade(self, target=None):
+        """
+        Aplica las migraciones pendientes hasta `target` (inclusive).
+
+        Returns:
+            list[Migration]: Migraciones aplicadas.
+        """
+        done = []
+        for migration in self.pending():
+            if target is not None and migration.revision > target:
+                break
+            self._run(migration, 'upgrade')
+            self._record(migration, applied=True)
+            done.append(migration)
+        return done
+
+    def downgrade(self, target):
+        """
+        Revierte las migraciones aplicadas posteriores a `target`.
+
+        Returns:
+            list[Migration]: Migraciones revertidas.
+        """
+        applied = self.applied()
+        done = []
+        for migration in reversed(self.discover()):
+            if migration.revision <= target or migration.revision not in applied:
+                continue
+            if not hasattr(migration.module, 'downgrade'):
+                raise MigrationError(f"La migración {migration.revision} no es reversible")
+            self._run(migration, 'downgrade')
+            self._record(migration, applied=False)
+            done.append(migration)
+        return done
+
+    def stamp(self, target):
+        """Marca como aplicadas, sin ejecutarlas, las migraciones hasta `target`."""
+        applied = self.applied()
+        for migration in self.discover():
+            if migration.revision <= target and migration.revision not in applied:
+                self._record(migration, applied=True)
+
+    # --------------------------------------------------------------------------
+    def _run(self, migration, direction):
+        step = getattr(migration.module, direction)
+        is_sqlite = self.engine.dialect.name == 'sqlite'
+
+        if migration.transactional:
+            with self.engine.connect() as conn:
+                if is_sqlite:
+                    # El modo batch requiere desactivar las FKs (no se puede dentro de la transacción)
+                    fk_enabled = conn.exec_driver_sql('PRAGMA foreign_keys').scalar()
+                    conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+                    conn.commit()
+                with conn.begin():
+                    if self.engine.dialect.name == 'postgresql' and self.lock_timeout:
+                        conn.exec_driver_sql(f"SET LOCAL lock_timeout = '{self.lock_timeout}'")
+                    step(Operations(conn, transactional=True))
+                    if is_sqlite:
+                        violations = conn.exec_driver_sql('PRAGMA foreign_key_check').fetchall()
+                        if violations:
+                            raise MigrationError(f"Violaciones de FK tras {migration.revision}: {violations[:5]}")
+                if is_sqlite and fk_enabled:
+                    conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+                    conn.commit()
+        else:
+            with self.engine.connect() as conn:
+                conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+                step(Operations(conn, transactional=False))
+
+    def _record(self, migration, applied):
+        with self.engine.begin() as conn:
+            if applied:
+                conn.execute(schema_migrations.insert().values(
+                    version=migration.revision,
+                    description=migration.description[:200],
+                    applied_at=datetime.utcnow(),
+                ))
+            else:
+                conn.execute(schema_migrations.delete().where(schema_migrations.c.version == migration.revision))
@@ -0,0 +1,104 @@
+"""
+Esquema inicial: las tablas que existían antes de las migraciones (las que
+creaba db.create_all()), congeladas aquí. Las tablas y columnas posteriores las
+agregan sus propias migraciones; los cambios en app/models.py no alteran esta.
+En bases creadas antes con db.create_all() no hace nada.
+"""
+from datetime import datetime
+
+from sqlalchemy import (
+    Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text,
+)
+
+revision = '0001'
+description = 'Esquema inicial'
+
+metadata = MetaData()
+
+Table(
+    'users', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('username', String(50), unique=True, nullable=False),
+    Column('email', String(120), unique=True, nullable=False),
+    Column('password_hash', String(255), nullable=False),
+    Column('role', String(20), nullable=False, default='recepcion'),
+    Column('created_at', DateTime, default=datetime.utcnow),
+)
+
+# clients.user_id llega en 0002
+Table(
+    'clients', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('first_name', String(50), nullable=False),
+    Column('last_name', String(50), nullable=False),
+    Column('email', String(120), unique=True, nullable=True),
+    Column('phone', String(20), nullable=True),
+    Column('address', String(200), nullable=True),
+    Column('created_at', DateTime, default=datetime.utcnow),
+)
+
+Table(
+    'vehicles', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('client_id', Integer, ForeignKey('clients.id'), nullable=False),
+    Column('plate', String(20), unique=True, nullable=False),
+    Column('brand', String(50), nullable=False),
+    Column('model', String(50), nullable=False),
+    Column('year', Integer, nullable=False),
+    Column('vin', String(50), unique=True, nullable=True),
+)
+
+Table(
+    'services', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('description', Text, nullable=True),
+    Column('base_price', Float, nullable=False, default=0.0),
+)
+
+Table(
+    'work_orders', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('vehicle_id', Integer, ForeignKey('vehicles.id'), nullable=False),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+    Column('status', String(20), default='pendiente'),
+    Column('total', Float, default=0.0),
+    Column('created_at', DateTime, default=datetime.utcnow),
+)
+
+Table(
+    'order_items', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('work_order_id', Integer, ForeignKey('work_orders.id'), nullable=False),
+    Column('service_id', Integer, ForeignKey('services.id'), nullable=False),
+    Column('price_at_moment', Float, nullable=False),
+)
+
+Table(
+    'payments', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('work_order_id', Integer, ForeignKey('work_orders.id'), nullable=False),
+    Column('amount', Float, nullable=False),
+    Column('payment_method', String(50), nullable=False),
+    Column('status', String(20), default='pendiente'),
+    Column('created_at', DateTime, default=datetime.utcnow),
+)
+
+Table(
+    'car_listings', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+    Column('title', String(100), nullable=False),
+    Column('brand', String(50), nullable=False),
+    Column('model', String(50), nullable=False),
+    Column('year', Integer, nullable=False),
+    Column('price', Float, nullable=False),
+    Column('description', Text, nullable=True),
+    Column('image_url', String(255), nullable=True),
+    Column('status', String(20), default='available'),
+    Column('created_at', DateTime, default=datetime.utcnow),
+)
+
+
+def upgrade(op):
+    op.create_all(metadata)
@@ -0,0 +1,16 @@
+"""
+Agrega clients.user_id (vínculo Cliente -> Usuario de login).
+Reemplaza el antiguo update_schema.py, que solo funcionaba en Postgres.
+"""
+from app import db
+
+revision = '0002'
+description = 'clients.user_id -> users.id'
+
+
+def upgrade(op):
+    op.add_column('clients', db.Column('user_id', db.Integer, db.ForeignKey('users.id'), nullable=True))
+
+
+def downgrade(op):
+    op.drop_column('clients', 'user_id')
@@ -0,0 +1,35 @@
+"""
+Índices para claves foráneas y columnas de filtro usadas por las rutas.
+No transaccional: en Postgres se crean con CREATE INDEX CONCURRENTLY.
+"""
+
+revision = '0003'
+description = 'Índices de FKs y columnas de búsqueda'
+transactional = False
+
+INDEXES = [
+    ('ix_users_role', 'users', ['role']),
+    ('ix_clients_user_id', 'clients', ['user_id']),
+    ('ix_vehicles_client_id', 'vehicles', ['client_id']),
+    ('ix_work_orders_vehicle_id', 'work_orders', ['vehicle_id']),
+    ('ix_work_orders_user_id', 'work_orders', ['user_id']),
+    ('ix_work_orders_status', 'work_orders', ['status']),
+    ('ix_work_orders_created_at', 'work_orders', ['created_at']),
+    ('ix_order_items_work_order_id', 'order_items', ['work_order_id']),
+    ('ix_order_items_service_id', 'order_items', ['service_id']),
+    ('ix_payments_work_order_id', 'payments', ['work_order_id']),
+    ('ix_payments_created_at', 'payments', ['created_at']),
+    ('ix_payments_status_method_amount', 'payments', ['status', 'payment_method', 'amount']),
+    ('ix_car_listings_status_created_at', 'car_listings', ['status', 'created_at']),
+    ('ix_car_listings_user_id_created_at', 'car_listings', ['user_id', 'created_at']),
+]
+
+
+def upgrade(op):
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade(op):
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name)
@@ -0,0 +1,31 @@
+"""
+Índice compuesto (vehicle_id, created_at) para el historial de un vehículo.
+Reemplaza a ix_work_orders_vehicle_id, que queda cubierto por su prefijo.
+No transaccional: en Postgres se crea con CREATE INDEX CONCURRENTLY.
+"""
+
+revision = '0004'
+description = 'work_orders (vehicle_id, created_at)'
+transactional = False
+
+INDEXES = [
+    ('ix_work_orders_vehicle_id_created_at', 'work_orders', ['vehicle_id', 'created_at']),
+]
+DROPPED = [
+    ('ix_work_orders_vehicle_id', 'work_orders', ['vehicle_id']),
+]
+
+
+def upgrade(op):
+    # Primero el nuevo índice: la FK nunca queda sin índice
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, _, _ in DROPPED:
+        op.drop_index(name)
+
+
+def downgrade(op):
+    for name, table, columns in DROPPED:
+        op.create_index(name, table, columns)
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name)
@@ -0,0 +1,25 @@
+"""
+Agrega work_orders.amount_paid y work_orders.balance (saldo pendiente) y los
+calcula a partir de los pagos existentes con estado 'pagado'.
+"""
+from app import db
+
+revision = '0005'
+description = 'work_orders.amount_paid / balance'
+
+
+def upgrade(op):
+    op.add_column('work_orders', db.Column('amount_paid', db.Float, nullable=False, server_default='0'))
+    op.add_column('work_orders', db.Column('balance', db.Float, nullable=False, server_default='0'))
+    op.execute("""
+        UPDATE work_orders SET amount_paid = COALESCE((
+            SELECT SUM(p.amount) FROM payments p
+            WHERE p.work_order_id = work_orders.id AND p.status = 'pagado'
+        ), 0)
+    """)
+    op.execute("UPDATE work_orders SET balance = COALESCE(total, 0) - amount_paid")
+
+
+def downgrade(op):
+    op.drop_column('work_orders', 'balance')
+    op.drop_column('work_orders', 'amount_paid')
@@ -0,0 +1,22 @@
+"""
+Índice parcial de cuentas por cobrar: solo las órdenes con saldo pendiente.
+No transaccional: en Postgres se crea con CREATE INDEX CONCURRENTLY.
+"""
+
+revision = '0006'
+description = 'Índice parcial de órdenes con saldo'
+transactional = False
+
+INDEXES = [
+    ('ix_work_orders_outstanding', 'work_orders', ['created_at', 'id'], 'balance > 0'),
+]
+
+
+def upgrade(op):
+    for name, table, columns, where in INDEXES:
+        op.create_index(name, table, columns, where=where)
+
+
+def downgrade(op):
+    for name, _, _, _ in reversed(INDEXES):
+        op.drop_index(name)
@@ -0,0 +1,28 @@
+"""
+Tabla order_events: cambios de órdenes para el canal SSE (/api/orders/events).
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, Text
+
+revision = '0007'
+description = 'Tabla order_events'
+
+# Definición congelada (no depende de app/models.py)
+order_events = Table(
+    'order_events', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('work_order_id', Integer, nullable=False),
+    Column('event_type', String(40), nullable=False),
+    Column('payload', Text, nullable=False, default='{}'),
+    Column('created_at', DateTime, default=datetime.utcnow, nullable=False),
+    Index('ix_order_events_created_at', 'created_at'),
+)
+
+
+def upgrade(op):
+    op.create_table(order_events)
+
+
+def downgrade(op):
+    op.execute("DROP TABLE IF EXISTS order_events")
@@ -0,0 +1,53 @@
+"""
+Seguimiento de cambios para /api/sync: columna updated_at en las tablas
+sincronizables (inicializada con created_at o con la fecha de la migración)
+y tabla sync_tombstones para los borrados.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table
+
+from app import db
+
+revision = '0008'
+description = 'updated_at y sync_tombstones'
+
+# tabla -> tiene created_at (para inicializar updated_at)
+TABLES = {
+    'clients': True,
+    'vehicles': False,
+    'services': False,
+    'work_orders': True,
+    'order_items': False,
+    'payments': True,
+    'car_listings': True,
+}
+
+# Definición congelada (no depende de app/models.py)
+sync_tombstones = Table(
+    'sync_tombstones', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('entity', String(30), nullable=False),
+    Column('entity_id', Integer, nullable=False),
+    Column('deleted_at', DateTime, default=datetime.utcnow, nullable=False),
+    Index('ix_sync_tombstones_entity_deleted_at', 'entity', 'deleted_at'),
+)
+
+
+def upgrade(op):
+    now = datetime.utcnow()
+    for table, has_created_at in TABLES.items():
+        op.add_column(table, db.Column('updated_at', db.DateTime, nullable=True))
+        value = "COALESCE(created_at, :now)" if has_created_at else ":now"
+        op.execute(
+            db.text(f"UPDATE {table} SET updated_at = {value} WHERE updated_at IS NULL")
+            .bindparams(db.bindparam('now', type_=db.DateTime)),
+            now=now
+        )
+    op.create_table(sync_tombstones)
+
+
+def downgrade(op):
+    op.execute("DROP TABLE IF EXISTS sync_tombstones")
+    for table in reversed(list(TABLES)):
+        op.drop_column(table, 'updated_at')
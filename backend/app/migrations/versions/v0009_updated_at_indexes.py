@@ -0,0 +1,21 @@
+"""
+Índices de updated_at para las consultas incrementales de /api/sync.
+No transaccional: en Postgres se crean con CREATE INDEX CONCURRENTLY.
+"""
+from app.migrations.versions.v0008_updated_at_and_tombstones import TABLES
+
+revision = '0009'
+description = 'Índices de updated_at'
+transactional = False
+
+INDEXES = [(f'ix_{table}_updated_at', table, ['updated_at']) for table in TABLES]
+
+
+def upgrade(op):
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade(op):
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name)
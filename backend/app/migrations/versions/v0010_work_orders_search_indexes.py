@@ -0,0 +1,34 @@
+"""
+Índices compuestos para la búsqueda de órdenes (/api/orders con filtros):
+(status, created_at) y (user_id, created_at). Reemplazan a ix_work_orders_status
+e ix_work_orders_user_id, que quedan cubiertos por su prefijo.
+No transaccional: en Postgres se crea con CREATE INDEX CONCURRENTLY.
+"""
+
+revision = '0010'
+description = 'work_orders (status, created_at) y (user_id, created_at)'
+transactional = False
+
+INDEXES = [
+    ('ix_work_orders_status_created_at', 'work_orders', ['status', 'created_at']),
+    ('ix_work_orders_user_id_created_at', 'work_orders', ['user_id', 'created_at']),
+]
+DROPPED = [
+    ('ix_work_orders_status', 'work_orders', ['status']),
+    ('ix_work_orders_user_id', 'work_orders', ['user_id']),
+]
+
+
+def upgrade(op):
+    # Primero los nuevos índices: la FK nunca queda sin índice
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, _, _ in DROPPED:
+        op.drop_index(name)
+
+
+def downgrade(op):
+    for name, table, columns in DROPPED:
+        op.create_index(name, table, columns)
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name)
@@ -0,0 +1,77 @@
+"""
+Archivo histórico: tablas work_orders_archive, order_items_archive y
+payments_archive (particionadas por mes en Postgres; ArchiveService crea
+cada partición al archivar su mes) y el resumen archived_months.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table, Text
+
+revision = '0011'
+description = 'Tablas de archivo histórico'
+
+# Definiciones congeladas (no dependen de app/models.py)
+metadata = MetaData()
+
+TABLES = [
+    Table(
+        'work_orders_archive', metadata,
+        Column('id', Integer, primary_key=True, autoincrement=False),
+        Column('created_at', DateTime, primary_key=True),
+        Column('vehicle_id', Integer, nullable=False),
+        Column('user_id', Integer, nullable=False),
+        Column('status', String(20)),
+        Column('total', Float),
+        Column('amount_paid', Float, nullable=False, default=0.0),
+        Column('balance', Float, nullable=False, default=0.0),
+        Column('updated_at', DateTime),
+        Column('archived_at', DateTime, default=datetime.utcnow, nullable=False),
+        Index('ix_work_orders_archive_vehicle_id_created_at', 'vehicle_id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    ),
+    Table(
+        'order_items_archive', metadata,
+        Column('id', Integer, primary_key=True, autoincrement=False),
+        Column('order_created_at', DateTime, primary_key=True),
+        Column('work_order_id', Integer, nullable=False),
+        Column('service_id', Integer, nullable=False),
+        Column('service_name', String(100)),
+        Column('price_at_moment', Float, nullable=False),
+        Column('updated_at', DateTime),
+        Index('ix_order_items_archive_work_order_id', 'work_order_id'),
+        postgresql_partition_by='RANGE (order_created_at)',
+    ),
+    Table(
+        'payments_archive', metadata,
+        Column('id', Integer, primary_key=True, autoincrement=False),
+        Column('order_created_at', DateTime, primary_key=True),
+        Column('work_order_id', Integer, nullable=False),
+        Column('amount', Float, nullable=False),
+        Column('payment_method', String(50), nullable=False),
+        Column('status', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Index('ix_payments_archive_work_order_id', 'work_order_id'),
+        Index('ix_payments_archive_created_at', 'created_at'),
+        postgresql_partition_by='RANGE (order_created_at)',
+    ),
+    Table(
+        'archived_months', metadata,
+        Column('month', Date, primary_key=True),
+        Column('orders', Integer, nullable=False, default=0),
+        Column('revenue', Text, nullable=False, default='{}'),
+        Column('archived_at', DateTime, default=datetime.utcnow, nullable=False),
+        Column('file', String(255), nullable=True),
+    ),
+]
+
+
+def upgrade(op):
+    for table in TABLES:
+        op.create_table(table)
+
+
+def downgrade(op):
+    # En Postgres, DROP del padre elimina también sus particiones
+    for table in reversed(TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {table.name}")
@@ -0,0 +1,112 @@
+"""
+Borrados en cascada en la base de datos y borrado lógico:
+
+- Las FKs vehicles.client_id, work_orders.vehicle_id, order_items.work_order_id
+  y payments.work_order_id pasan a ON DELETE CASCADE (borrar un cliente o un
+  vehículo es un solo DELETE; los modelos usan passive_deletes).
+- clients.deleted_at y vehicles.deleted_at para el borrado lógico.
+- clients.email, vehicles.plate y vehicles.vin pasan de UNIQUE a índices
+  únicos parciales (WHERE deleted_at IS NULL): un registro borrado lógicamente
+  no bloquea su email, placa o VIN para uno nuevo.
+
+En SQLite la FK y el UNIQUE no se pueden alterar: la tabla se reconstruye (modo batch).
+"""
+from sqlalchemy import UniqueConstraint, inspect
+
+from app import db
+
+revision = '0012'
+description = 'ON DELETE CASCADE, deleted_at y únicos parciales en clients/vehicles'
+
+# (tabla, columna, tabla referenciada)
+CASCADES = [
+    ('vehicles', 'client_id', 'clients'),
+    ('work_orders', 'vehicle_id', 'vehicles'),
+    ('order_items', 'work_order_id', 'work_orders'),
+    ('payments', 'work_order_id', 'work_orders'),
+]
+SOFT_DELETE_TABLES = ('clients', 'vehicles')
+# (tabla, columna): únicas solo entre los registros activos
+ACTIVE_UNIQUE = [
+    ('clients', 'email'),
+    ('vehicles', 'plate'),
+    ('vehicles', 'vin'),
+]
+ACTIVE_WHERE = 'deleted_at IS NULL'
+
+
+def _foreign_key_name(op, table, column):
+    for fk in inspect(op.connection).get_foreign_keys(table):
+        if fk['constrained_columns'] == [column]:
+            return fk['name']
+    return None
+
+
+def _set_ondelete(op, ondelete):
+    for table, column, referred in CASCADES:
+        if op.is_sqlite:
+            # La definición actual de la tabla (no la del modelo) con la FK cambiada
+            definition = op.reflect_table(table)
+            for fk in definition.foreign_keys:
+                if fk.parent.name == column:
+                    fk.constraint.ondelete = ondelete
+            op.rebuild_table(definition)
+            continue
+        name = _foreign_key_name(op, table, column) or f"{table}_{column}_fkey"
+        action = f" ON DELETE {ondelete}" if ondelete else ""
+        # Reemplazo en una sola sentencia: la tabla nunca queda sin FK
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, "
+                   f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referred}(id){action}")
+
+
+def _rebuild_without_unique(op, table, columns):
+    """SQLite: reconstruye la tabla sin los UNIQUE de `columns`."""
+    definition = op.reflect_table(table)
+    for constraint in list(definition.constraints):
+        if isinstance(constraint, UniqueConstraint) and [c.name for c in constraint.columns] in columns:
+            definition.constraints.remove(constraint)
+    op.rebuild_table(definition)
+
+
+def _rebuild_with_unique(op, table, columns):
+    """SQLite: reconstruye la tabla con UNIQUE en cada columna de `columns`."""
+    definition = op.reflect_table(table)
+    for column in columns:
+        definition.append_constraint(UniqueConstraint(column))
+    op.rebuild_table(definition)
+
+
+def _active_unique(op):
+    if op.is_sqlite:
+        for table in SOFT_DELETE_TABLES:
+            _rebuild_without_unique(op, table, [[column] for t, column in ACTIVE_UNIQUE if t == table])
+    else:
+        for table, column in ACTIVE_UNIQUE:
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_{column}_key")
+    for table, column in ACTIVE_UNIQUE:
+        op.create_index(f"uq_{table}_{column}", table, [column], unique=True, where=ACTIVE_WHERE)
+
+
+def _global_unique(op):
+    for table, column in reversed(ACTIVE_UNIQUE):
+        op.drop_index(f"uq_{table}_{column}")
+    if op.is_sqlite:
+        for table in SOFT_DELETE_TABLES:
+            _rebuild_with_unique(op, table, [column for t, column in ACTIVE_UNIQUE if t == table])
+    else:
+        for table, column in ACTIVE_UNIQUE:
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_key UNIQUE ({column})")
+
+
+def upgrade(op):
+    for table in SOFT_DELETE_TABLES:
+        op.add_column(table, db.Column('deleted_at', db.DateTime, nullable=True))
+    _set_ondelete(op, 'CASCADE')
+    _active_unique(op)
+
+
+def downgrade(op):
+    _global_unique(op)
+    _set_ondelete(op, None)
+    for table in reversed(SOFT_DELETE_TABLES):
+        op.drop_column(table, 'deleted_at')
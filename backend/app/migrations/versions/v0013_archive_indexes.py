@@ -0,0 +1,68 @@
+"""
+Índices del archivo exportado, para no abrir todos los .jsonl.gz en cada lectura:
+
+- archived_months.first_payment_at / last_payment_at: rango de fechas de los
+  pagos del mes (historial de pagos por rango).
+- archived_vehicle_months: meses con órdenes de cada vehículo (historial del vehículo).
+- archived_months.indexed: los meses que siguen en las tablas de archivo se
+  indexan aquí; los ya exportados quedan en False (sus archivos se leen
+  siempre) hasta que se vuelvan a exportar.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import Column, Date, Index, Integer, MetaData, Table, func, insert, select, update
+
+from app import db
+
+revision = '0013'
+description = 'Rango de pagos y vehículos por mes archivado'
+
+# Definición congelada (no depende de app/models.py)
+archived_vehicle_months = Table(
+    'archived_vehicle_months', MetaData(),
+    Column('vehicle_id', Integer, primary_key=True, autoincrement=False),
+    Column('month', Date, primary_key=True),
+    Index('ix_archived_vehicle_months_month', 'month'),
+)
+
+
+def _bounds(month):
+    end = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return datetime(month.year, month.month, 1), datetime(end.year, end.month, 1)
+
+
+def upgrade(op):
+    op.add_column('archived_months', db.Column('first_payment_at', db.DateTime, nullable=True))
+    op.add_column('archived_months', db.Column('last_payment_at', db.DateTime, nullable=True))
+    op.add_column('archived_months', db.Column('indexed', db.Boolean, nullable=False, server_default=db.false()))
+    op.create_table(archived_vehicle_months)
+
+    # Tablas del archivo tal como quedan en esta revisión
+    months_table = op.reflect_table('archived_months')
+    orders = op.reflect_table('work_orders_archive')
+    payments = op.reflect_table('payments_archive')
+    months = op.connection.execute(
+        select(months_table.c.month).where(months_table.c.file.is_(None))
+    ).scalars().all()
+    for month in months:
+        start, end = _bounds(month)
+        first, last = op.connection.execute(
+            select(func.min(payments.c.created_at), func.max(payments.c.created_at))
+            .where(payments.c.order_created_at >= start, payments.c.order_created_at < end)
+        ).one()
+        op.connection.execute(insert(archived_vehicle_months).from_select(
+            ['vehicle_id', 'month'],
+            select(orders.c.vehicle_id, db.literal(month, db.Date))
+            .where(orders.c.created_at >= start, orders.c.created_at < end)
+            .distinct()
+        ))
+        op.connection.execute(
+            update(months_table).where(months_table.c.month == month)
+            .values(first_payment_at=first, last_payment_at=last, indexed=True)
+        )
+
+
+def downgrade(op):
+    op.execute("DROP TABLE IF EXISTS archived_vehicle_months")
+    for column in ('indexed', 'last_payment_at', 'first_payment_at'):
+        op.drop_column('archived_months', column)
@@ -0,0 +1,61 @@
+"""
+Totales por vehículo y mes archivado (archived_vehicle_months): órdenes, total,
+pagado, saldo y última orden. Los resúmenes del vehículo y del cliente suman
+así lo archivado y lo exportado sin leer el archivo.
+
+Los meses que siguen en las tablas de archivo se completan aquí. Los ya
+exportados quedan con indexed = False (sus totales no están) hasta que se
+vuelvan a exportar.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import func, select, update
+
+from app import db
+
+revision = '0014'
+description = 'Totales por vehículo de los meses archivados'
+
+COLUMNS = ('orders', 'total', 'amount_paid', 'balance', 'last_order_at')
+
+
+def _bounds(month):
+    end = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return datetime(month.year, month.month, 1), datetime(end.year, end.month, 1)
+
+
+def upgrade(op):
+    op.add_column('archived_vehicle_months', db.Column('orders', db.Integer, nullable=False, server_default='0'))
+    op.add_column('archived_vehicle_months', db.Column('total', db.Float, nullable=False, server_default='0'))
+    op.add_column('archived_vehicle_months', db.Column('amount_paid', db.Float, nullable=False, server_default='0'))
+    op.add_column('archived_vehicle_months', db.Column('balance', db.Float, nullable=False, server_default='0'))
+    op.add_column('archived_vehicle_months', db.Column('last_order_at', db.DateTime, nullable=True))
+
+    # Tablas del archivo tal como quedan en esta revisión
+    months_table = op.reflect_table('archived_months')
+    vehicle_months = op.reflect_table('archived_vehicle_months')
+    orders = op.reflect_table('work_orders_archive')
+    for month, file in op.connection.execute(select(months_table.c.month, months_table.c.file)).all():
+        if file is not None:
+            op.connection.execute(
+                update(months_table).where(months_table.c.month == month).values(indexed=False)
+            )
+            continue
+        start, end = _bounds(month)
+        totals = op.connection.execute(
+            select(orders.c.vehicle_id, func.count(), func.coalesce(func.sum(orders.c.total), 0.0),
+                   func.sum(orders.c.amount_paid), func.sum(orders.c.balance), func.max(orders.c.created_at))
+            .where(orders.c.created_at >= start, orders.c.created_at < end)
+            .group_by(orders.c.vehicle_id)
+        ).all()
+        for vehicle_id, *values in totals:
+            op.connection.execute(
+                update(vehicle_months)
+                .where(vehicle_months.c.vehicle_id == vehicle_id, vehicle_months.c.month == month)
+                .values(dict(zip(COLUMNS, values)))
+            )
+
+
+def downgrade(op):
+    for column in reversed(COLUMNS):
+        op.drop_column('archived_vehicle_months', column)
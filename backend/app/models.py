@@ -1,3 +1,4 @@
+import json
 from app import db
 from datetime import datetime
 
@@ -28,7 +29,7 @@ class User(db.Model):
     username = db.Column(db.String(50), unique=True, nullable=False)  # Nombre de usuario único
     email = db.Column(db.String(120), unique=True, nullable=False)    # Correo electrónico único
     password_hash = db.Column(db.String(255), nullable=False)         # Contraseña hasheada (seguridad)
-    role = db.Column(db.String(20), nullable=False, default='recepcion')  # Roles: admin, mecanico, recepcion
+    role = db.Column(db.String(20), nullable=False, default='recepcion', index=True)  # Roles: admin, mecanico, recepcion
     created_at = db.Column(db.DateTime, default=datetime.utcnow)      # Fecha de registro automatico
 
     # Relación inversa: Un usuario puede crear muchas órdenes de trabajo
@@ -67,24 +68,36 @@ class Client(db.Model):
         phone (str): Teléfono de contacto.
         address (str): Dirección física.
         created_at (datetime): Fecha de registro.
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
+        deleted_at (datetime): Borrado lógico (None = activo).
     
     Relaciones:
         vehicles (relationship): Relación uno-a-muchos con Vehicle. Un cliente posee múltiples vehículos.
+            Al borrar el cliente, la base de datos borra sus vehículos (ON DELETE CASCADE).
     """
     __tablename__ = 'clients'
+    __table_args__ = (
+        # Email único entre los clientes activos: uno borrado lógicamente no lo bloquea
+        db.Index('uq_clients_email', 'email', unique=True,
+                 postgresql_where=db.text('deleted_at IS NULL'), sqlite_where=db.text('deleted_at IS NULL')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True) # Link to User (Login)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True) # Link to User (Login)
     first_name = db.Column(db.String(50), nullable=False)  # Nombre
     last_name = db.Column(db.String(50), nullable=False)   # Apellido
-    email = db.Column(db.String(120), unique=True, nullable=True) # Email opcional pero único si existe
+    email = db.Column(db.String(120), nullable=True) # Email opcional pero único si existe (ver uq_clients_email)
     phone = db.Column(db.String(20), nullable=True)        # Teléfono de contacto
     address = db.Column(db.String(200), nullable=True)     # Dirección física
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
+    deleted_at = db.Column(db.DateTime, nullable=True) # Borrado lógico
 
     # Relación: Un cliente tiene varios vehículos asociados
     # backref='owner' permite acceder al dueño desde el vehículo (vehiculo.owner)
-    vehicles = db.relationship('Vehicle', backref='owner', lazy=True)
+    # passive_deletes: el ORM no carga los vehículos para borrarlos, lo hace la base de datos
+    vehicles = db.relationship('Vehicle', backref='owner', lazy=True,
+                               cascade="all, delete-orphan", passive_deletes=True)
 
     def to_dict(self):
         """
@@ -113,27 +126,40 @@ class Vehicle(db.Model):
     Atributos:
         id (int): Identificador único del vehículo.
         client_id (int): Clave foránea que referencia al Cliente dueño.
-        plate (str): Placa o matrícula (única).
+        plate (str): Placa o matrícula (única entre los vehículos activos).
         brand (str): Marca del vehículo (ej: Toyota).
         model (str): Modelo del vehículo (ej: Corolla).
         year (int): Año de fabricación.
-        vin (str): Número de Identificación Vehicular (opcional, único).
+        vin (str): Número de Identificación Vehicular (opcional, único entre los activos).
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
+        deleted_at (datetime): Borrado lógico (None = activo).
     
     Relaciones:
         work_orders (relationship): Relación uno-a-muchos con WorkOrder. Historial de reparaciones.
+            Al borrar el vehículo, la base de datos borra sus órdenes, items y pagos.
     """
     __tablename__ = 'vehicles'
+    __table_args__ = (
+        # Placa y VIN únicos entre los vehículos activos
+        db.Index('uq_vehicles_plate', 'plate', unique=True,
+                 postgresql_where=db.text('deleted_at IS NULL'), sqlite_where=db.text('deleted_at IS NULL')),
+        db.Index('uq_vehicles_vin', 'vin', unique=True,
+                 postgresql_where=db.text('deleted_at IS NULL'), sqlite_where=db.text('deleted_at IS NULL')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=False) # Relación con Cliente
-    plate = db.Column(db.String(20), unique=True, nullable=False) # Placa única
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='CASCADE'), nullable=False, index=True) # Relación con Cliente
+    plate = db.Column(db.String(20), nullable=False)              # Placa única (entre los activos)
     brand = db.Column(db.String(50), nullable=False)              # Marca
     model = db.Column(db.String(50), nullable=False)              # Modelo
     year = db.Column(db.Integer, nullable=False)                  # Año
-    vin = db.Column(db.String(50), unique=True, nullable=True)    # Número de chasis (VIN)
+    vin = db.Column(db.String(50), nullable=True)                 # Número de chasis (VIN), único entre los activos
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
+    deleted_at = db.Column(db.DateTime, nullable=True)            # Borrado lógico
 
     # Relación: Un vehículo puede tener muchas órdenes de trabajo (historial)
-    work_orders = db.relationship('WorkOrder', backref='vehicle', lazy=True, cascade="all, delete-orphan")
+    work_orders = db.relationship('WorkOrder', backref='vehicle', lazy=True,
+                                  cascade="all, delete-orphan", passive_deletes=True)
 
     def to_dict(self):
         """
@@ -166,6 +192,7 @@ class Service(db.Model):
         name (str): Nombre del servicio (ej: Cambio de Aceite).
         description (str): Descripción detallada de lo que incluye.
         base_price (float): Precio base sugerido.
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
     """
     __tablename__ = 'services'
 
@@ -173,6 +200,7 @@ class Service(db.Model):
     name = db.Column(db.String(100), nullable=False)           # Nombre del servicio
     description = db.Column(db.Text, nullable=True)            # Descripción detallada
     base_price = db.Column(db.Float, nullable=False, default=0.0) # Precio base sugerido
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
 
     def to_dict(self):
         """
@@ -204,22 +232,39 @@ class WorkOrder(db.Model):
         user_id (int): FK al usuario que abrió la orden.
         status (str): Estado actual ('pendiente', 'en_progreso', 'finalizado').
         total (float): Costo total acumulado de los servicios.
+        amount_paid (float): Suma de los pagos con estado 'pagado' (la mantiene PaymentService).
+        balance (float): Saldo pendiente (total - amount_paid).
         created_at (datetime): Fecha de creación.
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
     
     Relaciones:
         items (relationship): Lista de OrderItem (servicios añadidos a esta orden).
     """
     __tablename__ = 'work_orders'
+    __table_args__ = (
+        # Historial del vehículo: WHERE vehicle_id = ? ORDER BY created_at DESC (cubre también la FK)
+        db.Index('ix_work_orders_vehicle_id_created_at', 'vehicle_id', 'created_at'),
+        # Búsqueda de órdenes por estado o por mecánico, ordenada por fecha (cubren status / la FK user_id)
+        db.Index('ix_work_orders_status_created_at', 'status', 'created_at'),
+        db.Index('ix_work_orders_user_id_created_at', 'user_id', 'created_at'),
+        # Cuentas por cobrar: WHERE balance > 0 ORDER BY created_at, id (parcial: solo órdenes con deuda)
+        db.Index('ix_work_orders_outstanding', 'created_at', 'id',
+                 postgresql_where=db.text('balance > 0'), sqlite_where=db.text('balance > 0')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    vehicle_id = db.Column(db.Integer, db.ForeignKey('vehicles.id'), nullable=False) # Vehículo a reparar
+    vehicle_id = db.Column(db.Integer, db.ForeignKey('vehicles.id', ondelete='CASCADE'), nullable=False) # Vehículo a reparar
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)       # Usuario que creó la orden
     status = db.Column(db.String(20), default='pendiente') # Estados: pendiente, en_progreso, finalizado
     total = db.Column(db.Float, default=0.0)               # Total monetario de la orden
-    created_at = db.Column(db.DateTime, default=datetime.utcnow) # Fecha de creación
+    amount_paid = db.Column(db.Float, nullable=False, default=0.0, server_default='0') # Pagado (pagos 'pagado')
+    balance = db.Column(db.Float, nullable=False, default=0.0, server_default='0')     # Saldo: total - amount_paid
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True) # Fecha de creación (listado y reportes)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
 
     # Relación: Una orden tiene muchos items (servicios realizados)
-    items = db.relationship('OrderItem', backref='work_order', lazy=True)
+    items = db.relationship('OrderItem', backref='work_order', lazy=True,
+                            cascade="all, delete-orphan", passive_deletes=True)
 
     def to_dict(self):
         """
@@ -234,6 +279,8 @@ class WorkOrder(db.Model):
             'user_id': self.user_id,
             'status': self.status,
             'total': self.total,
+            'amount_paid': self.amount_paid,
+            'balance': self.balance,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'items': [item.to_dict() for item in self.items] # Incluir items anidados para el frontend
         }
@@ -253,6 +300,7 @@ class OrderItem(db.Model):
         work_order_id (int): FK a la orden padre.
         service_id (int): FK al servicio del catálogo.
         price_at_moment (float): Precio cobrado (puede diferir del precio base actual si este cambia).
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
     
     Relaciones:
         service (relationship): Acceso al objeto Service para obtener nombre/descripción.
@@ -260,9 +308,10 @@ class OrderItem(db.Model):
     __tablename__ = 'order_items'
 
     id = db.Column(db.Integer, primary_key=True)
-    work_order_id = db.Column(db.Integer, db.ForeignKey('work_orders.id'), nullable=False) # Orden padre
-    service_id = db.Column(db.Integer, db.ForeignKey('services.id'), nullable=False)       # Servicio realizado
+    work_order_id = db.Column(db.Integer, db.ForeignKey('work_orders.id', ondelete='CASCADE'), nullable=False, index=True) # Orden padre
+    service_id = db.Column(db.Integer, db.ForeignKey('services.id'), nullable=False, index=True)       # Servicio realizado
     price_at_moment = db.Column(db.Float, nullable=False) # Precio congelado al momento de la orden
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
 
     # Relación para acceder a info del servicio desde el item
     service = db.relationship('Service')
@@ -298,21 +347,28 @@ class Payment(db.Model):
         payment_method (str): Método de pago (efectivo, tarjeta, transferencia, etc.).
         status (str): Estado del pago ('pagado', 'pendiente').
         created_at (datetime): Fecha y hora del pago.
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
     
     Relaciones:
         work_order (relationship): Relación uno-a-uno con WorkOrder.
     """
     __tablename__ = 'payments'
+    __table_args__ = (
+        # Cubre el resumen de ingresos: WHERE status = 'pagado' GROUP BY payment_method SUM(amount)
+        db.Index('ix_payments_status_method_amount', 'status', 'payment_method', 'amount'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    work_order_id = db.Column(db.Integer, db.ForeignKey('work_orders.id'), nullable=False)
+    work_order_id = db.Column(db.Integer, db.ForeignKey('work_orders.id', ondelete='CASCADE'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     payment_method = db.Column(db.String(50), nullable=False) # efectivo, tarjeta
     status = db.Column(db.String(20), default='pendiente')    # pagado, pendiente
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True) # Historial ordenado por fecha
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
 
     # Relación: Una orden puede tener varios pagos (o uno).
-    work_order = db.relationship('WorkOrder', backref=db.backref('payments', lazy=True))
+    work_order = db.relationship('WorkOrder', backref=db.backref(
+        'payments', lazy=True, cascade="all, delete-orphan", passive_deletes=True))
 
     def to_dict(self):
         """
@@ -347,8 +403,15 @@ class CarListing(db.Model):
         image_url (str): URL de la imagen principal.
         status (str): 'available', 'sold'.
         created_at (datetime): Fecha de publicación.
+        updated_at (datetime): Última modificación (la mantiene SQLAlchemy; usada por /api/sync).
     """
     __tablename__ = 'car_listings'
+    __table_args__ = (
+        # Feed público: WHERE status = 'available' ORDER BY created_at DESC
+        db.Index('ix_car_listings_status_created_at', 'status', 'created_at'),
+        # Mis publicaciones: WHERE user_id = ? ORDER BY created_at DESC
+        db.Index('ix_car_listings_user_id_created_at', 'user_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -361,6 +424,7 @@ class CarListing(db.Model):
     image_url = db.Column(db.String(255), nullable=True) # Para la foto
     status = db.Column(db.String(20), default='available') # available, sold
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True) # Sync incremental
 
     # Relación con el vendedor
     seller = db.relationship('User', backref=db.backref('listings', lazy=True))
@@ -380,3 +444,236 @@ class CarListing(db.Model):
             'status': self.status,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+# ==============================================================================
+# Modelo OrderEvent (Eventos de Órdenes)
+# ==============================================================================
+class OrderEvent(db.Model):
+    """
+    Registro de cambios de órdenes para el canal de eventos (SSE).
+
+    Se escribe en la misma transacción que el cambio. Cada worker lee los
+    eventos nuevos de esta tabla y los reparte a sus conexiones abiertas, así
+    un cambio hecho en un worker llega a los tableros conectados a cualquier otro.
+
+    Atributos:
+        id (int): ID incremental; es el `id` del evento SSE (Last-Event-ID).
+        work_order_id (int): Orden afectada (sin FK: el evento sobrevive a la orden).
+        event_type (str): 'order_created', 'order_item_added', 'order_status_changed'.
+        payload (str): Datos del evento en JSON.
+        created_at (datetime): Momento del cambio (índice para depurar eventos viejos).
+    """
+    __tablename__ = 'order_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    work_order_id = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(40), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.event_type,
+            'work_order_id': self.work_order_id,
+            'data': json.loads(self.payload or '{}'),
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+# ==============================================================================
+# Modelo SyncTombstone (Borrados para Sincronización)
+# ==============================================================================
+class SyncTombstone(db.Model):
+    """
+    Registro de filas eliminadas, para que /api/sync informe los borrados a los
+    clientes que sincronizan de forma incremental (las filas ya no existen y no
+    se pueden consultar por updated_at).
+
+    Atributos:
+        id (int): ID del registro.
+        entity (str): Tabla de la fila eliminada (ej: 'work_orders').
+        entity_id (int): ID de la fila eliminada.
+        deleted_at (datetime): Momento del borrado.
+    """
+    __tablename__ = 'sync_tombstones'
+    __table_args__ = (
+        # Sync: WHERE entity = ? AND deleted_at > ? ORDER BY deleted_at
+        db.Index('ix_sync_tombstones_entity_deleted_at', 'entity', 'deleted_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(30), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+# ==============================================================================
+# Archivo Histórico (órdenes entregadas y pagadas de meses anteriores)
+# ==============================================================================
+# ArchiveService mueve por mes las órdenes cerradas, sus items y sus pagos a
+# estas tablas, para que las consultas sobre work_orders/order_items/payments
+# solo recorran las órdenes activas. Sin FKs: el archivo sobrevive a vehículos
+# y servicios borrados. En Postgres son tablas particionadas por mes
+# (RANGE sobre la fecha de la orden: las consultas con rango de fechas solo
+# leen las particiones del rango); en SQLite son tablas comunes.
+# ==============================================================================
+class WorkOrderArchive(db.Model):
+    """
+    Orden de trabajo archivada (mismas columnas que WorkOrder).
+
+    Atributos:
+        archived_at (datetime): Momento en que se archivó.
+    """
+    __tablename__ = 'work_orders_archive'
+    __table_args__ = (
+        # Historial del vehículo en el archivo
+        db.Index('ix_work_orders_archive_vehicle_id_created_at', 'vehicle_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    # La clave de partición debe ser parte de la clave primaria
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    created_at = db.Column(db.DateTime, primary_key=True)
+    vehicle_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20))
+    total = db.Column(db.Float)
+    amount_paid = db.Column(db.Float, nullable=False, default=0.0)
+    balance = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class OrderItemArchive(db.Model):
+    """
+    Item de una orden archivada.
+
+    Atributos:
+        service_name (str): Nombre del servicio al archivar (el servicio puede borrarse después).
+        order_created_at (datetime): Fecha de la orden (clave de partición).
+    """
+    __tablename__ = 'order_items_archive'
+    __table_args__ = (
+        db.Index('ix_order_items_archive_work_order_id', 'work_order_id'),
+        {'postgresql_partition_by': 'RANGE (order_created_at)'},
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_created_at = db.Column(db.DateTime, primary_key=True)
+    work_order_id = db.Column(db.Integer, nullable=False)
+    service_id = db.Column(db.Integer, nullable=False)
+    service_name = db.Column(db.String(100))
+    price_at_moment = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime)
+
+
+class PaymentArchive(db.Model):
+    """
+    Pago de una orden archivada.
+
+    Atributos:
+        order_created_at (datetime): Fecha de la orden (clave de partición).
+    """
+    __tablename__ = 'payments_archive'
+    __table_args__ = (
+        db.Index('ix_payments_archive_work_order_id', 'work_order_id'),
+        db.Index('ix_payments_archive_created_at', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (order_created_at)'},
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_created_at = db.Column(db.DateTime, primary_key=True)
+    work_order_id = db.Column(db.Integer, nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    payment_method = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+
+
+class ArchivedMonth(db.Model):
+    """
+    Resumen de un mes archivado: los totales que necesitan los reportes sin
+    leer el archivo, y el archivo comprimido si el mes se exportó.
+
+    Atributos:
+        month (date): Primer día del mes.
+        orders (int): Órdenes archivadas del mes.
+        revenue (str): JSON {método de pago: monto} de los pagos 'pagado'.
+        archived_at (datetime): Último archivado del mes.
+        file (str): Nombre del archivo .jsonl.gz en ARCHIVE_DIR (None si sigue en las tablas).
+        first_payment_at / last_payment_at (datetime): Rango de fechas de los
+            pagos del mes (None si no tiene pagos): el historial de pagos solo
+            abre los archivos cuyo rango se cruza con el pedido.
+        indexed (bool): Si el rango de pagos y archived_vehicle_months están
+            completos. False en meses exportados antes de la migración 0013:
+            los lectores abren su archivo siempre, hasta que se vuelva a exportar.
+    """
+    __tablename__ = 'archived_months'
+
+    month = db.Column(db.Date, primary_key=True)
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Text, nullable=False, default='{}')
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    file = db.Column(db.String(255), nullable=True)
+    first_payment_at = db.Column(db.DateTime, nullable=True)
+    last_payment_at = db.Column(db.DateTime, nullable=True)
+    indexed = db.Column(db.Boolean, nullable=False, default=True, server_default=db.false())
+
+
+class ArchivedVehicleMonth(db.Model):
+    """
+    Meses archivados con órdenes de cada vehículo: el historial del vehículo
+    solo abre los archivos exportados de esos meses, y los resúmenes del
+    vehículo y del cliente suman sus totales sin leerlos.
+
+    Atributos:
+        vehicle_id (int): Vehículo (sin FK, como las tablas de archivo).
+        month (date): Primer día del mes (archived_months.month).
+        orders (int): Órdenes archivadas del vehículo en el mes.
+        total / amount_paid / balance (float): Sumas de esas órdenes.
+        last_order_at (datetime): Fecha de la más reciente.
+    """
+    __tablename__ = 'archived_vehicle_months'
+    __table_args__ = (
+        db.Index('ix_archived_vehicle_months_month', 'month'),
+    )
+
+    vehicle_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Date, primary_key=True)
+    orders = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    amount_paid = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    balance = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    last_order_at = db.Column(db.DateTime, nullable=True)
+
+
+ARCHIVE_MODELS = (WorkOrderArchive, OrderItemArchive, PaymentArchive, ArchivedMonth)
+
+# Modelos con updated_at que se exponen en /api/sync (nombre de entidad = tabla)
+SYNC_MODELS = (Client, Vehicle, Service, WorkOrder, OrderItem, Payment, CarListing)
+
+
+def tombstones_from(model, ids):
+    """
+    INSERT ... SELECT que registra como borradas las filas de `model` cuyos
+    ids devuelve la consulta `ids`. Los borrados en cascada de la base de
+    datos (ON DELETE CASCADE) no pasan por after_delete y se registran así,
+    antes del DELETE.
+    """
+    deleted = ids.subquery()
+    return SyncTombstone.__table__.insert().from_select(
+        ['entity', 'entity_id', 'deleted_at'],
+        db.select(db.literal(model.__tablename__), deleted.c[0], db.literal(datetime.utcnow(), db.DateTime))
+    )
+
+
+def _record_tombstone(mapper, connection, target):
+    """Registra el borrado en la misma transacción que el DELETE."""
+    connection.execute(SyncTombstone.__table__.insert().values(
+        entity=target.__tablename__, entity_id=target.id, deleted_at=datetime.utcnow()
+    ))
+
+
+for _model in SYNC_MODELS:
+    db.event.listen(_model, 'after_delete', _record_tombstone)
@@ -0,0 +1,65 @@
+from werkzeug.utils import cached_property, import_string
+
+# ==============================================================================
+# Registro Diferido de Blueprints (Lazy Loading)
+# ==============================================================================
+# Los blueprints de uso poco frecuente no se importan al arrancar: sus reglas
+# se registran desde este manifiesto y el módulo de la vista se importa en la
+# primera petición que lo usa. Reduce el tiempo de arranque en despliegues con
+# autoescalado o serverless.
+#
+# El manifiesto debe coincidir con los decoradores de cada módulo
+# (tests/test_startup.py lo verifica). Con LAZY_BLUEPRINTS=False se registran
+# los blueprints normalmente.
+# ==============================================================================
+
+# nombre -> (módulo, atributo del blueprint, url_prefix, [(regla, vista, métodos)])
+LAZY_BLUEPRINTS = {
+    'ai': ('app.routes.ai', 'ai_bp', '/api/ai', [
+        ('/ask', 'ask_ai', ['POST']),
+    ]),
+    'marketplace': ('app.routes.marketplace', 'marketplace_bp', '/api/marketplace', [
+        ('/', 'get_listings', ['GET']),
+        ('/my-listings', 'get_my_listings', ['GET']),
+        ('/', 'create_listing', ['POST']),
+        ('/<int:listing_id>', 'delete_listing', ['DELETE']),
+    ]),
+    'users': ('app.routes.users', 'users_bp', '/api/users', [
+        ('/technicians', 'get_technicians', ['GET']),
+    ]),
+}
+
+
+class LazyView:
+    """Vista que importa su función real la primera vez que se llama."""
+
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit('.', 1)
+        self.import_name = import_name
+
+    @cached_property
+    def view(self):
+        return import_string(self.import_name)
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+def register_lazy_blueprints(app):
+    """
+    Registra los blueprints del manifiesto. Si LAZY_BLUEPRINTS está activo,
+    solo agrega las reglas (mismos endpoints 'blueprint.vista'); si no,
+    importa y registra cada blueprint.
+    """
+    lazy = app.config.get('LAZY_BLUEPRINTS', True)
+    for name, (module, attribute, prefix, routes) in LAZY_BLUEPRINTS.items():
+        if not lazy:
+            app.register_blueprint(import_string(f"{module}.{attribute}"))
+            continue
+        for rule, view_name, methods in routes:
+            app.add_url_rule(
+                prefix + rule,
+                endpoint=f"{name}.{view_name}",
+                view_func=LazyView(f"{module}.{view_name}"),
+                methods=methods,
+            )
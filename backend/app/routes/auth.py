@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.services.auth_service import AuthService
 from app.models import User
+from app.utils.replica import skip_write_tracking
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 # ==============================================================================
@@ -12,6 +13,13 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+
+@auth_bp.before_request
+def _skip_write_tracking():
+    # Login y registro no son escrituras que el usuario vaya a releer: no fijan
+    # sus lecturas (ni las de su IP) al primario
+    skip_write_tracking()
+
 # ==============================================================================
 # Endpoint: Registro de Usuario
 # ==============================================================================
@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from flask import Blueprint, current_app, request, jsonify
+from flask.globals import app_ctx
+from flask_jwt_extended import get_jwt, jwt_required
+from werkzeug.test import EnvironBuilder
+from app import db
+from app.utils.replica import skip_write_tracking
+from app.utils.tokens import trust_verified_token
+
+# ==============================================================================
+# Capa de RUTAS (Controlador) - Peticiones por Lote
+# ==============================================================================
+# POST /api/batch ejecuta varias sub-peticiones contra los blueprints
+# existentes dentro del mismo proceso y devuelve todas las respuestas juntas:
+# una sola petición HTTP y, en modo secuencial, la misma sesión de base de
+# datos (el usuario que consultan varias rutas se lee una sola vez).
+#
+# El token del lote se verifica una vez en la entrada; las sub-peticiones que
+# lo reenvían reciben sus claims ya decodificados (ver app/utils/tokens.py).
+# Una sub-petición con su propio header Authorization se verifica aparte.
+#
+# Cada sub-petición pasa por el ciclo completo de Flask (before_request,
+# vista, after_request) con un `g` propio: métricas, perfilado y
+# read-your-writes de la réplica la ven como una petición más, y lo que deja
+# en `g` (usuario del JWT, lecturas forzadas al primario, ...) no llega a las
+# siguientes ni al lote.
+#
+# Con "parallel": true y solo sub-peticiones GET, se ejecutan en hilos; cada
+# hilo tiene su propio contexto y su propia sesión (una sesión no se comparte
+# entre hilos).
+# ==============================================================================
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+ALLOWED_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+
+def _validate(specs, max_requests):
+    """Retorna un mensaje de error o None si las sub-peticiones son válidas."""
+    if not isinstance(specs, list) or not specs:
+        return "Se requiere 'requests': lista de sub-peticiones"
+    if len(specs) > max_requests:
+        return f"Máximo {max_requests} sub-peticiones por lote"
+    for spec in specs:
+        if not isinstance(spec, dict) or not isinstance(spec.get('path'), str):
+            return "Cada sub-petición requiere 'path'"
+        if not spec['path'].startswith('/api/') or spec['path'].split('?')[0].rstrip('/') == '/api/batch':
+            return f"Ruta no permitida: {spec['path']}"
+        if spec.get('method', 'GET').upper() not in ALLOWED_METHODS:
+            return f"Método no permitido: {spec.get('method')}"
+    return None
+
+
+@contextmanager
+def _clean_globals(app):
+    """
+    Da a la sub-petición un `g` vacío. En modo secuencial el contexto de
+    aplicación (y con él la sesión) es el del lote; solo se reemplaza su `g`.
+    """
+    ctx = app_ctx._get_current_object()
+    saved, ctx.g = ctx.g, app.app_ctx_globals_class()
+    try:
+        yield
+    finally:
+        ctx.g = saved
+
+
+def _dispatch(app, spec, base_url, authorization, remote_addr, verified):
+    """Ejecuta una sub-petición en un contexto de petición propio y la serializa."""
+    method = spec.get('method', 'GET').upper()
+    headers = dict(spec.get('headers') or {})
+    if authorization and 'Authorization' not in headers:
+        headers['Authorization'] = authorization
+
+    builder = EnvironBuilder(spec['path'], base_url=base_url, method=method, json=spec.get('body'),
+                             headers=headers, environ_base={'REMOTE_ADDR': remote_addr})
+    with app.request_context(builder.get_environ()), _clean_globals(app):
+        if verified:
+            trust_verified_token(*verified)
+        try:
+            # before_request, vista (errores HTTP y de JWT incluidos) y after_request
+            response = app.full_dispatch_request()
+        except Exception:
+            app.logger.exception("Error en sub-petición %s %s", method, spec['path'])
+            db.session.rollback()
+            return {"status": 500, "body": {"msg": "Error interno"}}
+
+        if response.mimetype == 'text/event-stream':
+            response.close()
+            return {"status": 400, "body": {"msg": "Los streams (SSE) no se pueden agrupar"}}
+        if response.status_code >= 500:
+            db.session.rollback()  # la sesión se comparte con las siguientes sub-peticiones
+        body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+        return {"status": response.status_code, "body": body}
+
+
+# ==============================================================================
+# Endpoint: Ejecutar Lote
+# ==============================================================================
+@batch_bp.route('', methods=['POST'])
+@jwt_required()
+def run_batch():
+    """
+    Ejecuta varias sub-peticiones y devuelve sus respuestas en el mismo orden.
+
+    Request Body:
+        requests (list): [{id?, method (GET por defecto), path, body?, headers?}].
+            El token JWT del lote se reenvía a cada sub-petición.
+        parallel (bool, optional): Ejecutar en paralelo (solo si todas son GET).
+
+    Returns:
+        JSON: responses: [{id, status, body}]. El lote responde 200 aunque
+        alguna sub-petición falle; cada una trae su propio status.
+    """
+    data = request.get_json(silent=True) or {}
+    specs = data.get('requests')
+    error = _validate(specs, current_app.config.get('BATCH_MAX_REQUESTS', 20))
+    if error:
+        return jsonify({"msg": error}), 400
+
+    app = current_app._get_current_object()
+    authorization = request.headers.get('Authorization')
+    # Token y claims ya verificados por @jwt_required: las sub-peticiones no lo decodifican otra vez
+    verified = (authorization.split()[-1], get_jwt()) if authorization else None
+    context = (request.host_url, authorization, request.remote_addr, verified)
+    # El POST del lote no es una escritura; solo cuentan las sub-peticiones que escriben
+    skip_write_tracking()
+
+    parallel = data.get('parallel') and len(specs) > 1 \
+        and all(spec.get('method', 'GET').upper() == 'GET' for spec in specs)
+    if parallel:
+        workers = min(len(specs), current_app.config.get('BATCH_MAX_WORKERS', 4))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda spec: _dispatch(app, spec, *context), specs))
+    else:
+        # Cada sub-petición que escribe registra su escritura en su propio after_request
+        results = [_dispatch(app, spec, *context) for spec in specs]
+
+    responses = [{"id": spec.get('id', index), **result} for index, (spec, result) in enumerate(zip(specs, results))]
+    return jsonify({"responses": responses}), 200
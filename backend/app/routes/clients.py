@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.services.client_service import ClientService
 from app.models import Client, User
+from app.utils.cache import cached, get_or_set
+from app.utils.fieldsets import FIELDSETS
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 # ==============================================================================
@@ -58,20 +60,32 @@ def create_client():
 def get_clients():
     """
     Obtiene la lista de todos los clientes registrados.
+
+    Query Params:
+        fields (str, optional): Campos a devolver (ej: id,first_name,last_name).
+        include (str, optional): Relaciones a embeber (vehicles).
     """
+    fieldset = FIELDSETS['client']
+    try:
+        selection = fieldset.from_request(request.args)
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
     try:
+        options = fieldset.options(selection)
         page = request.args.get('page', type=int)
         per_page = request.args.get('per_page', type=int)
         if page and per_page:
-            query = Client.query.order_by(Client.created_at.desc())
-            items = query.limit(per_page).offset((page - 1) * per_page).all()
-            total = Client.query.count()
+            active = Client.query.filter(Client.deleted_at.is_(None))
+            items = active.options(*options).order_by(Client.created_at.desc()) \
+                .limit(per_page).offset((page - 1) * per_page).all()
+            total = active.count()
             return jsonify({
-                "items": [c.to_dict() for c in items],
+                "items": [fieldset.dump(c, selection) for c in items],
                 "meta": {"page": page, "per_page": per_page, "total": total}
             }), 200
-        clients = ClientService.get_all_clients()
-        return jsonify([client.to_dict() for client in clients]), 200
+        clients = ClientService.get_all_clients(options=options)
+        return jsonify([fieldset.dump(client, selection) for client in clients]), 200
     except Exception as e:
         return jsonify({"msg": f"Error al obtener clientes: {str(e)}"}), 500
 
@@ -79,6 +93,7 @@ def get_clients():
 # Endpoint: Obtener Cliente por ID
 # ==============================================================================
 @clients_bp.route('/<int:client_id>', methods=['GET'])
+@cached('client', ttl=120, tags=('client:{client_id}',))
 def get_client(client_id):
     try:
         client = ClientService.get_client_by_id(client_id)
@@ -88,6 +103,31 @@ def get_client(client_id):
     except Exception as e:
         return jsonify({"msg": f"Error interno: {str(e)}"}), 500
 
+# ==============================================================================
+# Endpoint: Resumen 360 del Cliente
+# ==============================================================================
+@clients_bp.route('/<int:client_id>/summary', methods=['GET'])
+@jwt_required()
+def get_client_summary(client_id):
+    """
+    Devuelve en una sola petición lo que necesita recepción: cliente, vehículos,
+    órdenes abiertas, saldo pendiente (totales - pagos) y última visita.
+    Se cachea y se invalida con cualquier escritura del cliente, sus vehículos,
+    órdenes o pagos.
+    """
+    try:
+        summary = get_or_set(
+            f"client:{client_id}:summary",
+            lambda: ClientService.get_client_summary(client_id),
+            ttl=120, tags=(f'client-summary:{client_id}',), policy='client_summary',
+            cache_if=lambda value: value is not None
+        )
+        if summary is None:
+            return jsonify({"msg": "Cliente no encontrado"}), 404
+        return jsonify(summary), 200
+    except Exception as e:
+        return jsonify({"msg": f"Error interno: {str(e)}"}), 500
+
 # ==============================================================================
 # Endpoint: Actualizar Cliente
 # ==============================================================================
@@ -109,12 +149,18 @@ def update_client(client_id):
 @clients_bp.route('/<int:client_id>', methods=['DELETE'])
 @jwt_required()
 def delete_client(client_id):
+    """
+    Elimina un cliente con sus vehículos, órdenes, items y pagos.
+
+    Query Params:
+        soft (bool, optional): Borrado lógico (conserva vehículos y órdenes).
+    """
     try:
         current_user_id = get_jwt_identity()
         user = User.query.get(current_user_id)
         if not user or user.role != 'admin':
             return jsonify({"msg": "Acceso denegado. Se requieren permisos de administrador"}), 403
-        ClientService.delete_client(client_id)
+        ClientService.delete_client(client_id, soft=request.args.get('soft', '').lower() in ('1', 'true'))
         return jsonify({"msg": "Cliente eliminado exitosamente"}), 200
     except ValueError as e:
         return jsonify({"msg": str(e)}), 404
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models import CarListing, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.cache import cached, invalidate
 from datetime import datetime
 
 marketplace_bp = Blueprint('marketplace', __name__, url_prefix='/api/marketplace')
@@ -10,6 +11,7 @@ marketplace_bp = Blueprint('marketplace', __name__, url_prefix='/api/marketplace
 # Obtener todas las publicaciones (Feed Público)
 # ==============================================================================
 @marketplace_bp.route('/', methods=['GET'])
+@cached('marketplace', ttl=30, tags=('marketplace',))
 def get_listings():
     """
     Obtiene todas las publicaciones de autos disponibles.
@@ -60,6 +62,7 @@ def create_listing():
     try:
         db.session.add(new_listing)
         db.session.commit()
+        invalidate('marketplace')
         return jsonify(new_listing.to_dict()), 201
     except Exception as e:
         db.session.rollback()
@@ -84,6 +87,7 @@ def delete_listing(listing_id):
     try:
         db.session.delete(listing)
         db.session.commit()
+        invalidate('marketplace')
         return jsonify({"msg": "Publicación eliminada"}), 200
     except Exception as e:
         return jsonify({"msg": f"Error: {str(e)}"}), 500
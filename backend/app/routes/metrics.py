@@ -0,0 +1,42 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.utils.metrics import get_registry
+
+# ==============================================================================
+# Endpoint de Métricas (Prometheus)
+# ==============================================================================
+# Expone las métricas de instrumentación en formato de texto de Prometheus.
+# Solo se registra si METRICS_ENABLED está activo. Expone nombres de rutas y
+# tiempos, así que solo responde a las IPs de METRICS_ALLOWED_IPS o a quien
+# envíe METRICS_TOKEN como Bearer (salvo METRICS_PUBLIC=true).
+# ==============================================================================
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _metrics_allowed():
+    config = current_app.config
+    if config.get('METRICS_PUBLIC'):
+        return True
+    token = config.get('METRICS_TOKEN')
+    auth = request.headers.get('Authorization', '')
+    if token and auth.startswith('Bearer ') and hmac.compare_digest(auth[7:], token):
+        return True
+    allowed = {ip.strip() for ip in (config.get('METRICS_ALLOWED_IPS') or '').split(',') if ip.strip()}
+    return request.remote_addr in allowed
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Devuelve las métricas acumuladas por el proceso actual.
+
+    Returns:
+        text/plain: Métricas en formato de exposición de Prometheus.
+        403: Si la IP no está permitida y no se envía el token.
+    """
+    if not _metrics_allowed():
+        return jsonify({"msg": "Acceso a métricas no permitido"}), 403
+    registry = get_registry(current_app)
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -1,6 +1,10 @@
-from flask import Blueprint, request, jsonify
-from app.services.order_service import OrderService
+from flask import Blueprint, Response, current_app, request, jsonify
+from app.services.order_service import ORDER_STATUSES, OrderService
 from app.models import User
+from app.utils.cache import cached, get_or_set
+from app.utils.events import issue_stream_ticket, read_stream_ticket
+from app.utils.fieldsets import FIELDSETS
+from app.utils.pagination import parse_date, parse_limit
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 # ==============================================================================
@@ -60,6 +64,7 @@ def create_service():
 # Endpoint: Listar Servicios (Helper)
 # ==============================================================================
 @orders_bp.route('/services', methods=['GET'])
+@cached('services', ttl=300, tags=('services',))
 def get_services():
     """
     Obtiene la lista de todos los servicios disponibles.
@@ -156,6 +161,37 @@ def create_order():
     except Exception as e:
         return jsonify({"msg": f"Error al crear orden: {str(e)}"}), 500
 
+# Parámetros de búsqueda de /api/orders (con cualquiera de ellos la respuesta se pagina)
+SEARCH_PARAMS = ('status', 'from', 'to', 'user_id', 'vehicle_id', 'plate', 'client_id', 'cursor', 'limit')
+
+
+def _parse_order_filters(args):
+    """
+    Convierte los query params de búsqueda en argumentos de OrderService.search_orders.
+
+    Raises:
+        ValueError: Si algún filtro no es válido.
+    """
+    status = args.get('status')
+    if status and status not in ORDER_STATUSES:
+        raise ValueError(f"Estado inválido. Permitidos: {', '.join(ORDER_STATUSES)}")
+    filters = {"status": status, "plate": args.get('plate'), "cursor": args.get('cursor')}
+    for name in ('user_id', 'vehicle_id', 'client_id'):
+        value = args.get(name)
+        if value:
+            if not value.isdigit():
+                raise ValueError(f"{name} debe ser un número")
+            filters[name] = int(value)
+    try:
+        if args.get('from'):
+            filters["date_from"] = parse_date(args['from'])
+        if args.get('to'):
+            filters["date_to"] = parse_date(args['to'], end=True)
+    except ValueError:
+        raise ValueError("Fechas inválidas: usar formato ISO (AAAA-MM-DD)")
+    filters["limit"] = parse_limit(args.get('limit'))
+    return filters
+
 # ==============================================================================
 # Endpoint: Listar Órdenes
 # ==============================================================================
@@ -163,21 +199,144 @@ def create_order():
 @jwt_required()
 def get_orders():
     """
-    Obtiene la lista de todas las órdenes de trabajo.
+    Obtiene la lista de órdenes de trabajo, de la más reciente a la más antigua.
+
+    Query Params:
+        status (str, optional): pendiente, en_progreso, finalizado, entregado.
+        from / to (str, optional): Rango de fechas de creación (ISO; `to` incluye el día).
+        user_id (int, optional): Mecánico/usuario que abrió la orden.
+        vehicle_id (int, optional), plate (str, optional), client_id (int, optional).
+        cursor (str, optional): Valor de `next_cursor` de la página anterior.
+        limit (int, optional): Órdenes por página (por defecto 20, máximo 100).
+        fields (str, optional): Campos a devolver (ej: id,status,total,vehicle_plate).
+            Las columnas no pedidas no se leen de la base de datos.
+        include (str, optional): Relaciones a embeber (items, payments, vehicle).
+            Por defecto se incluyen los items; ?include= vacío no embebe ninguna.
+
+    Returns:
+        JSON: Con algún parámetro de búsqueda, {orders, next_cursor}; sin ellos,
+        la lista completa (compatibilidad con clientes anteriores).
     """
+    fieldset = FIELDSETS['order']
     try:
-        orders = OrderService.get_all_orders()
-        response = []
-        for order in orders:
-             order_dict = order.to_dict()
-             # Enriquecer con info básica de vehiculo para la tabla
-             if order.vehicle:
-                 order_dict['vehicle_plate'] = order.vehicle.plate
-             response.append(order_dict)
-        return jsonify(response), 200
+        selection = fieldset.from_request(request.args)
+        search = any(name in request.args for name in SEARCH_PARAMS)
+        filters = _parse_order_filters(request.args) if search else None
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    try:
+        # created_at se lee siempre: es la columna del cursor
+        options = fieldset.options(selection, required=('created_at',))
+        if search:
+            orders, next_cursor = OrderService.search_orders(options=options, **filters)
+            return jsonify({
+                "orders": [fieldset.dump(order, selection) for order in orders],
+                "next_cursor": next_cursor
+            }), 200
+        orders = OrderService.get_all_orders(options=options)
+        return jsonify([fieldset.dump(order, selection) for order in orders]), 200
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
     except Exception as e:
         return jsonify({"msg": f"Error al obtener órdenes: {str(e)}"}), 500
 
+# ==============================================================================
+# Endpoint: Tablero del Taller
+# ==============================================================================
+@orders_bp.route('/orders/board', methods=['GET'])
+@jwt_required()
+def get_order_board():
+    """
+    Columnas del tablero: cantidad de órdenes por estado y las más recientes
+    de cada uno, con placa y nombre del cliente.
+
+    Query Params:
+        limit (int, optional): Órdenes por columna (por defecto 10, máximo 50).
+
+    Returns:
+        JSON: columns: [{status, count, orders: [{id, vehicle_id, total,
+        created_at, vehicle_plate, client_name}]}], en orden de flujo.
+    """
+    per_status = parse_limit(request.args.get('limit'), default=10, maximum=50)
+    try:
+        # Caché breve: se invalida al crear órdenes, agregar items o cambiar
+        # de estado (etiqueta 'orders') y al editar vehículos o clientes
+        columns = get_or_set(
+            f"orders:board:{per_status}",
+            lambda: OrderService.get_board(per_status),
+            ttl=10, tags=('orders', 'vehicles', 'clients'), policy='board'
+        )
+        return jsonify({"columns": columns}), 200
+    except Exception as e:
+        return jsonify({"msg": f"Error al obtener tablero: {str(e)}"}), 500
+
+# ==============================================================================
+# Endpoint: Eventos de Órdenes (SSE)
+# ==============================================================================
+@orders_bp.route('/orders/events/ticket', methods=['POST'])
+@jwt_required()
+def order_events_ticket():
+    """
+    Emite un ticket para abrir /api/orders/events con EventSource (que no
+    permite cabeceras). Caduca tras EVENTS_TICKET_TTL segundos y no sirve como
+    JWT, así que no importa que quede en los logs de acceso.
+
+    Returns:
+        JSON: ticket y expires_in (segundos).
+    """
+    return jsonify({
+        "ticket": issue_stream_ticket(get_jwt_identity()),
+        "expires_in": current_app.config.get('EVENTS_TICKET_TTL', 60)
+    }), 200
+
+
+@orders_bp.route('/orders/events', methods=['GET'])
+@jwt_required(optional=True)
+def order_events():
+    """
+    Canal Server-Sent Events con los cambios de órdenes (creación, items y
+    estado), para que los tableros no tengan que consultar /api/orders.
+
+    Autenticación: JWT en la cabecera o ?ticket=<ticket> de
+    POST /api/orders/events/ticket. Al reconectar, el navegador envía
+    Last-Event-ID y se reenvían los eventos posteriores (también se acepta
+    ?last_event_id=). Sin cursor, el stream empieza desde el evento más reciente.
+
+    Eventos: order_created, order_item_added, order_status_changed.
+    503 si el proceso ya tiene EVENTS_MAX_STREAMS conexiones abiertas.
+    """
+    user_id = get_jwt_identity() or read_stream_ticket(
+        request.args.get('ticket'), current_app.config.get('EVENTS_TICKET_TTL', 60))
+    if not user_id:
+        return jsonify({"msg": "Se requiere token o ticket válido"}), 401
+
+    broadcaster = current_app.extensions['order_events']
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        cursor = int(last_event_id) if last_event_id else broadcaster.latest_id()
+    except ValueError:
+        return jsonify({"msg": "Last-Event-ID inválido"}), 400
+
+    # Cada stream ocupa un hilo del worker: por encima del límite, el cliente reintenta
+    if not broadcaster.acquire_stream():
+        response = jsonify({"msg": "Demasiadas conexiones de eventos, reintente más tarde"})
+        response.headers['Retry-After'] = '10'
+        return response, 503
+
+    stream = broadcaster.stream(
+        cursor,
+        timeout=current_app.config.get('EVENTS_STREAM_TIMEOUT', 300),
+        heartbeat=current_app.config.get('EVENTS_HEARTBEAT', 15)
+    )
+    response = Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # nginx: no acumular el stream
+    })
+    # Se libera al cerrar la respuesta (aunque el generador no llegue a empezar)
+    response.call_on_close(broadcaster.release_stream)
+    return response
+
 # ==============================================================================
 # Endpoint: Agregar Item a Orden
 # ==============================================================================
@@ -1,14 +1,20 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from app import db
 from app.models import Payment, WorkOrder
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 from flask_jwt_extended import jwt_required
+from app.services.archive_service import ArchiveService
+from app.services.payment_service import PaymentService
+from app.utils.pagination import decode_cursor, encode_cursor, parse_date, parse_limit
 
 # ==============================================================================
 # Capa de RUTAS (Controlador) - Payments
 # ==============================================================================
 payments_bp = Blueprint('payments', __name__, url_prefix='/api/payments')
 
+# Parámetros de /api/payments/history (con cualquiera de ellos la respuesta se pagina)
+HISTORY_PARAMS = ('from', 'to', 'cursor', 'limit')
+
 # ==============================================================================
 # Endpoint: Crear Pago
 # ==============================================================================
@@ -35,19 +41,20 @@ def create_payment():
         return jsonify({"msg": "Orden de trabajo no encontrada"}), 404
 
     try:
-        new_payment = Payment(
-            work_order_id=work_order_id,
+        # El servicio registra el pago y actualiza el saldo de la orden en la misma transacción
+        new_payment = PaymentService.register_payment(
+            work_order,
             amount=float(amount),
             payment_method=payment_method,
             status=status
         )
-        db.session.add(new_payment)
-        db.session.commit()
-        
+
         return jsonify({
             "msg": "Pago registrado exitosamente",
             "payment": new_payment.to_dict()
         }), 201
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"msg": f"Error al registrar pago: {str(e)}"}), 500
@@ -59,11 +66,62 @@ def create_payment():
 @jwt_required()
 def get_payment_history():
     """
-    Obtiene el historial completo de pagos.
+    Obtiene el historial de pagos (incluye los de órdenes archivadas), del más
+    reciente al más antiguo.
+
+    Query Params:
+        from / to (str, optional): Rango de fechas del pago (ISO; `to` incluye el día).
+        cursor (str, optional): Valor de `next_cursor` de la página anterior.
+        limit (int, optional): Pagos por página (por defecto 20, máximo 100).
+
+    Returns:
+        JSON: Con algún parámetro, {payments, next_cursor}: solo se leen los
+        meses archivados del rango. Sin ellos, la lista completa
+        (compatibilidad con clientes anteriores; lee todo el archivo).
     """
+    directory = current_app.config['ARCHIVE_DIR']
+    if not any(name in request.args for name in HISTORY_PARAMS):
+        try:
+            payments = [p.to_dict() for p in Payment.query.order_by(Payment.created_at.desc()).all()]
+            archived = ArchiveService.get_archived_payments(directory)
+            if archived:
+                payments = sorted(payments + archived, key=lambda p: (p['created_at'] or '', p['id']), reverse=True)
+            return jsonify(payments), 200
+        except Exception as e:
+            return jsonify({"msg": f"Error al obtener historial: {str(e)}"}), 500
+
+    limit = parse_limit(request.args.get('limit'))
     try:
-        payments = Payment.query.order_by(Payment.created_at.desc()).all()
-        return jsonify([p.to_dict() for p in payments]), 200
+        date_from = parse_date(request.args['from']) if request.args.get('from') else None
+        date_to = parse_date(request.args['to'], end=True) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"msg": "Fechas inválidas: usar formato ISO (AAAA-MM-DD)"}), 400
+    try:
+        cursor = request.args.get('cursor')
+        before = tuple(decode_cursor(cursor, [Payment.created_at, Payment.id])) if cursor else None
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    try:
+        # limit + 1 de cada origen: alcanza para armar la página y saber si hay otra
+        query = Payment.query
+        if date_from is not None:
+            query = query.filter(Payment.created_at >= date_from)
+        if date_to is not None:
+            query = query.filter(Payment.created_at < date_to)
+        if before is not None:
+            query = query.filter(tuple_(Payment.created_at, Payment.id) < tuple_(*before))
+        live = query.order_by(Payment.created_at.desc(), Payment.id.desc()).limit(limit + 1).all()
+        archived = ArchiveService.get_archived_payments(directory, date_from=date_from, date_to=date_to,
+                                                        before=before, limit=limit + 1)
+
+        payments = sorted([p.to_dict() for p in live] + archived,
+                          key=lambda p: (p['created_at'] or '', p['id']), reverse=True)
+        next_cursor = None
+        if len(payments) > limit:
+            payments = payments[:limit]
+            next_cursor = encode_cursor([payments[-1]['created_at'], payments[-1]['id']])
+        return jsonify({"payments": payments, "next_cursor": next_cursor}), 200
     except Exception as e:
         return jsonify({"msg": f"Error al obtener historial: {str(e)}"}), 500
 
@@ -88,9 +146,55 @@ def get_revenue_summary():
         
         method_summary = {method: amount for method, amount in revenue_by_method}
 
+        # Meses archivados: totales precalculados en archived_months
+        for method, amount in ArchiveService.get_archived_totals()['revenue'].items():
+            method_summary[method] = method_summary.get(method, 0) + amount
+            total_revenue += amount
+
         return jsonify({
             "total_revenue": total_revenue,
             "by_method": method_summary
         }), 200
     except Exception as e:
         return jsonify({"msg": f"Error al generar resumen: {str(e)}"}), 500
+
+# ==============================================================================
+# Endpoint: Cuentas por Cobrar (Órdenes con Saldo)
+# ==============================================================================
+@payments_bp.route('/outstanding', methods=['GET'])
+@jwt_required()
+def get_outstanding_orders():
+    """
+    Lista las órdenes con saldo pendiente, de la más antigua a la más reciente.
+
+    Query Params:
+        cursor (str, optional): Valor de `next_cursor` de la página anterior.
+        limit (int, optional): Órdenes por página (por defecto 20, máximo 100).
+
+    Returns:
+        JSON: orders, next_cursor y, en la primera página, los totales por cobrar.
+    """
+    cursor = request.args.get('cursor')
+    try:
+        orders, next_cursor = PaymentService.get_outstanding_orders(
+            cursor=cursor, limit=parse_limit(request.args.get('limit'))
+        )
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    response = {
+        "orders": [{
+            'id': o.id,
+            'vehicle_id': o.vehicle_id,
+            'status': o.status,
+            'total': o.total,
+            'amount_paid': o.amount_paid,
+            'balance': o.balance,
+            'created_at': o.created_at.isoformat() if o.created_at else None
+        } for o in orders],
+        "next_cursor": next_cursor
+    }
+    if not cursor:
+        response["summary"] = PaymentService.get_outstanding_totals()
+    return jsonify(response), 200
+
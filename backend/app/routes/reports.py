@@ -1,7 +1,9 @@
 from flask import Blueprint, jsonify
 from app.services.report_service import ReportService
 from app.models import User
+from app.utils.cache import get_or_set
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
 
 # ==============================================================================
 # Capa de RUTAS (Controlador) - Reports
@@ -32,8 +34,13 @@ def get_dashboard_metrics():
         return jsonify({"msg": "Acceso denegado. Se requieren permisos de administrador"}), 403
 
     try:
-        # Delegamos la lógica de agregación al servicio
-        metrics = ReportService.get_monthly_metrics()
+        # Delegamos la lógica de agregación al servicio. La caché se consulta
+        # después de verificar el rol; la clave incluye el mes en curso.
+        metrics = get_or_set(
+            f"reports:dashboard:{datetime.utcnow():%Y-%m}",
+            ReportService.get_monthly_metrics,
+            ttl=30, tags=('orders',), policy='dashboard'
+        )
         return jsonify(metrics), 200
 
     except Exception as e:
@@ -0,0 +1,45 @@
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.services.sync_service import SyncService
+from app.utils.pagination import parse_limit
+from app.utils.replica import use_primary
+
+# ==============================================================================
+# Capa de RUTAS (Controlador) - Sincronización incremental
+# ==============================================================================
+sync_bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+# ==============================================================================
+# Endpoint: Cambios desde la última sincronización
+# ==============================================================================
+@sync_bp.route('', methods=['GET'])
+@jwt_required()
+def get_changes():
+    """
+    Devuelve solo las filas creadas, modificadas o eliminadas desde `since`,
+    agrupadas por entidad (clients, vehicles, services, work_orders,
+    order_items, payments, car_listings).
+
+    Query Params:
+        since (str, optional): Fecha ISO o el `next_since` de la respuesta anterior.
+            Sin valor, devuelve todo (sincronización inicial).
+        entities (str, optional): Lista separada por comas (todas por defecto).
+        limit (int, optional): Máximo de filas por entidad (por defecto 500, máximo 1000).
+
+    Returns:
+        JSON: changes ({entidad: {updated: [...], deleted: [ids]}}), next_since,
+        has_more (si es true, volver a llamar de inmediato con next_since) y server_time.
+    """
+    # El cursor avanza sobre lo confirmado: leer del primario, no de una réplica atrasada
+    use_primary()
+    entities = [e.strip() for e in request.args.get('entities', '').split(',') if e.strip()]
+    try:
+        result = SyncService.get_changes(
+            since=request.args.get('since'),
+            entities=entities or None,
+            limit=parse_limit(request.args.get('limit'), default=500, maximum=1000),
+            settle_seconds=current_app.config.get('SYNC_SETTLE_SECONDS', 2.0)
+        )
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+    return jsonify(result), 200
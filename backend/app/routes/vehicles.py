@@ -1,6 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from app.services.archive_service import ArchiveService
 from app.services.client_service import ClientService
+from app.services.order_service import OrderService
 from app.models import Vehicle
+from app.utils.cache import cached, get_or_set
+from app.utils.fieldsets import FIELDSETS
+from app.utils.pagination import parse_limit
 from flask_jwt_extended import jwt_required
 
 # ==============================================================================
@@ -18,13 +23,23 @@ vehicles_bp = Blueprint('vehicles', __name__, url_prefix='/api/vehicles')
 def get_all_vehicles():
     """
     Obtiene todos los vehículos registrados, incluyendo info básica del dueño.
+
+    Query Params:
+        fields (str, optional): Campos a devolver (ej: id,plate,client_name).
+        include (str, optional): Relaciones a embeber (owner).
     """
+    fieldset = FIELDSETS['vehicle']
+    try:
+        selection = fieldset.from_request(request.args)
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
     try:
         page = request.args.get('page', type=int)
         per_page = request.args.get('per_page', type=int)
         plate = request.args.get('plate', type=str)
 
-        query = Vehicle.query
+        query = Vehicle.query.filter(Vehicle.deleted_at.is_(None)).options(*fieldset.options(selection))
         if plate:
             query = query.filter(Vehicle.plate.ilike(f"%{plate}%"))
 
@@ -35,14 +50,7 @@ def get_all_vehicles():
             items = query.all()
             total = len(items)
 
-        response = []
-        for v in items:
-            v_dict = v.to_dict()
-            if v.owner:
-                v_dict['client_name'] = f"{v.owner.first_name} {v.owner.last_name}"
-            else:
-                v_dict['client_name'] = "Desconocido"
-            response.append(v_dict)
+        response = [fieldset.dump(v, selection) for v in items]
 
         if page and per_page:
             return jsonify({"items": response, "meta": {"page": page, "per_page": per_page, "total": total}}), 200
@@ -73,6 +81,7 @@ def create_vehicle():
         return jsonify({"msg": f"Error interno: {str(e)}"}), 500
 
 @vehicles_bp.route('/<int:vehicle_id>', methods=['GET'])
+@cached('vehicle', ttl=120, tags=('vehicle:{vehicle_id}', 'clients'))
 def get_vehicle(vehicle_id):
     try:
         v = ClientService.get_vehicle_by_id(vehicle_id)
@@ -85,6 +94,48 @@ def get_vehicle(vehicle_id):
     except Exception as e:
         return jsonify({"msg": f"Error interno: {str(e)}"}), 500
 
+# ==============================================================================
+# Endpoint: Historial de Servicios del Vehículo
+# ==============================================================================
+@vehicles_bp.route('/<int:vehicle_id>/history', methods=['GET'])
+@jwt_required()
+def get_vehicle_history(vehicle_id):
+    """
+    Historial del vehículo: sus órdenes (más recientes primero) con items y pagos.
+    Incluye las órdenes archivadas (marcadas con "archived": true), también las
+    de meses exportados a archivo.
+
+    Query Params:
+        cursor (str, optional): Valor de `next_cursor` de la página anterior.
+        limit (int, optional): Órdenes por página (por defecto 20, máximo 100).
+        summary (bool, optional): Incluye gasto total, última visita y servicio más frecuente.
+
+    Returns:
+        JSON: vehicle, orders, next_cursor y (opcional) summary.
+    """
+    vehicle = ClientService.get_vehicle_by_id(vehicle_id)
+    if not vehicle:
+        return jsonify({"msg": "Vehículo no encontrado"}), 404
+
+    try:
+        history, next_cursor = ArchiveService.get_vehicle_history(
+            vehicle_id,
+            current_app.config['ARCHIVE_DIR'],
+            cursor=request.args.get('cursor'),
+            limit=parse_limit(request.args.get('limit'))
+        )
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    response = {"vehicle": vehicle.to_dict(), "orders": history, "next_cursor": next_cursor}
+    if request.args.get('summary', '').lower() in ('1', 'true'):
+        response['summary'] = get_or_set(
+            f"vehicle:{vehicle_id}:summary",
+            lambda: OrderService.get_vehicle_summary(vehicle_id),
+            ttl=300, tags=(f'vehicle-history:{vehicle_id}',), policy='vehicle_summary'
+        )
+    return jsonify(response), 200
+
 # ==============================================================================
 # Endpoint: Actualizar Vehículo
 # ==============================================================================
@@ -110,10 +161,13 @@ def update_vehicle(vehicle_id):
 @jwt_required()
 def delete_vehicle(vehicle_id):
     """
-    Elimina un vehículo por su ID.
+    Elimina un vehículo por su ID, con sus órdenes, items y pagos.
+
+    Query Params:
+        soft (bool, optional): Borrado lógico (conserva las órdenes).
     """
     try:
-        ClientService.delete_vehicle(vehicle_id)
+        ClientService.delete_vehicle(vehicle_id, soft=request.args.get('soft', '').lower() in ('1', 'true'))
         return jsonify({"msg": "Vehículo eliminado exitosamente"}), 200
     except ValueError as e:
         return jsonify({"msg": str(e)}), 404
@@ -0,0 +1,513 @@
+import gzip
+import json
+import os
+from datetime import date, datetime
+
+from app import db
+from app.models import (
+    ArchivedMonth, ArchivedVehicleMonth, OrderItem, OrderItemArchive, Payment, PaymentArchive, Service, Vehicle,
+    WorkOrder, WorkOrderArchive,
+)
+from app.services.order_service import OrderService, vehicle_cache_tags
+from app.services.payment_service import PAID_STATUS
+from app.utils.cache import invalidate
+from app.utils.pagination import decode_cursor, encode_cursor
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, text, tuple_
+
+# Solo se archivan órdenes entregadas y sin saldo: ya no cambian y no
+# aparecen en el tablero ni en cuentas por cobrar
+ARCHIVABLE_STATUS = 'entregado'
+# Órdenes por transacción al archivar
+BATCH_SIZE = 500
+_PARTITIONED = (WorkOrderArchive, OrderItemArchive, PaymentArchive)
+
+
+def parse_month(value):
+    """'AAAA-MM' -> date del primer día del mes."""
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except (TypeError, ValueError):
+        raise ValueError("Mes inválido: usar formato AAAA-MM")
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _bounds(month):
+    end = _next_month(month)
+    return datetime(month.year, month.month, 1), datetime(end.year, end.month, 1)
+
+
+def _is_postgres():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def _ensure_partitions(month):
+    """En Postgres, crea la partición del mes en las tablas de archivo."""
+    if not _is_postgres():
+        return
+    start, end = _bounds(month)
+    for model in _PARTITIONED:
+        db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {model.__tablename__}_{month:%Y%m} PARTITION OF {model.__tablename__} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+
+def _serialize(order, items, payments):
+    """Misma forma que el historial de órdenes activas, marcada como archivada."""
+    iso = lambda value: value.isoformat() if value else None
+    return {
+        'id': order.id,
+        'vehicle_id': order.vehicle_id,
+        'user_id': order.user_id,
+        'status': order.status,
+        'total': order.total,
+        'amount_paid': order.amount_paid,
+        'balance': order.balance,
+        'created_at': iso(order.created_at),
+        'items': [{
+            'id': item.id,
+            'work_order_id': item.work_order_id,
+            'service_id': item.service_id,
+            'service_name': item.service_name,
+            'price_at_moment': item.price_at_moment,
+        } for item in items],
+        'payments': [{
+            'id': payment.id,
+            'work_order_id': payment.work_order_id,
+            'amount': payment.amount,
+            'payment_method': payment.payment_method,
+            'status': payment.status,
+            'created_at': iso(payment.created_at),
+        } for payment in payments],
+        'archived': True,
+    }
+
+
+def _load_orders(*criteria, limit=None):
+    """Órdenes de las tablas de archivo (más recientes primero) con items y pagos."""
+    query = WorkOrderArchive.query.filter(*criteria) \
+        .order_by(WorkOrderArchive.created_at.desc(), WorkOrderArchive.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    orders = query.all()
+    if not orders:
+        return []
+
+    ids = [order.id for order in orders]
+    items, payments = {}, {}
+    for item in OrderItemArchive.query.filter(OrderItemArchive.work_order_id.in_(ids)).order_by(OrderItemArchive.id):
+        items.setdefault(item.work_order_id, []).append(item)
+    for payment in PaymentArchive.query.filter(PaymentArchive.work_order_id.in_(ids)).order_by(PaymentArchive.id):
+        payments.setdefault(payment.work_order_id, []).append(payment)
+    return [_serialize(order, items.get(order.id, []), payments.get(order.id, [])) for order in orders]
+
+
+def _read_file(directory, filename):
+    """Órdenes de un mes exportado (una por línea)."""
+    with gzip.open(os.path.join(directory, filename), 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _position(entry):
+    """(created_at, id) de una orden o un pago serializados: orden de los historiales."""
+    created_at = entry['created_at']
+    return (datetime.fromisoformat(created_at) if created_at else datetime.min, entry['id'])
+
+
+def _vehicle_totals(orders):
+    """{vehicle_id: (órdenes, total, pagado, saldo, última orden)} de órdenes serializadas."""
+    totals = {}
+    for order in orders:
+        count, total, paid, balance, last = totals.get(order['vehicle_id'], (0, 0.0, 0.0, 0.0, None))
+        created_at = datetime.fromisoformat(order['created_at']) if order['created_at'] else None
+        totals[order['vehicle_id']] = (
+            count + 1, total + (order['total'] or 0.0), paid + order['amount_paid'], balance + order['balance'],
+            max(filter(None, (last, created_at)), default=None),
+        )
+    return totals
+
+
+def _index_month(summary, vehicle_totals, payment_dates, replace=False):
+    """
+    Agrega al índice del mes los vehículos (con sus totales) y las fechas de
+    pago de las órdenes archivadas o exportadas (archived_vehicle_months y el
+    rango de pagos). Con `replace`, los totales reemplazan a los guardados (el
+    mes exportado completo) en lugar de sumarse.
+    """
+    if vehicle_totals:
+        rows = {row.vehicle_id: row for row in ArchivedVehicleMonth.query.filter(
+            ArchivedVehicleMonth.month == summary.month, ArchivedVehicleMonth.vehicle_id.in_(vehicle_totals))}
+        for vehicle_id, (count, total, paid, balance, last) in vehicle_totals.items():
+            row = rows.get(vehicle_id)
+            if row is None or replace:
+                if row is None:
+                    row = ArchivedVehicleMonth(vehicle_id=vehicle_id, month=summary.month)
+                    db.session.add(row)
+                row.orders, row.total, row.amount_paid, row.balance, row.last_order_at = \
+                    count, total, paid, balance, last
+            else:
+                row.orders += count
+                row.total += total
+                row.amount_paid += paid
+                row.balance += balance
+                row.last_order_at = max(filter(None, (row.last_order_at, last)), default=None)
+    dates = [value for value in payment_dates if value is not None]
+    if summary.first_payment_at is not None:
+        dates += [summary.first_payment_at, summary.last_payment_at]
+    if dates:
+        summary.first_payment_at, summary.last_payment_at = min(dates), max(dates)
+
+
+class ArchiveService:
+    """
+    Servicio de Archivo Histórico.
+
+    Mueve por mes las órdenes cerradas (con items y pagos) de las tablas
+    activas a las tablas de archivo y, opcionalmente, exporta los meses
+    archivados a archivos .jsonl.gz. El historial del vehículo, el de pagos y
+    los reportes siguen viendo esas órdenes: leen las tablas activas, las de
+    archivo y los archivos exportados, y los totales salen de archived_months.
+    """
+
+    @staticmethod
+    def archive_month(month, batch_size=BATCH_SIZE):
+        """
+        Archiva las órdenes entregadas y sin saldo creadas en `month`.
+
+        Cada lote es una transacción: copia órdenes, items y pagos a las
+        tablas de archivo, los borra de las activas y suma el lote al resumen
+        del mes. Se puede repetir (órdenes entregadas después se agregan).
+
+        Args:
+            month (date): Primer día del mes (ver parse_month).
+            batch_size (int): Órdenes por transacción.
+
+        Returns:
+            int: Órdenes archivadas.
+
+        Raises:
+            ValueError: Si el mes es el actual o uno futuro.
+        """
+        start, end = _bounds(month)
+        if end > datetime.utcnow():
+            raise ValueError("Solo se pueden archivar meses ya terminados")
+
+        _ensure_partitions(month)
+        archived = 0
+        while True:
+            ids = db.session.execute(
+                select(WorkOrder.id)
+                .where(WorkOrder.status == ARCHIVABLE_STATUS, WorkOrder.balance <= 0,
+                       WorkOrder.created_at >= start, WorkOrder.created_at < end)
+                .order_by(WorkOrder.id)
+                .limit(batch_size)
+                .with_for_update()
+            ).scalars().all()
+            if not ids:
+                break
+
+            now = datetime.utcnow()
+            orders, items, payments = WorkOrder.__table__, OrderItem.__table__, Payment.__table__
+            db.session.execute(insert(WorkOrderArchive.__table__).from_select(
+                ['id', 'created_at', 'vehicle_id', 'user_id', 'status', 'total', 'amount_paid', 'balance',
+                 'updated_at', 'archived_at'],
+                select(orders.c.id, orders.c.created_at, orders.c.vehicle_id, orders.c.user_id, orders.c.status,
+                       orders.c.total, orders.c.amount_paid, orders.c.balance, orders.c.updated_at,
+                       literal(now, db.DateTime))
+                .where(orders.c.id.in_(ids))
+            ))
+            db.session.execute(insert(OrderItemArchive.__table__).from_select(
+                ['id', 'order_created_at', 'work_order_id', 'service_id', 'service_name', 'price_at_moment',
+                 'updated_at'],
+                select(items.c.id, orders.c.created_at, items.c.work_order_id, items.c.service_id,
+                       Service.__table__.c.name, items.c.price_at_moment, items.c.updated_at)
+                .join(orders, orders.c.id == items.c.work_order_id)
+                .outerjoin(Service.__table__, Service.__table__.c.id == items.c.service_id)
+                .where(items.c.work_order_id.in_(ids))
+            ))
+            db.session.execute(insert(PaymentArchive.__table__).from_select(
+                ['id', 'order_created_at', 'work_order_id', 'amount', 'payment_method', 'status', 'created_at',
+                 'updated_at'],
+                select(payments.c.id, orders.c.created_at, payments.c.work_order_id, payments.c.amount,
+                       payments.c.payment_method, payments.c.status, payments.c.created_at, payments.c.updated_at)
+                .join(orders, orders.c.id == payments.c.work_order_id)
+                .where(payments.c.work_order_id.in_(ids))
+            ))
+
+            revenue = db.session.execute(
+                select(payments.c.payment_method, func.sum(payments.c.amount))
+                .where(payments.c.work_order_id.in_(ids), payments.c.status == PAID_STATUS)
+                .group_by(payments.c.payment_method)
+            ).all()
+            vehicles = Vehicle.query.filter(Vehicle.id.in_(
+                select(orders.c.vehicle_id).where(orders.c.id.in_(ids))
+            )).all()
+            vehicle_totals = db.session.execute(
+                select(orders.c.vehicle_id, func.count(), func.coalesce(func.sum(orders.c.total), 0.0),
+                       func.sum(orders.c.amount_paid), func.sum(orders.c.balance), func.max(orders.c.created_at))
+                .where(orders.c.id.in_(ids))
+                .group_by(orders.c.vehicle_id)
+            ).all()
+            payment_range = db.session.execute(
+                select(func.min(payments.c.created_at), func.max(payments.c.created_at))
+                .where(payments.c.work_order_id.in_(ids))
+            ).one()
+
+            # Borrado con SQL directo: el archivado no es un borrado para /api/sync
+            db.session.execute(delete(items).where(items.c.work_order_id.in_(ids)))
+            db.session.execute(delete(payments).where(payments.c.work_order_id.in_(ids)))
+            db.session.execute(delete(orders).where(orders.c.id.in_(ids)))
+
+            summary = db.session.get(ArchivedMonth, month)
+            if summary is None:
+                summary = ArchivedMonth(month=month, orders=0, revenue='{}', indexed=True)
+                db.session.add(summary)
+            totals = json.loads(summary.revenue or '{}')
+            for method, amount in revenue:
+                totals[method] = totals.get(method, 0) + amount
+            summary.orders += len(ids)
+            summary.revenue = json.dumps(totals)
+            summary.archived_at = now
+            _index_month(summary, {row[0]: tuple(row[1:]) for row in vehicle_totals}, payment_range)
+            db.session.commit()
+
+            tags = ['orders']
+            for vehicle in vehicles:
+                tags.extend(vehicle_cache_tags(vehicle))
+            invalidate(*tags)
+            archived += len(ids)
+        return archived
+
+    @staticmethod
+    def archive_before(before, batch_size=BATCH_SIZE):
+        """
+        Archiva todos los meses anteriores a `before` (date, primer día de mes).
+
+        Returns:
+            dict: 'AAAA-MM' -> órdenes archivadas (solo meses con órdenes).
+        """
+        first = db.session.query(func.min(WorkOrder.created_at)).filter(
+            WorkOrder.status == ARCHIVABLE_STATUS, WorkOrder.balance <= 0,
+            WorkOrder.created_at < datetime(before.year, before.month, 1)
+        ).scalar()
+        results = {}
+        month = date(first.year, first.month, 1) if first else before
+        while month < before:
+            count = ArchiveService.archive_month(month, batch_size=batch_size)
+            if count:
+                results[f"{month:%Y-%m}"] = count
+            month = _next_month(month)
+        return results
+
+    @staticmethod
+    def export_month(month, directory):
+        """
+        Exporta un mes archivado a `directory`/orders-AAAA-MM.jsonl.gz (una
+        orden por línea, con items y pagos) y lo borra de las tablas de
+        archivo (en Postgres se elimina la partición completa).
+
+        Si el mes ya tenía archivo (se archivaron órdenes después de
+        exportarlo), el nuevo archivo contiene ambas partes. El índice del mes
+        (vehículos con sus totales y rango de pagos) se rehace con todo lo
+        exportado.
+
+        Returns:
+            int: Órdenes exportadas (0 si el mes ya estaba exportado completo).
+
+        Raises:
+            ValueError: Si el mes no está archivado.
+        """
+        summary = db.session.get(ArchivedMonth, month)
+        if summary is None:
+            raise ValueError(f"El mes {month:%Y-%m} no está archivado")
+
+        start, end = _bounds(month)
+        orders = _load_orders(WorkOrderArchive.created_at >= start, WorkOrderArchive.created_at < end)
+        exported = len(orders)
+        if summary.file:
+            # Un mes exportado antes del índice se reescribe igual para indexarlo
+            if not orders and summary.indexed:
+                return 0
+            ids = {order['id'] for order in orders}
+            orders += [o for o in _read_file(directory, summary.file) if o['id'] not in ids]
+        orders.sort(key=_position, reverse=True)
+
+        filename = f"orders-{month:%Y-%m}.jsonl.gz"
+        path = os.path.join(directory, filename)
+        os.makedirs(directory, exist_ok=True)
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+            for order in orders:
+                f.write(json.dumps(order, separators=(',', ':')) + '\n')
+        os.replace(path + '.tmp', path)
+
+        # El archivo ya está escrito: si el borrado falla, los lectores descartan duplicados
+        if _is_postgres():
+            for model in _PARTITIONED:
+                db.session.execute(text(f"DROP TABLE IF EXISTS {model.__tablename__}_{month:%Y%m}"))
+        else:
+            db.session.execute(delete(OrderItemArchive).where(
+                OrderItemArchive.order_created_at >= start, OrderItemArchive.order_created_at < end))
+            db.session.execute(delete(PaymentArchive).where(
+                PaymentArchive.order_created_at >= start, PaymentArchive.order_created_at < end))
+            db.session.execute(delete(WorkOrderArchive).where(
+                WorkOrderArchive.created_at >= start, WorkOrderArchive.created_at < end))
+        summary.file = filename
+        # El archivo tiene el mes completo: sus totales reemplazan a los del índice
+        vehicle_totals = _vehicle_totals(orders)
+        _index_month(summary, vehicle_totals,
+                     [datetime.fromisoformat(p['created_at']) for order in orders for p in order['payments']
+                      if p['created_at']], replace=True)
+        summary.indexed = True
+        vehicles = Vehicle.query.filter(Vehicle.id.in_(vehicle_totals)).all() if vehicle_totals else []
+        db.session.commit()
+
+        tags = []
+        for vehicle in vehicles:
+            tags.extend(vehicle_cache_tags(vehicle))
+        if tags:
+            invalidate(*tags)
+        return exported
+
+    # --------------------------------------------------------------------------
+    # Lectura (historial y reportes)
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def get_vehicle_history(vehicle_id, directory, cursor=None, limit=20):
+        """
+        Historial completo de un vehículo: órdenes activas, archivadas y
+        exportadas, de la más reciente a la más antigua, paginado por cursor
+        sobre (created_at, id) como OrderService.get_vehicle_history.
+
+        Returns:
+            tuple(list[dict], str | None): Órdenes (con items y pagos) y cursor siguiente.
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        live, _ = OrderService.get_vehicle_history(vehicle_id, cursor=cursor, limit=limit + 1)
+        entries = []
+        for order in live:
+            order_dict = order.to_dict()
+            order_dict['payments'] = [p.to_dict() for p in order.payments]
+            entries.append(order_dict)
+
+        if db.session.query(ArchivedMonth.query.exists()).scalar():
+            before = tuple(decode_cursor(cursor, [WorkOrder.created_at, WorkOrder.id])) if cursor else None
+            criteria = [WorkOrderArchive.vehicle_id == vehicle_id]
+            if before:
+                criteria.append(tuple_(WorkOrderArchive.created_at, WorkOrderArchive.id) < tuple_(*before))
+            archived = _load_orders(*criteria, limit=limit + 1)
+
+            # Solo los archivos de los meses con órdenes del vehículo (o sin
+            # índice), del más reciente al más antiguo: cada archivo es un mes,
+            # así que al juntar limit + 1 órdenes se puede parar
+            months = ArchivedMonth.query.filter(
+                ArchivedMonth.file.isnot(None),
+                or_(~ArchivedMonth.indexed, ArchivedMonth.month.in_(
+                    select(ArchivedVehicleMonth.month).where(ArchivedVehicleMonth.vehicle_id == vehicle_id)))
+            )
+            if before:
+                months = months.filter(ArchivedMonth.month <= before[0].date())
+            seen = {order['id'] for order in archived}
+            found = []
+            for summary in months.order_by(ArchivedMonth.month.desc()):
+                if len(found) > limit:
+                    break
+                for order in _read_file(directory, summary.file):
+                    if order['vehicle_id'] == vehicle_id and order['id'] not in seen \
+                            and (before is None or _position(order) < before):
+                        found.append(order)
+            entries += archived + found
+
+        entries.sort(key=_position, reverse=True)
+        if len(entries) <= limit:
+            return entries, None
+        entries = entries[:limit]
+        return entries, encode_cursor(list(_position(entries[-1])))
+
+    @staticmethod
+    def get_archived_payments(directory, date_from=None, date_to=None, before=None, limit=None):
+        """
+        Pagos de órdenes archivadas y exportadas, del más reciente al más
+        antiguo. La tabla de archivo se filtra en SQL y solo se abren los
+        archivos de los meses cuyo rango de pagos (archived_months) se cruza
+        con el pedido.
+
+        Args:
+            directory (str): ARCHIVE_DIR.
+            date_from (datetime, optional): Pagos desde esta fecha (inclusive).
+            date_to (datetime, optional): Pagos antes de esta fecha (exclusive).
+            before (tuple, optional): (created_at, id) del cursor: pagos anteriores.
+            limit (int, optional): Máximo de pagos a devolver.
+
+        Returns:
+            list[dict]: Pagos con la forma de Payment.to_dict.
+        """
+        criteria = []
+        if date_from is not None:
+            criteria.append(PaymentArchive.created_at >= date_from)
+        if date_to is not None:
+            criteria.append(PaymentArchive.created_at < date_to)
+        if before is not None:
+            criteria.append(tuple_(PaymentArchive.created_at, PaymentArchive.id) < tuple_(*before))
+        query = PaymentArchive.query.filter(*criteria) \
+            .order_by(PaymentArchive.created_at.desc(), PaymentArchive.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        payments = [
+            {'id': p.id, 'work_order_id': p.work_order_id, 'amount': p.amount, 'payment_method': p.payment_method,
+             'status': p.status, 'created_at': p.created_at.isoformat() if p.created_at else None}
+            for p in query
+        ]
+
+        overlap = [ArchivedMonth.first_payment_at.isnot(None)]
+        if date_from is not None:
+            overlap.append(ArchivedMonth.last_payment_at >= date_from)
+        if date_to is not None:
+            overlap.append(ArchivedMonth.first_payment_at < date_to)
+        if before is not None:
+            overlap.append(ArchivedMonth.first_payment_at <= before[0])
+        # Los meses sin índice se leen siempre (primero); el resto, del pago
+        # más reciente al más antiguo
+        months = ArchivedMonth.query.filter(ArchivedMonth.file.isnot(None),
+                                            or_(~ArchivedMonth.indexed, and_(*overlap))) \
+            .order_by(ArchivedMonth.indexed, ArchivedMonth.last_payment_at.desc())
+
+        seen = {payment['id'] for payment in payments}
+        for summary in months:
+            if limit is not None and summary.indexed and len(payments) >= limit:
+                # Los meses siguientes terminan antes del último pago que entra
+                payments.sort(key=_position, reverse=True)
+                if _position(payments[limit - 1])[0] > summary.last_payment_at:
+                    break
+            for order in _read_file(directory, summary.file):
+                for payment in order['payments']:
+                    position = _position(payment)
+                    if payment['id'] in seen or (date_from is not None and position[0] < date_from) \
+                            or (date_to is not None and position[0] >= date_to) \
+                            or (before is not None and position >= before):
+                        continue
+                    seen.add(payment['id'])
+                    payments.append(payment)
+        payments.sort(key=_position, reverse=True)
+        return payments if limit is None else payments[:limit]
+
+    @staticmethod
+    def get_archived_totals():
+        """
+        Totales de los meses archivados desde archived_months (una fila por
+        mes, sin leer el archivo).
+
+        Returns:
+            dict: orders (órdenes archivadas, todas 'entregado') y revenue
+            ({método: monto pagado}).
+        """
+        orders, revenue = 0, {}
+        for summary in ArchivedMonth.query.all():
+            orders += summary.orders
+            for method, amount in json.loads(summary.revenue or '{}').items():
+                revenue[method] = revenue.get(method, 0) + amount
+        return {'orders': orders, 'revenue': revenue}
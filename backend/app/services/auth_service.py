@@ -1,9 +1,11 @@
 from app import db
 from app.models import User
+from app.utils.writes import commit_without_reload, raise_constraint_error
 # Client import is handled inside register_user to avoid circular dependency
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token
 from datetime import timedelta
+from sqlalchemy.exc import IntegrityError
 
 class AuthService:
     """
@@ -14,7 +16,8 @@ class AuthService:
     def register_user(username, email, password, role='recepcion'):
         """
         Registra un nuevo usuario en la base de datos.
-        Realiza validaciones de duplicidad (username/email) y hashea la contraseña.
+        Hashea la contraseña e inserta sin consultar antes: la duplicidad
+        (username/email) la detectan los índices UNIQUE.
 
         Args:
             username (str): Nombre de usuario.
@@ -28,13 +31,6 @@ class AuthService:
         Raises:
             ValueError: Si el usuario o email ya existen.
         """
-        # Verificar si el usuario o email ya existen en la BD
-        if User.query.filter_by(username=username).first():
-            raise ValueError("El nombre de usuario ya existe")
-        
-        if User.query.filter_by(email=email).first():
-            raise ValueError("El correo electrónico ya está registrado")
-
         # Hasheamos la contraseña por seguridad antes de guardarla
         hashed_password = generate_password_hash(password)
         
@@ -45,21 +41,29 @@ class AuthService:
             role=role
         )
 
-        db.session.add(new_user)
-        db.session.flush() # Para obtener el ID del usuario recién creado
-
-        # Si el rol es cliente, creamos su registro en la tabla Client
-        if role == 'client':
-            from app.models import Client
-            new_client = Client(
-                user_id=new_user.id,
-                first_name=username, # Default, luego pueden editar
-                last_name="",
-                email=email
-            )
-            db.session.add(new_client)
-
-        db.session.commit()
+        try:
+            db.session.add(new_user)
+            db.session.flush() # Para obtener el ID del usuario recién creado
+
+            # Si el rol es cliente, creamos su registro en la tabla Client
+            if role == 'client':
+                from app.models import Client
+                new_client = Client(
+                    user_id=new_user.id,
+                    first_name=username, # Default, luego pueden editar
+                    last_name="",
+                    email=email
+                )
+                db.session.add(new_client)
+
+            commit_without_reload()
+        except IntegrityError as error:
+            db.session.rollback()
+            raise_constraint_error(error, {
+                'users.username': "El nombre de usuario ya existe",
+                'users.email': "El correo electrónico ya está registrado",
+                'clients.email': "El correo electrónico ya está registrado",
+            })
         return new_user
 
     @staticmethod
@@ -1,6 +1,37 @@
+from datetime import datetime
+
 from app import db
-from app.models import Client, Vehicle
+from app.models import ArchivedVehicleMonth, Client, Vehicle, WorkOrder, OrderItem, Payment, tombstones_from
+from app.utils.cache import invalidate
+from app.utils.writes import commit_without_reload, flush_active_reference, raise_constraint_error
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
+
+# Estados en los que una orden sigue abierta en el taller
+OPEN_ORDER_STATUSES = ('pendiente', 'en_progreso')
+
+
+def _active_client(client_id):
+    return Client.query.filter_by(id=client_id, deleted_at=None).first()
+
+
+def _active_vehicle(vehicle_id):
+    return Vehicle.query.filter_by(id=vehicle_id, deleted_at=None).first()
+
+
+def _tombstone_vehicles(vehicle_ids):
+    """
+    Registra para /api/sync el borrado de los vehículos de la consulta
+    `vehicle_ids` y de sus órdenes, items y pagos, con un INSERT ... SELECT por
+    tabla (sin cargar filas en la sesión). Se llama antes del DELETE del padre:
+    la base de datos borra el resto en cascada (ON DELETE CASCADE).
+    """
+    order_ids = select(WorkOrder.id).where(WorkOrder.vehicle_id.in_(vehicle_ids))
+    db.session.execute(tombstones_from(Payment, select(Payment.id).where(Payment.work_order_id.in_(order_ids))))
+    db.session.execute(tombstones_from(OrderItem, select(OrderItem.id).where(OrderItem.work_order_id.in_(order_ids))))
+    db.session.execute(tombstones_from(WorkOrder, order_ids))
+    db.session.execute(tombstones_from(Vehicle, vehicle_ids))
 
 class ClientService:
     """
@@ -34,21 +65,21 @@ class ClientService:
         )
         try:
             db.session.add(new_client)
-            db.session.commit()
+            commit_without_reload()
             return new_client
         except IntegrityError:
             db.session.rollback()
             raise ValueError("El email ya está registrado para otro cliente")
 
     @staticmethod
-    def get_all_clients():
-        """Retorna todos los clientes registrados."""
-        return Client.query.all()
+    def get_all_clients(options=()):
+        """Retorna todos los clientes activos (con las opciones de carga indicadas)."""
+        return Client.query.filter(Client.deleted_at.is_(None)).options(*options).all()
         
     @staticmethod
     def get_client_by_id(client_id):
-        """Retorna un cliente por ID."""
-        return Client.query.get(client_id)
+        """Retorna un cliente activo por ID."""
+        return _active_client(client_id)
 
     @staticmethod
     def update_client(client_id, data):
@@ -65,7 +96,7 @@ class ClientService:
         Raises:
             ValueError: Si el cliente no existe o email duplicado.
         """
-        client = Client.query.get(client_id)
+        client = _active_client(client_id)
         if not client:
             raise ValueError("Cliente no encontrado")
 
@@ -81,25 +112,46 @@ class ClientService:
             client.address = data['address']
 
         try:
-            db.session.commit()
+            commit_without_reload()
+            # 'clients' cubre las vistas que muestran el nombre del dueño
+            invalidate(f'client:{client_id}', f'client-summary:{client_id}', 'clients')
             return client
         except IntegrityError:
             db.session.rollback()
             raise ValueError("El email ya está registrado para otro cliente")
 
     @staticmethod
-    def delete_client(client_id):
+    def delete_client(client_id, soft=False):
         """
-        Elimina un cliente y, por cascada, sus vehículos si la relación lo permite.
+        Elimina un cliente con sus vehículos, órdenes, items y pagos en una
+        transacción, con sentencias por conjunto (la cantidad de sentencias no
+        depende de cuántas órdenes tenga).
+
+        Args:
+            client_id (int): ID del cliente.
+            soft (bool): Borrado lógico: marca deleted_at en el cliente y sus
+                vehículos y conserva las órdenes.
 
         Raises:
             ValueError: Si el cliente no existe.
         """
-        client = Client.query.get(client_id)
+        client = _active_client(client_id)
         if not client:
             raise ValueError("Cliente no encontrado")
-        db.session.delete(client)
+
+        if soft:
+            now = datetime.utcnow()
+            client.deleted_at = now
+            db.session.execute(
+                update(Vehicle).where(Vehicle.client_id == client_id, Vehicle.deleted_at.is_(None))
+                .values(deleted_at=now).execution_options(synchronize_session=False)
+            )
+        else:
+            _tombstone_vehicles(select(Vehicle.id).where(Vehicle.client_id == client_id))
+            db.session.execute(tombstones_from(Client, select(Client.id).where(Client.id == client_id)))
+            db.session.execute(delete(Client.__table__).where(Client.__table__.c.id == client_id))
         db.session.commit()
+        invalidate(f'client:{client_id}', f'client-summary:{client_id}', 'clients', 'vehicles', 'orders')
 
     @staticmethod
     def add_vehicle(client_id, plate, brand, model, year, vin=None):
@@ -118,14 +170,10 @@ class ClientService:
             Vehicle: Vehículo creado.
 
         Raises:
-            ValueError: Si cliente no existe o placa/VIN duplicados.
+            ValueError: Si cliente no existe o placa/VIN duplicados (los
+                detecta el INSERT, sin consultas previas).
         """
-        client = Client.query.get(client_id)
-        if not client:
-            raise ValueError("Cliente no encontrado")
-
         new_vehicle = Vehicle(
-            client_id=client_id,
             plate=plate,
             brand=brand,
             model=model,
@@ -134,38 +182,40 @@ class ClientService:
         )
 
         try:
-            db.session.add(new_vehicle)
-            db.session.commit()
+            flush_active_reference(new_vehicle, 'client_id', Client, client_id)
+            commit_without_reload()
+            invalidate('vehicles', f'client-summary:{client_id}')
             return new_vehicle
-        except IntegrityError:
+        except IntegrityError as error:
             db.session.rollback()
-            raise ValueError("La placa o el VIN ya existen")
+            raise_constraint_error(error, {'vehicles.client_id': "Cliente no encontrado"},
+                                   default="La placa o el VIN ya existen")
 
     @staticmethod
     def get_client_vehicles(client_id):
         """
-        Obtiene los vehículos de un cliente específico.
+        Obtiene los vehículos activos de un cliente específico.
         
         Raises:
             ValueError: Si el cliente no existe.
         """
-        client = Client.query.get(client_id)
+        client = _active_client(client_id)
         if not client:
             raise ValueError("Cliente no encontrado")
-        return client.vehicles
+        return [vehicle for vehicle in client.vehicles if vehicle.deleted_at is None]
     
     @staticmethod
     def get_all_vehicles():
         """
-        Retorna todos los vehículos registrados en el sistema,
+        Retorna todos los vehículos activos del sistema,
         incluyendo la información de su dueño.
         """
-        return Vehicle.query.all()
+        return Vehicle.query.filter(Vehicle.deleted_at.is_(None)).all()
 
     @staticmethod
     def get_vehicle_by_id(vehicle_id):
-        """Retorna un vehículo por ID."""
-        return Vehicle.query.get(vehicle_id)
+        """Retorna un vehículo activo por ID."""
+        return _active_vehicle(vehicle_id)
 
     @staticmethod
     def update_vehicle(vehicle_id, data):
@@ -182,9 +232,10 @@ class ClientService:
         Raises:
             ValueError: Si el vehículo no existe o hay conflictos de unicidad.
         """
-        vehicle = Vehicle.query.get(vehicle_id)
+        vehicle = _active_vehicle(vehicle_id)
         if not vehicle:
             raise ValueError("Vehículo no encontrado")
+        previous_client_id = vehicle.client_id
 
         # Actualizar campos permitidos
         if 'plate' in data:
@@ -197,36 +248,111 @@ class ClientService:
             vehicle.year = data['year']
         if 'vin' in data:
             vehicle.vin = data['vin']
-        # Nota: Permitir cambiar el cliente (client_id) podría ser útil, 
-        # pero requiere validación extra. Lo incluiremos si se solicita.
-        if 'client_id' in data:
-            # Validar que el cliente exista
-            client = Client.query.get(data['client_id'])
-            if not client:
-                raise ValueError("El cliente asignado no existe")
-            vehicle.client_id = data['client_id']
 
         try:
-            db.session.commit()
+            if 'client_id' in data:
+                # El UPDATE valida que el nuevo dueño exista (sin consultarlo antes)
+                flush_active_reference(vehicle, 'client_id', Client, data['client_id'])
+            commit_without_reload()
+            invalidate(f'vehicle:{vehicle_id}', 'vehicles',
+                       f'client-summary:{previous_client_id}', f'client-summary:{vehicle.client_id}')
             return vehicle
-        except IntegrityError:
+        except IntegrityError as error:
             db.session.rollback()
-            raise ValueError("La placa o el VIN ya existen en otro vehículo")
+            raise_constraint_error(error, {'vehicles.client_id': "El cliente asignado no existe"},
+                                   default="La placa o el VIN ya existen en otro vehículo")
 
     @staticmethod
-    def delete_vehicle(vehicle_id):
+    def delete_vehicle(vehicle_id, soft=False):
         """
-        Elimina un vehículo del sistema.
+        Elimina un vehículo con sus órdenes, items y pagos (un DELETE en cascada).
 
         Args:
             vehicle_id (int): ID del vehículo.
+            soft (bool): Borrado lógico: marca deleted_at y conserva las órdenes.
 
         Raises:
             ValueError: Si el vehículo no existe.
         """
-        vehicle = Vehicle.query.get(vehicle_id)
+        vehicle = _active_vehicle(vehicle_id)
         if not vehicle:
             raise ValueError("Vehículo no encontrado")
 
-        db.session.delete(vehicle)
+        client_id = vehicle.client_id
+        if soft:
+            vehicle.deleted_at = datetime.utcnow()
+        else:
+            _tombstone_vehicles(select(Vehicle.id).where(Vehicle.id == vehicle_id))
+            db.session.execute(delete(Vehicle.__table__).where(Vehicle.__table__.c.id == vehicle_id))
         db.session.commit()
+        invalidate(f'vehicle:{vehicle_id}', 'vehicles', f'client-summary:{client_id}', 'orders',
+                   f'vehicle-history:{vehicle_id}')
+
+    @staticmethod
+    def get_client_summary(client_id):
+        """
+        Vista 360 del cliente para recepción, en un número fijo de consultas
+        (cliente, vehículos, órdenes abiertas + items y totales agregados de
+        las órdenes activas y archivadas), sin importar cuántos vehículos u
+        órdenes tenga.
+
+        Args:
+            client_id (int): ID del cliente.
+
+        Returns:
+            dict | None: client, vehicles, open_orders, total_billed, total_paid,
+            outstanding_balance, order_count y last_visit. None si no existe.
+        """
+        client = _active_client(client_id)
+        if not client:
+            return None
+
+        vehicles = Vehicle.query.filter_by(client_id=client_id, deleted_at=None).order_by(Vehicle.id).all()
+        plates = {v.id: v.plate for v in vehicles}
+
+        open_orders = WorkOrder.query\
+            .join(Vehicle, WorkOrder.vehicle_id == Vehicle.id)\
+            .filter(Vehicle.client_id == client_id, WorkOrder.status.in_(OPEN_ORDER_STATUSES))\
+            .options(selectinload(WorkOrder.items).joinedload(OrderItem.service))\
+            .order_by(WorkOrder.created_at.desc())\
+            .all()
+
+        order_count, total_billed, total_paid, outstanding, last_visit = db.session.query(
+            func.count(WorkOrder.id),
+            func.coalesce(func.sum(WorkOrder.total), 0.0),
+            func.coalesce(func.sum(WorkOrder.amount_paid), 0.0),
+            func.coalesce(func.sum(WorkOrder.balance), 0.0),
+            func.max(WorkOrder.created_at)
+        ).join(Vehicle, WorkOrder.vehicle_id == Vehicle.id)\
+            .filter(Vehicle.client_id == client_id).one()
+        # Órdenes archivadas y exportadas: totales por vehículo y mes
+        archived = db.session.query(
+            func.coalesce(func.sum(ArchivedVehicleMonth.orders), 0),
+            func.coalesce(func.sum(ArchivedVehicleMonth.total), 0.0),
+            func.coalesce(func.sum(ArchivedVehicleMonth.amount_paid), 0.0),
+            func.coalesce(func.sum(ArchivedVehicleMonth.balance), 0.0),
+            func.max(ArchivedVehicleMonth.last_order_at)
+        ).join(Vehicle, ArchivedVehicleMonth.vehicle_id == Vehicle.id)\
+            .filter(Vehicle.client_id == client_id).one()
+        order_count += archived[0]
+        total_billed += archived[1]
+        total_paid += archived[2]
+        outstanding += archived[3]
+        last_visit = max(filter(None, (last_visit, archived[4])), default=None)
+
+        orders = []
+        for order in open_orders:
+            order_dict = order.to_dict()
+            order_dict['vehicle_plate'] = plates.get(order.vehicle_id)
+            orders.append(order_dict)
+
+        return {
+            "client": client.to_dict(),
+            "vehicles": [v.to_dict() for v in vehicles],
+            "open_orders": orders,
+            "order_count": order_count,
+            "total_billed": total_billed,
+            "total_paid": total_paid,
+            "outstanding_balance": outstanding,
+            "last_visit": last_visit.isoformat() if last_visit else None
+        }
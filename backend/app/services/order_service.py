@@ -1,5 +1,65 @@
 from app import db
-from app.models import Service, WorkOrder, OrderItem, Vehicle
+from app.models import ArchivedVehicleMonth, Client, Service, WorkOrder, OrderItem, Vehicle
+from app.utils.cache import invalidate
+from app.utils.events import notify_order_events, record_order_event
+from app.utils.pagination import paginate
+from app.utils.writes import commit_without_reload
+from sqlalchemy import func, select, union_all, update
+from sqlalchemy.orm import joinedload, selectinload
+
+# Estados válidos de una orden de trabajo
+ORDER_STATUSES = ('pendiente', 'en_progreso', 'finalizado', 'entregado')
+
+
+def vehicle_cache_tags(vehicle):
+    """Etiquetas de caché que dependen de las órdenes y pagos de un vehículo."""
+    return (f'vehicle-history:{vehicle.id}', f'client-summary:{vehicle.client_id}')
+
+
+# ==============================================================================
+# Consultas del tablero (ver OrderService.get_board)
+# ==============================================================================
+_BOARD_COLUMNS = (WorkOrder.id, WorkOrder.status, WorkOrder.vehicle_id, WorkOrder.total, WorkOrder.created_at)
+_BOARD_ORDER = (WorkOrder.created_at.desc(), WorkOrder.id.desc())
+
+
+def _supports_window_functions():
+    dialect = db.engine.dialect
+    return dialect.name != 'sqlite' or dialect.dbapi.sqlite_version_info >= (3, 25)
+
+
+def _with_owner(ranked):
+    """Agrega placa y nombre del cliente a las filas ya recortadas del tablero."""
+    return (
+        select(ranked, Vehicle.plate, Client.first_name, Client.last_name)
+        .outerjoin(Vehicle, Vehicle.id == ranked.c.vehicle_id)
+        .outerjoin(Client, Client.id == Vehicle.client_id)
+    )
+
+
+def _board_rows_window(per_status):
+    ranked = select(
+        *_BOARD_COLUMNS,
+        func.row_number().over(partition_by=WorkOrder.status, order_by=_BOARD_ORDER).label('position'),
+        func.count().over(partition_by=WorkOrder.status).label('status_count'),
+    ).where(WorkOrder.status.in_(ORDER_STATUSES)).subquery()
+    query = _with_owner(ranked).where(ranked.c.position <= per_status) \
+        .order_by(ranked.c.status, ranked.c.position)
+    return db.session.execute(query).all()
+
+
+def _board_rows_fallback(per_status):
+    # Cada parte usa el índice (status, created_at); SQLite exige envolver
+    # ORDER BY/LIMIT en una subconsulta dentro de una unión
+    parts = [
+        select(select(*_BOARD_COLUMNS).where(WorkOrder.status == status)
+               .order_by(*_BOARD_ORDER).limit(per_status).subquery())
+        for status in ORDER_STATUSES
+    ]
+    ranked = union_all(*parts).subquery()
+    query = _with_owner(ranked).order_by(ranked.c.status, ranked.c.created_at.desc(), ranked.c.id.desc())
+    return db.session.execute(query).all()
+
 
 class OrderService:
     """
@@ -29,7 +89,8 @@ class OrderService:
             base_price=base_price
         )
         db.session.add(new_service)
-        db.session.commit() # Confirmar transacción
+        commit_without_reload() # Confirmar transacción (el id vuelve en el INSERT)
+        invalidate('services')
         return new_service
 
     @staticmethod
@@ -83,7 +144,8 @@ class OrderService:
         if description is not None:
             service.description = description
 
-        db.session.commit()
+        commit_without_reload()
+        invalidate('services')
         return service
 
     @staticmethod
@@ -99,6 +161,7 @@ class OrderService:
             raise ValueError("Servicio no encontrado")
         db.session.delete(service)
         db.session.commit()
+        invalidate('services')
 
     @staticmethod
     def create_order(vehicle_id, user_id):
@@ -115,9 +178,10 @@ class OrderService:
         Raises:
             ValueError: Si el vehículo no existe.
         """
-        # 1. Validar existencia del vehículo antes de crear la orden
+        # 1. Validar existencia del vehículo antes de crear la orden (la
+        #    lectura hace falta igual: su client_id define qué caché invalidar)
         vehicle = Vehicle.query.get(vehicle_id)
-        if not vehicle:
+        if not vehicle or vehicle.deleted_at is not None:
             raise ValueError("Vehículo no encontrado")
 
         # 2. Inicializar la orden con total en 0.0
@@ -125,10 +189,17 @@ class OrderService:
             vehicle_id=vehicle_id,
             user_id=user_id,
             status='pendiente',
-            total=0.0
+            total=0.0,
+            amount_paid=0.0,
+            balance=0.0,
+            items=[]  # orden nueva: sin items (to_dict no los consulta)
         )
         db.session.add(new_order)
-        db.session.commit()
+        db.session.flush()  # asigna el id para el evento
+        record_order_event(new_order, 'order_created', vehicle_id=vehicle_id, status=new_order.status)
+        commit_without_reload()
+        invalidate('orders', *vehicle_cache_tags(vehicle))
+        notify_order_events()
         return new_order
 
     @staticmethod
@@ -146,8 +217,8 @@ class OrderService:
         Raises:
             ValueError: Si la orden o el servicio no existen.
         """
-        # 1. Buscar la orden
-        order = WorkOrder.query.get(order_id)
+        # 1. Buscar la orden (con su vehículo, que define qué caché invalidar)
+        order = WorkOrder.query.options(joinedload(WorkOrder.vehicle)).get(order_id)
         if not order:
             raise ValueError("Orden no encontrada")
 
@@ -159,16 +230,27 @@ class OrderService:
         # 3. Crear el item congelando el precio al momento de la venta
         new_item = OrderItem(
             work_order_id=order_id,
-            service_id=service.id,
+            service=service,
             price_at_moment=service.base_price
         )
 
         db.session.add(new_item)
         
-        # 4. Actualizar el total de la orden sumando el precio del servicio
-        order.total += service.base_price
+        # 4. Actualizar total y saldo con una expresión SQL (total = total + precio):
+        #    es atómico aunque otra petición modifique la orden al mismo tiempo, y
+        #    synchronize_session='fetch' deja en `order` el total resultante (con
+        #    RETURNING si la base lo soporta; si no, con un SELECT)
+        db.session.execute(
+            update(WorkOrder).where(WorkOrder.id == order_id)
+            .values(total=WorkOrder.total + service.base_price, balance=WorkOrder.balance + service.base_price)
+            .execution_options(synchronize_session='fetch')
+        )
+        record_order_event(order, 'order_item_added', item_id=new_item.id, service_id=service.id,
+                           service_name=service.name, price=new_item.price_at_moment, total=order.total)
         
-        db.session.commit() # Confirmar ambas operaciones (item + update orden) atómicamente
+        commit_without_reload() # Confirmar item + update orden + evento atómicamente
+        invalidate('orders', *vehicle_cache_tags(order.vehicle))
+        notify_order_events()
         return new_item, order.total
 
     @staticmethod
@@ -185,16 +267,115 @@ class OrderService:
         return WorkOrder.query.get(order_id)
 
     @staticmethod
-    def get_all_orders():
+    def get_all_orders(options=()):
         """
         Obtiene todas las órdenes registradas, ordenadas por fecha de creación descendente.
+
+        Args:
+            options (list, optional): Opciones de carga (columnas y relaciones a leer).
         
         Returns:
             list[WorkOrder]: Lista de todas las órdenes.
         """
-        return WorkOrder.query.order_by(WorkOrder.created_at.desc()).all()
+        return WorkOrder.query.options(*options).order_by(WorkOrder.created_at.desc()).all()
 
 
+    @staticmethod
+    def search_orders(status=None, date_from=None, date_to=None, user_id=None, vehicle_id=None,
+                      plate=None, client_id=None, cursor=None, limit=20, options=()):
+        """
+        Busca órdenes con filtros, de la más reciente a la más antigua, paginando
+        por cursor sobre (created_at, id). Cada filtro principal tiene su índice
+        compuesto con created_at: (status, created_at), (user_id, created_at) y
+        (vehicle_id, created_at).
+
+        Args:
+            status (str, optional): Estado de la orden.
+            date_from (datetime, optional): Creadas desde esta fecha (inclusive).
+            date_to (datetime, optional): Creadas antes de esta fecha (exclusive).
+            user_id (int, optional): Mecánico/usuario que abrió la orden.
+            vehicle_id (int, optional): Vehículo.
+            plate (str, optional): Placa exacta del vehículo.
+            client_id (int, optional): Dueño del vehículo.
+            cursor (str, optional): Cursor devuelto por la página anterior.
+            limit (int): Órdenes por página.
+            options (list, optional): Opciones de carga (columnas y relaciones a leer).
+
+        Returns:
+            tuple(list[WorkOrder], str | None): Órdenes y cursor de la página siguiente.
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        query = WorkOrder.query.options(*options)
+        if plate:
+            # La placa es única entre los vehículos activos: se resuelve a un
+            # vehicle_id para usar su índice (el activo antes que uno borrado)
+            vehicle = Vehicle.query.filter_by(plate=plate).with_entities(Vehicle.id)\
+                .order_by(Vehicle.deleted_at.is_not(None), Vehicle.id.desc()).first()
+            if vehicle is None:
+                return [], None
+            query = query.filter(WorkOrder.vehicle_id == vehicle.id)
+        if vehicle_id is not None:
+            query = query.filter(WorkOrder.vehicle_id == vehicle_id)
+        if client_id is not None:
+            query = query.filter(WorkOrder.vehicle_id.in_(
+                db.session.query(Vehicle.id).filter(Vehicle.client_id == client_id)
+            ))
+        if status:
+            query = query.filter(WorkOrder.status == status)
+        if user_id is not None:
+            query = query.filter(WorkOrder.user_id == user_id)
+        if date_from is not None:
+            query = query.filter(WorkOrder.created_at >= date_from)
+        if date_to is not None:
+            query = query.filter(WorkOrder.created_at < date_to)
+        return paginate(query, [WorkOrder.created_at, WorkOrder.id], cursor, limit)
+
+    @staticmethod
+    def get_board(per_status=10):
+        """
+        Tablero del taller: cantidad de órdenes por estado y las `per_status`
+        más recientes de cada uno, con la placa y el nombre del cliente.
+
+        Con funciones de ventana (PostgreSQL, SQLite >= 3.25) es una sola
+        consulta: row_number() y count() particionados por estado. Sin ellas,
+        un conteo agrupado y una unión de consultas LIMIT por estado.
+
+        Args:
+            per_status (int): Órdenes por columna del tablero.
+
+        Returns:
+            list[dict]: Una columna por estado (en el orden de ORDER_STATUSES,
+            también las vacías): status, count y orders.
+        """
+        if _supports_window_functions():
+            rows = _board_rows_window(per_status)
+            counts = {row.status: row.status_count for row in rows}
+        else:
+            rows = _board_rows_fallback(per_status)
+            counts = dict(
+                db.session.query(WorkOrder.status, func.count(WorkOrder.id))
+                .filter(WorkOrder.status.in_(ORDER_STATUSES))
+                .group_by(WorkOrder.status)
+                .all()
+            )
+
+        columns = {status: [] for status in ORDER_STATUSES}
+        for row in rows:
+            columns[row.status].append({
+                "id": row.id,
+                "vehicle_id": row.vehicle_id,
+                "total": row.total,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "vehicle_plate": row.plate,
+                "client_name": f"{row.first_name} {row.last_name}" if row.first_name else None,
+            })
+        return [
+            {"status": status, "count": counts.get(status, 0), "orders": columns[status]}
+            for status in ORDER_STATUSES
+        ]
+
     @staticmethod
     def update_order_status(order_id, new_status):
         """
@@ -210,14 +391,89 @@ class OrderService:
         Raises:
             ValueError: Si el estado no es válido o la orden no existe.
         """
-        valid_statuses = ['pendiente', 'en_progreso', 'finalizado', 'entregado']
-        if new_status not in valid_statuses:
-            raise ValueError(f"Estado inválido. Permitidos: {', '.join(valid_statuses)}")
+        if new_status not in ORDER_STATUSES:
+            raise ValueError(f"Estado inválido. Permitidos: {', '.join(ORDER_STATUSES)}")
 
         order = WorkOrder.query.get(order_id)
         if not order:
             raise ValueError("Orden no encontrada")
 
+        previous_status = order.status
         order.status = new_status
+        record_order_event(order, 'order_status_changed', status=new_status, previous_status=previous_status)
         db.session.commit()
+        invalidate('orders', *vehicle_cache_tags(order.vehicle))
+        notify_order_events()
         return order
+
+    @staticmethod
+    def get_vehicle_history(vehicle_id, cursor=None, limit=20):
+        """
+        Obtiene una página del historial de órdenes de un vehículo, de la más
+        reciente a la más antigua, con items, servicios y pagos precargados
+        (una consulta para la página y una por cada relación).
+
+        Args:
+            vehicle_id (int): ID del vehículo.
+            cursor (str, optional): Cursor devuelto por la página anterior.
+            limit (int): Órdenes por página.
+
+        Returns:
+            tuple(list[WorkOrder], str | None): Órdenes y cursor de la página siguiente.
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        query = WorkOrder.query.filter(WorkOrder.vehicle_id == vehicle_id).options(
+            selectinload(WorkOrder.items).joinedload(OrderItem.service),
+            selectinload(WorkOrder.payments),
+        )
+        return paginate(query, [WorkOrder.created_at, WorkOrder.id], cursor, limit)
+
+    @staticmethod
+    def get_vehicle_summary(vehicle_id):
+        """
+        Resume el historial de un vehículo con consultas agregadas. Los
+        totales incluyen las órdenes archivadas y exportadas (sumadas por mes
+        en archived_vehicle_months); el servicio más frecuente sale de las
+        órdenes activas.
+
+        Returns:
+            dict: total_orders, lifetime_spend (suma de totales), total_paid
+            (pagos 'pagado'), last_visit y most_frequent_service.
+        """
+        total_orders, lifetime_spend, total_paid, last_visit = db.session.query(
+            func.count(WorkOrder.id),
+            func.coalesce(func.sum(WorkOrder.total), 0.0),
+            func.coalesce(func.sum(WorkOrder.amount_paid), 0.0),
+            func.max(WorkOrder.created_at)
+        ).filter(WorkOrder.vehicle_id == vehicle_id).one()
+        archived = db.session.query(
+            func.coalesce(func.sum(ArchivedVehicleMonth.orders), 0),
+            func.coalesce(func.sum(ArchivedVehicleMonth.total), 0.0),
+            func.coalesce(func.sum(ArchivedVehicleMonth.amount_paid), 0.0),
+            func.max(ArchivedVehicleMonth.last_order_at)
+        ).filter(ArchivedVehicleMonth.vehicle_id == vehicle_id).one()
+        total_orders += archived[0]
+        lifetime_spend += archived[1]
+        total_paid += archived[2]
+        last_visit = max(filter(None, (last_visit, archived[3])), default=None)
+
+        times = func.count(OrderItem.id)
+        top_service = db.session.query(Service.id, Service.name, times)\
+            .join(OrderItem, OrderItem.service_id == Service.id)\
+            .join(WorkOrder, OrderItem.work_order_id == WorkOrder.id)\
+            .filter(WorkOrder.vehicle_id == vehicle_id)\
+            .group_by(Service.id, Service.name)\
+            .order_by(times.desc(), Service.id)\
+            .first()
+
+        return {
+            "total_orders": total_orders,
+            "lifetime_spend": lifetime_spend,
+            "total_paid": total_paid,
+            "last_visit": last_visit.isoformat() if last_visit else None,
+            "most_frequent_service": {
+                "service_id": top_service[0], "name": top_service[1], "times": top_service[2]
+            } if top_service else None
+        }
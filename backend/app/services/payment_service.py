@@ -0,0 +1,156 @@
+from app import db
+from app.models import Payment, WorkOrder
+from app.services.order_service import vehicle_cache_tags
+from app.utils.cache import invalidate
+from app.utils.pagination import paginate
+from sqlalchemy import func, update
+
+# Estado de pago que cuenta para amount_paid/balance
+PAID_STATUS = 'pagado'
+# Diferencia máxima (redondeo de floats) que no se considera descuadre
+TOLERANCE = 0.01
+# Descuadres que se devuelven como muestra en el reporte de conciliación
+MAX_DRIFT_SAMPLES = 100
+
+
+class PaymentService:
+    """
+    Servicio de Pagos y Cuentas por Cobrar.
+
+    Mantiene WorkOrder.amount_paid y WorkOrder.balance en la misma transacción
+    que registra el pago, de modo que las órdenes con deuda se consultan con un
+    índice parcial (balance > 0) en lugar de sumar pagos en Python.
+    """
+
+    @staticmethod
+    def register_payment(work_order, amount, payment_method, status=PAID_STATUS):
+        """
+        Registra un pago y, si está pagado, actualiza el saldo de la orden.
+
+        Args:
+            work_order (WorkOrder): Orden a la que se aplica el pago.
+            amount (float): Monto (mayor a 0).
+            payment_method (str): efectivo, tarjeta, transferencia...
+            status (str): 'pagado' (por defecto) o 'pendiente'.
+
+        Returns:
+            Payment: Pago creado.
+
+        Raises:
+            ValueError: Si el monto no es positivo.
+        """
+        if amount <= 0:
+            raise ValueError("El monto debe ser mayor a 0")
+
+        payment = Payment(
+            work_order_id=work_order.id,
+            amount=amount,
+            payment_method=payment_method,
+            status=status
+        )
+        db.session.add(payment)
+
+        if status == PAID_STATUS:
+            # UPDATE ... SET amount_paid = amount_paid + :monto: atómico frente a pagos concurrentes
+            db.session.execute(
+                update(WorkOrder)
+                .where(WorkOrder.id == work_order.id)
+                .values(amount_paid=WorkOrder.amount_paid + amount, balance=WorkOrder.balance - amount)
+            )
+
+        db.session.commit()
+        invalidate(*vehicle_cache_tags(work_order.vehicle))
+        return payment
+
+    @staticmethod
+    def get_outstanding_orders(cursor=None, limit=20):
+        """
+        Órdenes con saldo pendiente, de la más antigua a la más reciente.
+        Recorre solo el índice parcial ix_work_orders_outstanding.
+
+        Returns:
+            tuple(list[WorkOrder], str | None): Órdenes y cursor de la página siguiente.
+
+        Raises:
+            ValueError: Si el cursor no es válido.
+        """
+        query = WorkOrder.query.filter(WorkOrder.balance > 0)
+        return paginate(query, [WorkOrder.created_at, WorkOrder.id], cursor, limit, descending=False)
+
+    @staticmethod
+    def get_outstanding_totals():
+        """
+        Returns:
+            dict: Cantidad de órdenes con deuda y saldo total por cobrar.
+        """
+        count, total = db.session.query(
+            func.count(WorkOrder.id), func.coalesce(func.sum(WorkOrder.balance), 0.0)
+        ).filter(WorkOrder.balance > 0).one()
+        return {"orders": count, "total_outstanding": total}
+
+    @staticmethod
+    def reconcile(repair=False, batch_size=1000):
+        """
+        Verifica amount_paid/balance de todas las órdenes contra los pagos
+        registrados, por lotes de `batch_size` órdenes (una consulta agrupada
+        de pagos por lote).
+
+        Con `repair=True` corrige los descuadres. La corrección solo se aplica
+        si la orden no cambió desde que se leyó (si entró un pago en el medio,
+        queda para la próxima ejecución).
+
+        Returns:
+            dict: checked (órdenes revisadas), drifted (con descuadre),
+            repaired (corregidas) y samples (primeros descuadres).
+        """
+        report = {"checked": 0, "drifted": 0, "repaired": 0, "samples": []}
+        last_id = 0
+
+        while True:
+            orders = db.session.query(
+                WorkOrder.id, WorkOrder.total, WorkOrder.amount_paid, WorkOrder.balance
+            ).filter(WorkOrder.id > last_id).order_by(WorkOrder.id).limit(batch_size).all()
+            if not orders:
+                break
+
+            ids = [order.id for order in orders]
+            paid_by_order = dict(
+                db.session.query(Payment.work_order_id, func.sum(Payment.amount))
+                .filter(Payment.work_order_id.in_(ids), Payment.status == PAID_STATUS)
+                .group_by(Payment.work_order_id)
+                .all()
+            )
+
+            for order in orders:
+                expected_paid = round(paid_by_order.get(order.id) or 0.0, 2)
+                expected_balance = round((order.total or 0.0) - expected_paid, 2)
+                if abs(order.amount_paid - expected_paid) <= TOLERANCE \
+                        and abs(order.balance - expected_balance) <= TOLERANCE:
+                    continue
+
+                report["drifted"] += 1
+                if len(report["samples"]) < MAX_DRIFT_SAMPLES:
+                    report["samples"].append({
+                        "work_order_id": order.id,
+                        "amount_paid": order.amount_paid, "expected_amount_paid": expected_paid,
+                        "balance": order.balance, "expected_balance": expected_balance,
+                    })
+                if repair:
+                    result = db.session.execute(
+                        update(WorkOrder)
+                        .where(WorkOrder.id == order.id,
+                               WorkOrder.amount_paid == order.amount_paid,
+                               WorkOrder.balance == order.balance)
+                        .values(amount_paid=expected_paid, balance=expected_balance)
+                        .execution_options(synchronize_session=False)
+                    )
+                    report["repaired"] += result.rowcount
+
+            if repair:
+                db.session.commit()
+            else:
+                db.session.rollback()  # solo lectura: libera la transacción del lote
+            report["checked"] += len(orders)
+            last_id = ids[-1]
+
+        return report
@@ -1,5 +1,6 @@
 from app import db
 from app.models import WorkOrder, OrderItem
+from app.services.archive_service import ARCHIVABLE_STATUS, ArchiveService
 from sqlalchemy import func, extract
 from datetime import datetime
 
@@ -48,6 +49,11 @@ class ReportService:
         # Transformamos la lista de tuplas [('pendiente', 5), ...] a diccionario {'pendiente': 5, ...}
         orders_by_status = {status: count for status, count in orders_by_status_query}
 
+        # Las órdenes archivadas (todas entregadas) se cuentan desde archived_months
+        archived_orders = ArchiveService.get_archived_totals()['orders']
+        if archived_orders:
+            orders_by_status[ARCHIVABLE_STATUS] = orders_by_status.get(ARCHIVABLE_STATUS, 0) + archived_orders
+
         return {
             "total_orders_month": total_orders_month,
             "estimated_income": estimated_income,
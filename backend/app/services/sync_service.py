@@ -0,0 +1,149 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import SYNC_MODELS, SyncTombstone
+from sqlalchemy import select, tuple_
+
+# Entidades sincronizables: nombre (tabla) -> modelo
+ENTITIES = {model.__tablename__: model for model in SYNC_MODELS}
+# Posición inicial de una entidad sin cursor: (fecha, id) anterior a cualquier fila
+_START = (datetime.min, 0)
+
+
+def _encode_positions(positions):
+    payload = {
+        entity: [ts.isoformat(), row_id, deleted_ts.isoformat(), deleted_id]
+        for entity, ((ts, row_id), (deleted_ts, deleted_id)) in positions.items()
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_positions(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {
+            entity: ((datetime.fromisoformat(ts), int(row_id)), (datetime.fromisoformat(deleted_ts), int(deleted_id)))
+            for entity, (ts, row_id, deleted_ts, deleted_id) in payload.items()
+            if entity in ENTITIES
+        }
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Parámetro since inválido")
+
+
+def parse_since(value):
+    """
+    Interpreta `since`: una fecha ISO (primera sincronización desde esa fecha)
+    o el token `next_since` de la respuesta anterior. Sin valor, sincroniza todo.
+
+    Returns:
+        dict: entidad -> ((updated_at, id), (deleted_at, id)) de la última fila entregada.
+
+    Raises:
+        ValueError: Si el valor no es una fecha ni un token válido.
+    """
+    if not value:
+        return {}
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        return _decode_positions(value)
+    if since.tzinfo is not None:
+        since = since.replace(tzinfo=None) - (since.utcoffset() or timedelta(0))
+    return {entity: ((since, 0), (since, 0)) for entity in ENTITIES}
+
+
+def _serialize(row):
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+
+
+class SyncService:
+    """
+    Servicio de Sincronización Incremental.
+
+    Cada entidad se recorre por (updated_at, id) y sus borrados por
+    (deleted_at, id), en orden ascendente. El token `next_since` guarda la
+    última posición entregada de cada entidad, así la siguiente llamada solo
+    devuelve lo que cambió después (sin huecos ni repeticiones, aunque muchas
+    filas compartan el mismo updated_at).
+    """
+
+    @staticmethod
+    def get_changes(since=None, entities=None, limit=500, settle_seconds=2.0):
+        """
+        Filas modificadas y eliminadas desde `since`.
+
+        Solo se entregan cambios con más de `settle_seconds` de antigüedad:
+        updated_at se asigna al hacer flush y una transacción en curso podría
+        confirmar después una fila con fecha anterior a la posición entregada.
+
+        Args:
+            since (str, optional): Fecha ISO o token next_since anterior.
+            entities (list[str], optional): Entidades a sincronizar (todas por defecto).
+            limit (int): Máximo de filas (y de borrados) por entidad.
+            settle_seconds (float): Margen para transacciones en curso.
+
+        Returns:
+            dict: changes ({entidad: {updated, deleted}}, solo las que cambiaron),
+            next_since (token para la próxima llamada), has_more (quedan cambios:
+            llamar de nuevo de inmediato) y server_time.
+
+        Raises:
+            ValueError: Si `since` o alguna entidad no son válidos.
+        """
+        names = list(entities) if entities else list(ENTITIES)
+        unknown = [name for name in names if name not in ENTITIES]
+        if unknown:
+            raise ValueError(f"Entidades desconocidas: {', '.join(unknown)}. Permitidas: {', '.join(ENTITIES)}")
+
+        positions = parse_since(since)
+        now = datetime.utcnow()
+        until = now - timedelta(seconds=settle_seconds)
+        tombstones = SyncTombstone.__table__
+        changes, next_positions, has_more = {}, dict(positions), False
+
+        for name in names:
+            table = ENTITIES[name].__table__
+            updated_pos, deleted_pos = positions.get(name, (_START, _START))
+
+            rows = db.session.execute(
+                select(table)
+                .where(tuple_(table.c.updated_at, table.c.id) > tuple_(*updated_pos), table.c.updated_at <= until)
+                .order_by(table.c.updated_at, table.c.id)
+                .limit(limit + 1)
+            ).mappings().all()
+            deleted = db.session.execute(
+                select(tombstones.c.id, tombstones.c.entity_id, tombstones.c.deleted_at)
+                .where(tombstones.c.entity == name,
+                       tuple_(tombstones.c.deleted_at, tombstones.c.id) > tuple_(*deleted_pos),
+                       tombstones.c.deleted_at <= until)
+                .order_by(tombstones.c.deleted_at, tombstones.c.id)
+                .limit(limit + 1)
+            ).all()
+
+            has_more = has_more or len(rows) > limit or len(deleted) > limit
+            rows, deleted = rows[:limit], deleted[:limit]
+            if rows:
+                updated_pos = (rows[-1]['updated_at'], rows[-1]['id'])
+            if deleted:
+                deleted_pos = (deleted[-1].deleted_at, deleted[-1].id)
+            next_positions[name] = (updated_pos, deleted_pos)
+
+            if rows or deleted:
+                # Un id reutilizado (SQLite) puede volver a crearse tras el borrado
+                recreated = {row['id']: row['updated_at'] for row in rows}
+                changes[name] = {
+                    "updated": [_serialize(row) for row in rows],
+                    "deleted": [t.entity_id for t in deleted
+                                if t.entity_id not in recreated or recreated[t.entity_id] < t.deleted_at],
+                }
+
+        return {
+            "changes": changes,
+            "next_since": _encode_positions(next_positions),
+            "has_more": has_more,
+            "server_time": now.isoformat(),
+        }
@@ -0,0 +1,333 @@
+import functools
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import current_app, request, has_app_context, Response
+
+from app.utils.replica import primary_reads
+
+# ==============================================================================
+# Utilidades - Caché
+# ==============================================================================
+# Caché de lecturas calientes con dos backends intercambiables:
+# 1. 'memory': LRU + TTL dentro del proceso (por defecto, sin dependencias).
+# 2. 'redis': compartido entre workers (requiere el paquete `redis`).
+#
+# Invalidación por etiquetas: cada entrada se guarda bajo una clave que incluye
+# la versión actual de sus etiquetas ('services', 'client:7', ...). Invalidar
+# una etiqueta incrementa su versión, y las entradas viejas dejan de
+# encontrarse (expiran solas por TTL/LRU).
+#
+# Single-flight: ante un miss, solo un hilo calcula el valor; el resto espera
+# y reutiliza el resultado (con redis, también entre procesos).
+#
+# Los valores se calculan leyendo del primario: una réplica atrasada guardaría
+# datos viejos bajo la versión recién invalidada durante todo el TTL.
+# ==============================================================================
+
+LOCK_TTL = 10
+LOCK_POLL = 0.05
+
+
+class MemoryBackend:
+    """LRU + TTL en memoria del proceso."""
+
+    shared = False
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # clave -> (expira, valor)
+        self._versions = {}  # las versiones de etiquetas no se desalojan
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def add(self, key, value, ttl=None):
+        """Guarda la clave solo si no existe (o expiró). Retorna True si la guardó."""
+        if self.get(key)[0]:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def get_versions(self, tags):
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump_version(self, tag):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._versions.clear()
+
+
+class RedisBackend:
+    """Backend compartido sobre Redis (dependencia opcional)."""
+
+    shared = True
+
+    def __init__(self, url, prefix='taller:'):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requiere el paquete 'redis' (pip install redis)") from e
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return False, None
+        return True, pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(self.prefix + key, pickle.dumps(value), ex=int(ttl) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(self.prefix + key, pickle.dumps(value), ex=int(ttl) if ttl else None, nx=True))
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def get_versions(self, tags):
+        if not tags:
+            return []
+        values = self._client.mget([f"{self.prefix}tag:{tag}" for tag in tags])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump_version(self, tag):
+        self._client.incr(f"{self.prefix}tag:{tag}")
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + '*'):
+            self._client.delete(key)
+
+
+class _SingleFlight:
+    """Un lock por clave, creado bajo demanda y liberado al quedar sin usuarios."""
+
+    def __init__(self):
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lock(self, key):
+        with self._lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._locks.pop(key, None)
+
+
+class Cache:
+    """Fachada de la caché: claves versionadas por etiqueta, métricas y single-flight."""
+
+    def __init__(self, backend, default_ttl=60, registry=None):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._flights = _SingleFlight()
+        self._requests = None
+        if registry is not None:
+            self._requests = registry.counter(
+                'cache_requests_total', 'Consultas a la caché por política y resultado.', ('policy', 'result'))
+
+    def _record(self, policy, result):
+        if self._requests is not None:
+            self._requests.inc((policy, result))
+
+    def _versioned_key(self, key, tags):
+        if not tags:
+            return key
+        versions = self.backend.get_versions(tags)
+        return key + '|' + ','.join(f"{tag}={version}" for tag, version in zip(tags, versions))
+
+    def get_or_set(self, key, producer, ttl=None, tags=(), policy='default', cache_if=None):
+        """
+        Retorna el valor cacheado o lo calcula con `producer()` (una sola vez
+        aunque lleguen varias peticiones a la vez).
+
+        Args:
+            key (str): Clave lógica.
+            producer (callable): Calcula el valor ante un miss.
+            ttl (float, optional): Segundos de vida (por defecto CACHE_DEFAULT_TTL).
+            tags (iterable[str]): Etiquetas que invalidan la entrada.
+            policy (str): Nombre para las métricas.
+            cache_if (callable, optional): Si retorna False, el valor no se guarda.
+        """
+        tags = tuple(tags)
+        full_key = self._versioned_key(key, tags)
+        hit, value = self.backend.get(full_key)
+        if hit:
+            self._record(policy, 'hit')
+            return value
+
+        with self._flights.lock(full_key):
+            # Otro hilo pudo haberlo calculado mientras esperábamos
+            hit, value = self.backend.get(full_key)
+            if hit:
+                self._record(policy, 'hit')
+                return value
+
+            lock_key = 'lock:' + full_key
+            owns_lock = not self.backend.shared or self.backend.add(lock_key, 1, LOCK_TTL)
+            if not owns_lock:
+                # Otro proceso lo está calculando: esperamos su resultado
+                deadline = time.monotonic() + LOCK_TTL
+                while time.monotonic() < deadline:
+                    time.sleep(LOCK_POLL)
+                    hit, value = self.backend.get(full_key)
+                    if hit:
+                        self._record(policy, 'hit')
+                        return value
+
+            self._record(policy, 'miss')
+            try:
+                with primary_reads():
+                    value = producer()
+                if cache_if is None or cache_if(value):
+                    self.backend.set(full_key, value, ttl or self.default_ttl)
+            finally:
+                if owns_lock and self.backend.shared:
+                    self.backend.delete(lock_key)
+            return value
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.bump_version(tag)
+
+    def clear(self):
+        self.backend.clear()
+
+
+def get_cache():
+    """Retorna la caché de la app en curso (o None si está desactivada)."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('cache')
+
+
+def invalidate(*tags):
+    """Invalida las etiquetas indicadas. No hace nada si la caché está desactivada."""
+    cache = get_cache()
+    if cache is not None:
+        cache.invalidate(*tags)
+
+
+def has_shared_invalidation(app, workers):
+    """
+    Indica si las invalidaciones de la caché llegan a todos los `workers`:
+    con el backend 'memory' cada proceso tiene sus propias versiones de
+    etiquetas y los demás siguen sirviendo datos viejos hasta el TTL.
+    """
+    cache = app.extensions.get('cache')
+    return cache is None or cache.backend.shared or workers <= 1
+
+
+def get_or_set(key, producer, ttl=None, tags=(), policy='default', cache_if=None):
+    """Como `Cache.get_or_set`, pero calcula directamente si la caché está desactivada."""
+    cache = get_cache()
+    if cache is None:
+        return producer()
+    return cache.get_or_set(key, producer, ttl=ttl, tags=tags, policy=policy, cache_if=cache_if)
+
+
+def cached(policy, ttl=None, tags=()):
+    """
+    Cachea la respuesta de un endpoint público (solo respuestas 200).
+
+    La clave incluye la ruta y el query string. Las etiquetas pueden usar los
+    argumentos de la vista, ej: tags=('vehicles', 'vehicle:{vehicle_id}').
+    Agrega el header X-Cache (HIT/MISS).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return view(*args, **kwargs)
+
+            produced = []
+
+            def producer():
+                response = current_app.make_response(view(*args, **kwargs))
+                produced.append(response)
+                return (response.status_code, response.mimetype, response.get_data())
+
+            key = f"view:{request.path}?{request.query_string.decode()}"
+            status, mimetype, body = cache.get_or_set(
+                key, producer, ttl=ttl,
+                tags=[tag.format(**kwargs) for tag in tags],
+                policy=policy,
+                cache_if=lambda value: value[0] == 200,
+            )
+            if produced:
+                response = produced[0]
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            response = Response(body, status=status, mimetype=mimetype)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        return wrapper
+    return decorator
+
+
+def init_cache(app):
+    """
+    Inicializa la caché de la app.
+
+    Config:
+        CACHE_ENABLED (bool): Activa la caché.
+        CACHE_BACKEND (str): 'memory' (por proceso) o 'redis' (compartida).
+        CACHE_URL (str): URL de Redis si CACHE_BACKEND=redis.
+        CACHE_MAX_ENTRIES (int): Tamaño máximo del LRU en memoria.
+        CACHE_DEFAULT_TTL (float): Vida por defecto de las entradas, en segundos.
+    """
+    if not app.config.get('CACHE_ENABLED', True):
+        return None
+
+    backend_name = app.config.get('CACHE_BACKEND', 'memory')
+    if backend_name == 'redis':
+        backend = RedisBackend(app.config['CACHE_URL'])
+    elif backend_name == 'memory':
+        backend = MemoryBackend(int(app.config.get('CACHE_MAX_ENTRIES', 5000)))
+    else:
+        raise ValueError(f"CACHE_BACKEND desconocido: {backend_name}")
+
+    from app.utils.metrics import get_registry
+    cache = Cache(backend, float(app.config.get('CACHE_DEFAULT_TTL', 60)), get_registry(app))
+    app.extensions['cache'] = cache
+    return cache
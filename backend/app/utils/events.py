@@ -0,0 +1,253 @@
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from app import db
+from app.models import OrderEvent
+
+# ==============================================================================
+# Utilidades - Eventos de Órdenes (Server-Sent Events)
+# ==============================================================================
+# 1. Los servicios registran un OrderEvent en la misma transacción que el
+#    cambio (record_order_event) y despiertan al broadcaster tras el commit.
+# 2. Cada proceso tiene un broadcaster con un hilo que lee los eventos nuevos
+#    de la tabla (una consulta por intervalo, sin importar cuántos tableros
+#    haya conectados) y los guarda en un buffer circular.
+# 3. Cada conexión SSE espera en una Condition y envía los eventos posteriores
+#    a su cursor. Si el cursor es más viejo que el buffer (reconexión con
+#    Last-Event-ID tras un corte largo), los lee directamente de la tabla.
+# El hilo se inicia con la primera conexión y termina cuando no queda ninguna
+# (nunca corre en el maestro de gunicorn antes del fork).
+#
+# Cada conexión ocupa un hilo del worker mientras dura: acquire_stream() limita
+# cuántas hay a la vez por proceso para que no dejen sin hilos a la API.
+# EventSource no permite cabeceras: el navegador se autentica con un ticket de
+# corta duración (issue_stream_ticket) en vez del JWT, que quedaría en los
+# logs de acceso.
+# ==============================================================================
+
+FETCH_LIMIT = 500
+# Un hueco en los ids puede ser una transacción que aún no hizo commit (en
+# Postgres los ids se asignan antes del commit). Se espera este margen antes
+# de darlo por perdido (rollback).
+GAP_GRACE_SECONDS = 2.0
+PRUNE_EVERY_SECONDS = 3600
+
+
+def record_order_event(order, event_type, **data):
+    """Agrega un OrderEvent a la sesión actual (se confirma con el cambio)."""
+    db.session.add(OrderEvent(work_order_id=order.id, event_type=event_type, payload=json.dumps(data)))
+
+
+def notify_order_events():
+    """Despierta al broadcaster del proceso tras confirmar un evento."""
+    if not has_app_context():
+        return
+    broadcaster = current_app.extensions.get('order_events')
+    if broadcaster is not None:
+        broadcaster.wake()
+
+
+def _ticket_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='order-events')
+
+
+def issue_stream_ticket(user_id):
+    """Ticket firmado para abrir /api/orders/events (no sirve como JWT)."""
+    return _ticket_serializer().dumps(str(user_id))
+
+
+def read_stream_ticket(ticket, max_age):
+    """Usuario del ticket, o None si es inválido o tiene más de `max_age` segundos."""
+    if not ticket:
+        return None
+    try:
+        return _ticket_serializer().loads(ticket, max_age=max_age)
+    except BadSignature:
+        return None
+
+
+def format_sse(event):
+    """Serializa un evento (dict de OrderEvent.to_dict) en formato SSE."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+class OrderEventBroadcaster:
+    """Reparte los eventos de órdenes a las conexiones SSE de este proceso."""
+
+    def __init__(self, app, poll_interval=1.0, buffer_size=1000, retention_hours=24, max_streams=0):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.max_streams = max_streams
+        self._streams = 0
+        self.retention = timedelta(hours=retention_hours)
+        self._buffer = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._last_id = None
+        self._subscribers = 0
+        self._thread = None
+        self._pruned_at = 0.0
+
+    # --------------------------------------------------------------------------
+    # Acceso a la tabla (cada llamada usa su propio contexto y sesión)
+    # --------------------------------------------------------------------------
+    def _query(self, fn):
+        with self.app.app_context():
+            try:
+                return fn()
+            finally:
+                db.session.remove()
+
+    def latest_id(self):
+        return self._query(lambda: db.session.query(db.func.max(OrderEvent.id)).scalar() or 0)
+
+    def fetch_after(self, after_id, limit=FETCH_LIMIT):
+        return self._query(lambda: [
+            event.to_dict() for event in
+            OrderEvent.query.filter(OrderEvent.id > after_id).order_by(OrderEvent.id).limit(limit)
+        ])
+
+    def prune(self):
+        cutoff = datetime.utcnow() - self.retention
+
+        def delete_old():
+            deleted = OrderEvent.query.filter(OrderEvent.created_at < cutoff).delete(synchronize_session=False)
+            db.session.commit()
+            return deleted
+        return self._query(delete_old)
+
+    # --------------------------------------------------------------------------
+    # Hilo lector
+    # --------------------------------------------------------------------------
+    def wake(self):
+        self._wake.set()
+
+    def _accept(self, events):
+        """Descarta lo que sigue a un hueco reciente (commit pendiente en otro worker)."""
+        accepted = []
+        expected = self._last_id + 1
+        now = datetime.utcnow()
+        for event in events:
+            if event['id'] != expected:
+                created = datetime.fromisoformat(event['created_at'])
+                if now - created < timedelta(seconds=GAP_GRACE_SECONDS):
+                    break
+            accepted.append(event)
+            expected = event['id'] + 1
+        return accepted
+
+    def _poll_once(self):
+        events = self._accept(self.fetch_after(self._last_id))
+        if events:
+            with self._cond:
+                self._buffer.extend(events)
+                self._last_id = events[-1]['id']
+                self._cond.notify_all()
+        return len(events)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._subscribers == 0:
+                    self._thread = None
+                    return
+            try:
+                if self._poll_once() >= FETCH_LIMIT:
+                    continue
+                if time.monotonic() - self._pruned_at > PRUNE_EVERY_SECONDS:
+                    self._pruned_at = time.monotonic()
+                    self.prune()
+            except Exception:
+                self.app.logger.exception("Error leyendo eventos de órdenes")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    # --------------------------------------------------------------------------
+    # Suscriptores
+    # --------------------------------------------------------------------------
+    def subscribe(self):
+        if self._last_id is None:
+            latest = self.latest_id()
+            with self._cond:
+                if self._last_id is None:
+                    self._last_id = latest
+        with self._cond:
+            self._subscribers += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='order-events', daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self):
+        with self._cond:
+            self._subscribers -= 1
+
+    def acquire_stream(self):
+        """Reserva una conexión; False si ya hay `max_streams` abiertas (0 = sin límite)."""
+        with self._cond:
+            if self.max_streams and self._streams >= self.max_streams:
+                return False
+            self._streams += 1
+            return True
+
+    def release_stream(self):
+        with self._cond:
+            self._streams -= 1
+
+    def wait_for_events(self, cursor, timeout):
+        """Eventos posteriores a `cursor`; espera hasta `timeout` segundos si no hay."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._last_id > cursor, timeout)
+            if self._last_id <= cursor:
+                return []
+            if self._buffer and self._buffer[0]['id'] <= cursor + 1:
+                return [event for event in self._buffer if event['id'] > cursor]
+        # El cursor quedó fuera del buffer: se lee de la tabla
+        return self.fetch_after(cursor)
+
+    def stream(self, cursor, timeout, heartbeat):
+        """Generador SSE para una conexión; termina tras `timeout` segundos."""
+        self.subscribe()
+        try:
+            # El navegador reconecta solo (con Last-Event-ID) al cerrarse el stream
+            yield "retry: 3000\n\n"
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                events = self.wait_for_events(cursor, min(heartbeat, remaining))
+                if not events:
+                    yield ": ping\n\n"
+                    continue
+                for event in events:
+                    yield format_sse(event)
+                    cursor = event['id']
+        finally:
+            self.unsubscribe()
+
+
+def init_order_events(app):
+    """
+    Crea el broadcaster de eventos de órdenes (el hilo se inicia al primer uso).
+
+    Config:
+        EVENTS_POLL_INTERVAL (float): Segundos entre lecturas de la tabla.
+        EVENTS_STREAM_TIMEOUT (float): Duración máxima de una conexión SSE.
+        EVENTS_HEARTBEAT (float): Segundos entre comentarios de keep-alive.
+        EVENTS_RETENTION_HOURS (float): Antigüedad máxima de los eventos guardados.
+        EVENTS_MAX_STREAMS (int): Conexiones SSE simultáneas por proceso (0 = sin límite).
+    """
+    broadcaster = OrderEventBroadcaster(
+        app,
+        poll_interval=float(app.config.get('EVENTS_POLL_INTERVAL', 1.0)),
+        retention_hours=float(app.config.get('EVENTS_RETENTION_HOURS', 24)),
+        max_streams=int(app.config.get('EVENTS_MAX_STREAMS', 0)),
+    )
+    app.extensions['order_events'] = broadcaster
+    return broadcaster
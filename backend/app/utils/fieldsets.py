@@ -0,0 +1,204 @@
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import configure_mappers, joinedload, load_only, selectinload
+
+from app.models import Client, OrderItem, Payment, Service, Vehicle, WorkOrder
+
+# ==============================================================================
+# Utilidades - Campos Parciales (?fields=) y Relaciones Embebidas (?include=)
+# ==============================================================================
+# Cada Fieldset describe qué puede devolver un modelo en los listados:
+#   - columnas (se seleccionan con load_only: las no pedidas no salen en el SELECT)
+#   - campos calculados de una relación muchos-a-uno (se cargan con un JOIN
+#     de solo las columnas necesarias, ej: vehicle_plate)
+#   - relaciones embebibles (se cargan con selectinload solo si se incluyen)
+#
+#   GET /api/orders?fields=id,status,total,vehicle_plate&include=
+#
+# Sin ?fields= se devuelven los campos por defecto (los mismos que to_dict) y
+# sin ?include= las relaciones por defecto; ?include= vacío no embebe ninguna.
+# ==============================================================================
+
+
+class Extra:
+    """Campo calculado a partir de una relación muchos-a-uno."""
+
+    def __init__(self, relation, columns, getter):
+        self.relation = relation
+        self.columns = columns
+        self.getter = getter
+
+
+class Relation:
+    """Relación embebible; `target` es el nombre del Fieldset del modelo relacionado."""
+
+    def __init__(self, attribute, target, many=True):
+        self.attribute = attribute
+        self.target = target
+        self.many = many
+
+
+class Selection:
+    """Campos y relaciones pedidos para una respuesta."""
+
+    def __init__(self, fields, include):
+        self.fields = tuple(fields)
+        self.include = tuple(include)
+
+
+class Fieldset:
+    """
+    Campos serializables de un modelo.
+
+    Args:
+        model: Modelo SQLAlchemy.
+        columns (tuple[str]): Columnas que se pueden pedir.
+        extras (dict[str, Extra]): Campos calculados.
+        relations (dict[str, Relation]): Relaciones que se pueden incluir.
+        default_fields (tuple[str], optional): Campos sin ?fields= (todas las
+            columnas y extras por defecto).
+        default_include (tuple[str]): Relaciones sin ?include=.
+    """
+
+    def __init__(self, model, columns, extras=None, relations=None, default_fields=None, default_include=()):
+        self.model = model
+        self.columns = tuple(columns)
+        self.extras = extras or {}
+        self.relations = relations or {}
+        self.default = Selection(default_fields or self.columns + tuple(self.extras), default_include)
+
+    @property
+    def allowed_fields(self):
+        return self.columns + tuple(self.extras)
+
+    def select(self, fields=None, include=None):
+        """
+        Valida una selección (None = valores por defecto).
+
+        Raises:
+            ValueError: Si se pide un campo o una relación que no existe.
+        """
+        fields = self.default.fields if fields is None else fields
+        include = self.default.include if include is None else include
+        unknown = [f for f in fields if f not in self.allowed_fields]
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(unknown)}. "
+                             f"Permitidos: {', '.join(self.allowed_fields)}")
+        unknown = [r for r in include if r not in self.relations]
+        if unknown:
+            raise ValueError(f"Relaciones desconocidas: {', '.join(unknown)}. "
+                             f"Permitidas: {', '.join(self.relations) or 'ninguna'}")
+        return Selection(fields, include)
+
+    def from_request(self, args):
+        """Selección a partir de los parámetros ?fields= e ?include= de la petición."""
+        def split(name):
+            if name not in args:
+                return None
+            return [part.strip() for part in args.get(name, '').split(',') if part.strip()]
+        return self.select(split('fields'), split('include'))
+
+    def options(self, selection, required=()):
+        """
+        Opciones de carga (load_only, JOINs y selectinload) para la selección.
+        `required` agrega columnas que la consulta necesita aunque no se
+        devuelvan (ej: las del cursor de paginación).
+        """
+        mapper = inspect(self.model)
+        columns = {column.key for column in mapper.primary_key}
+        columns.update(f for f in selection.fields if f in self.columns)
+        columns.update(required)
+
+        included = {self.relations[name].attribute.key for name in selection.include}
+        options = []
+        for name in selection.fields:
+            extra = self.extras.get(name)
+            if extra is None:
+                continue
+            columns.update(c.key for c in extra.relation.property.local_columns)
+            if extra.relation.key not in included:  # si se incluye, ya se carga completa
+                options.append(joinedload(extra.relation).load_only(*extra.columns))
+
+        for name in selection.include:
+            relation = self.relations[name]
+            columns.update(c.key for c in relation.attribute.property.local_columns)
+            target = FIELDSETS[relation.target]
+            options.append(selectinload(relation.attribute).options(*target.options(target.default)))
+
+        attributes = [getattr(self.model, key) for key in sorted(columns)]
+        return [load_only(*attributes)] + options
+
+    def dump(self, obj, selection=None):
+        """Serializa `obj` con los campos y relaciones de la selección."""
+        selection = selection or self.default
+        data = {}
+        for name in selection.fields:
+            if name in self.extras:
+                data[name] = self.extras[name].getter(obj)
+            else:
+                value = getattr(obj, name)
+                data[name] = value.isoformat() if isinstance(value, datetime) else value
+        for name in selection.include:
+            relation = self.relations[name]
+            target = FIELDSETS[relation.target]
+            value = getattr(obj, relation.attribute.key)
+            if relation.many:
+                data[name] = [target.dump(related) for related in value]
+            else:
+                data[name] = target.dump(value) if value is not None else None
+        return data
+
+
+# ==============================================================================
+# Fieldsets por modelo (los valores por defecto reproducen los listados previos)
+# ==============================================================================
+configure_mappers()  # crea los backref (Vehicle.owner, WorkOrder.vehicle, ...)
+
+FIELDSETS = {
+    'client': Fieldset(
+        Client,
+        columns=('id', 'first_name', 'last_name', 'email', 'phone', 'address', 'created_at', 'updated_at'),
+        relations={'vehicles': Relation(Client.vehicles, 'vehicle')},
+        default_fields=('id', 'first_name', 'last_name', 'email', 'phone', 'address', 'created_at'),
+    ),
+    'vehicle': Fieldset(
+        Vehicle,
+        columns=('id', 'client_id', 'plate', 'brand', 'model', 'year', 'vin', 'updated_at'),
+        extras={'client_name': Extra(
+            Vehicle.owner, (Client.first_name, Client.last_name),
+            lambda v: f"{v.owner.first_name} {v.owner.last_name}" if v.owner else "Desconocido"
+        )},
+        relations={'owner': Relation(Vehicle.owner, 'client', many=False)},
+        default_fields=('id', 'client_id', 'plate', 'brand', 'model', 'year', 'vin', 'client_name'),
+    ),
+    'order': Fieldset(
+        WorkOrder,
+        columns=('id', 'vehicle_id', 'user_id', 'status', 'total', 'amount_paid', 'balance',
+                 'created_at', 'updated_at'),
+        extras={'vehicle_plate': Extra(
+            WorkOrder.vehicle, (Vehicle.plate,), lambda o: o.vehicle.plate if o.vehicle else None
+        )},
+        relations={
+            'items': Relation(WorkOrder.items, 'order_item'),
+            'payments': Relation(WorkOrder.payments, 'payment'),
+            'vehicle': Relation(WorkOrder.vehicle, 'vehicle', many=False),
+        },
+        default_fields=('id', 'vehicle_id', 'user_id', 'status', 'total', 'amount_paid', 'balance',
+                        'created_at', 'vehicle_plate'),
+        default_include=('items',),
+    ),
+    'order_item': Fieldset(
+        OrderItem,
+        columns=('id', 'work_order_id', 'service_id', 'price_at_moment', 'updated_at'),
+        extras={'service_name': Extra(
+            OrderItem.service, (Service.name,), lambda i: i.service.name if i.service else None
+        )},
+        default_fields=('id', 'work_order_id', 'service_id', 'service_name', 'price_at_moment'),
+    ),
+    'payment': Fieldset(
+        Payment,
+        columns=('id', 'work_order_id', 'amount', 'payment_method', 'status', 'created_at', 'updated_at'),
+        default_fields=('id', 'work_order_id', 'amount', 'payment_method', 'status', 'created_at'),
+    ),
+}
@@ -0,0 +1,246 @@
+import threading
+import time
+
+from flask import g, request, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ==============================================================================
+# Utilidades - Instrumentación (Métricas por Petición)
+# ==============================================================================
+# Registra por ruta: duración de la petición, número de consultas SQL, tiempo
+# total en SQL y tamaño de la respuesta. Las métricas se exponen en formato
+# Prometheus (texto) en /metrics y, opcionalmente, en el header Server-Timing.
+# ==============================================================================
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+def _format_labels(names, values):
+    """Construye el bloque {k="v",...} de una serie Prometheus."""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Counter:
+    """Contador monótono con etiquetas."""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos, al estilo Prometheus."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket_counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[labels] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels):
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def sum(self, labels):
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.label_names + ('le',)
+        with self._lock:
+            for labels, (bucket_counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(bucket_names, labels + (bound,))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, labels + ('+Inf',))} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas de la aplicación.
+
+    Otros módulos pueden registrar sus propias métricas con `counter()` y
+    `histogram()`; todas se exponen juntas en /metrics.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+        route_labels = ('method', 'route')
+        self.requests_total = self.counter(
+            'http_requests_total', 'Total de peticiones HTTP atendidas.', route_labels + ('status',))
+        self.request_duration = self.histogram(
+            'http_request_duration_seconds', 'Duración de la petición HTTP.', route_labels, DURATION_BUCKETS)
+        self.sql_queries = self.histogram(
+            'http_request_sql_queries', 'Consultas SQL ejecutadas por petición.', route_labels, QUERY_COUNT_BUCKETS)
+        self.sql_duration = self.histogram(
+            'http_request_sql_duration_seconds', 'Tiempo total en SQL por petición.', route_labels, DURATION_BUCKETS)
+        self.response_size = self.histogram(
+            'http_response_size_bytes', 'Tamaño del cuerpo de la respuesta.', route_labels, SIZE_BUCKETS)
+
+    def counter(self, name, help_text, label_names=()):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help_text, label_names)
+            return self._metrics[name]
+
+    def histogram(self, name, help_text, label_names=(), buckets=DURATION_BUCKETS):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help_text, label_names, buckets)
+            return self._metrics[name]
+
+    def render(self):
+        """Devuelve todas las métricas en el formato de texto de Prometheus."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class RequestStats:
+    """Acumulador por petición, guardado en `flask.g`."""
+
+    __slots__ = ('start', 'sql_count', 'sql_time')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+
+# ==============================================================================
+# Eventos de SQLAlchemy (comunes a todos los engines)
+# ==============================================================================
+_listeners_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_app_context():
+        stats = g.get('_request_stats')
+        if stats is not None:
+            stats.sql_count += 1
+            stats.sql_time += elapsed
+
+
+def _install_engine_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _listeners_installed = True
+
+
+def get_registry(app):
+    """Retorna el registro de métricas de la app (o None si está desactivado)."""
+    return app.extensions.get('metrics')
+
+
+def _route_labels():
+    rule = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+    return (request.method, rule)
+
+
+def init_metrics(app):
+    """
+    Registra la instrumentación en la aplicación.
+
+    Config:
+        METRICS_ENABLED (bool): Activa la recolección y el endpoint /metrics.
+        SERVER_TIMING_ENABLED (bool): Agrega el header Server-Timing a cada respuesta.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return None
+
+    registry = MetricsRegistry()
+    app.extensions['metrics'] = registry
+    server_timing = app.config.get('SERVER_TIMING_ENABLED', False)
+    _install_engine_listeners()
+
+    @app.before_request
+    def _start_request_stats():
+        g._request_stats = RequestStats()
+
+    @app.after_request
+    def _record_request_stats(response):
+        stats = g.pop('_request_stats', None)
+        if stats is None:
+            return response
+
+        duration = time.perf_counter() - stats.start
+        labels = _route_labels()
+        registry.requests_total.inc(labels + (str(response.status_code),))
+        registry.request_duration.observe(labels, duration)
+        registry.sql_queries.observe(labels, stats.sql_count)
+        registry.sql_duration.observe(labels, stats.sql_time)
+
+        # Las respuestas en streaming no tienen tamaño conocido
+        if not response.is_streamed:
+            size = response.calculate_content_length()
+            if size is not None:
+                registry.response_size.observe(labels, size)
+
+        if server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'app;dur={duration * 1000:.2f}, '
+                f'db;dur={stats.sql_time * 1000:.2f};desc="{stats.sql_count} queries"'
+            )
+        return response
+
+    from app.routes.metrics import metrics_bp
+    app.register_blueprint(metrics_bp)
+    return registry
@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import tuple_
+
+# ==============================================================================
+# Utilidades - Paginación por Cursor (keyset)
+# ==============================================================================
+# En lugar de OFFSET (que recorre y descarta todas las filas anteriores), el
+# cursor guarda los valores de las columnas de orden de la última fila
+# entregada y la página siguiente filtra con
+#     (col1, col2) < (v1, v2)
+# (o > para orden ascendente), lo que se resuelve con un rango sobre el
+# índice. La última columna debe ser única (normalmente el id).
+# ==============================================================================
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_cursor(values):
+    """Serializa los valores de orden de una fila a un token opaco."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """
+    Recupera los valores de un cursor.
+
+    Raises:
+        ValueError: Si el cursor no es válido para estas columnas.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if column.type.python_type is datetime and v is not None else v
+            for column, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError, NotImplementedError):
+        raise ValueError("Cursor inválido")
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """Normaliza el parámetro `limit` de la petición al rango [1, maximum]."""
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def parse_date(value, end=False):
+    """
+    Fecha ISO de un filtro por rango; una fecha sin hora como límite superior
+    (`end`) incluye el día completo.
+
+    Raises:
+        ValueError: Si no es una fecha ISO.
+    """
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def paginate(query, columns, cursor=None, limit=DEFAULT_LIMIT, descending=True):
+    """
+    Ejecuta una página de `query` ordenada por `columns`.
+
+    Args:
+        query (Query): Consulta ya filtrada (sin ORDER BY ni LIMIT).
+        columns (list[Column]): Columnas de orden; la última debe ser única.
+        cursor (str, optional): Cursor devuelto por la página anterior.
+        limit (int): Tamaño de la página.
+        descending (bool): Orden descendente (por defecto) o ascendente.
+
+    Returns:
+        tuple(list, str | None): Filas de la página y cursor de la siguiente
+        (None si no hay más).
+
+    Raises:
+        ValueError: Si el cursor no es válido.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
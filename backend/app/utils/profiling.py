@@ -0,0 +1,157 @@
+import logging
+import os
+import time
+from datetime import datetime
+
+from flask import g, request, has_app_context, has_request_context, current_app, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ==============================================================================
+# Utilidades - Diagnóstico de Rendimiento
+# ==============================================================================
+# 1. Log de consultas lentas: engancha before/after_cursor_execute de todos
+#    los engines (primario y réplica) y registra las consultas que superan el
+#    umbral de la app en curso.
+# 2. Perfilado bajo demanda: con `?__profile=1`, un administrador puede ejecutar
+#    la petición bajo cProfile y recibir (o guardar) las estadísticas.
+# Ninguno de los dos registra hooks si está desactivado en la configuración.
+# ==============================================================================
+
+slow_query_logger = logging.getLogger('app.slow_query')
+
+MAX_PARAMS_LENGTH = 500
+
+
+def _current_route():
+    """Describe la petición en curso para asociarla a la consulta."""
+    if not has_request_context():
+        return None
+    return f"{request.method} {request.path} ({request.endpoint})"
+
+
+def _slow_query_threshold():
+    """Umbral (segundos) de la app actual, o None si el log está desactivado."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('slow_query_threshold')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _slow_query_threshold() is not None:
+        conn.info.setdefault('_slow_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_slow_query_start')
+    threshold = _slow_query_threshold()
+    if not starts or threshold is None:
+        return
+    duration = time.perf_counter() - starts.pop()
+    if duration < threshold:
+        return
+    params = repr(parameters)
+    if len(params) > MAX_PARAMS_LENGTH:
+        params = params[:MAX_PARAMS_LENGTH] + '...'
+    slow_query_logger.warning(
+        "Consulta lenta (%.1f ms) en %s: %s | params=%s",
+        duration * 1000, _current_route(), statement, params,
+        extra={
+            'duration_ms': duration * 1000,
+            'statement': statement,
+            'parameters': params,
+            'route': _current_route(),
+        }
+    )
+
+
+_listeners_installed = False
+
+
+def init_slow_query_log(app, db):
+    """
+    Registra el log de consultas lentas.
+
+    Los listeners van en la clase Engine (como en metrics.py): cubren también
+    engines creados después, como el de la réplica, que se crea al primer uso.
+
+    Config:
+        SLOW_QUERY_THRESHOLD_MS (float): Umbral en milisegundos. 0 lo desactiva.
+    """
+    global _listeners_installed
+    threshold_ms = float(app.config.get('SLOW_QUERY_THRESHOLD_MS') or 0)
+    if threshold_ms <= 0:
+        return
+
+    app.extensions['slow_query_threshold'] = threshold_ms / 1000.0
+    if not _listeners_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listeners_installed = True
+
+
+def _is_admin_request():
+    """Verifica (sin exigir token) que la petición la hace un administrador."""
+    from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+    from app.models import User
+
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    user_id = get_jwt_identity()
+    if not user_id:
+        return False
+    user = User.query.get(user_id)
+    return bool(user and user.role == 'admin')
+
+
+def init_request_profiler(app):
+    """
+    Habilita el perfilado bajo demanda de peticiones (solo administradores).
+
+    Config:
+        PROFILING_ENABLED (bool): Activa el parámetro `?__profile=1`.
+        PROFILE_DIR (str, optional): Si se define, guarda los .prof en ese
+            directorio y responde normalmente con el header X-Profile-File.
+            Si no, reemplaza la respuesta por el reporte de pstats.
+    """
+    if not app.config.get('PROFILING_ENABLED', False):
+        return
+
+    # Importados solo si el perfilado está activo (no pesan en el arranque)
+    import cProfile
+    import io
+    import pstats
+
+    profile_dir = app.config.get('PROFILE_DIR')
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+
+    @app.before_request
+    def _start_profiler():
+        if request.args.get('__profile') != '1' or not _is_admin_request():
+            return None
+        profiler = cProfile.Profile()
+        g._profiler = profiler
+        profiler.enable()
+        return None
+
+    @app.after_request
+    def _stop_profiler(response):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+
+        if profile_dir:
+            timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+            filename = os.path.join(profile_dir, f"{timestamp}-{request.endpoint}.prof")
+            profiler.dump_stats(filename)
+            response.headers['X-Profile-File'] = filename
+            return response
+
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(50)
+        return Response(output.getvalue(), mimetype='text/plain')
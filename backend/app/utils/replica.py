@@ -0,0 +1,237 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, request, has_app_context, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.dml import UpdateBase
+
+# ==============================================================================
+# Utilidades - Réplica de Lectura
+# ==============================================================================
+# Si SQLALCHEMY_REPLICA_URI está definido, las consultas de peticiones GET/HEAD
+# se envían a un engine de solo lectura. Se usa el primario cuando:
+# 1. La sesión ya escribió (flush) o la sentencia es INSERT/UPDATE/DELETE.
+# 2. El usuario (o su IP) escribió hace menos de REPLICA_STICKY_SECONDS
+#    (read-your-writes: la réplica puede ir unos segundos atrasada).
+# 3. La réplica no responde al chequeo de salud (se reintenta cada
+#    REPLICA_HEALTH_INTERVAL segundos).
+# 4. El handler llamó a `use_primary()`.
+# El registro de escrituras recientes vive en memoria del proceso.
+#
+# El engine de la réplica no es un bind de Flask-SQLAlchemy a propósito:
+# db.create_all()/drop_all() recorren todos los binds y no deben tocarla.
+# ==============================================================================
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+MAX_STICKY_ENTRIES = 10000
+
+
+class ReplicaRouter:
+    """Estado compartido del enrutado: salud de la réplica y escrituras recientes."""
+
+    def __init__(self, uri, engine_options=None, sticky_seconds=5.0, health_interval=10.0):
+        self.uri = uri
+        self.engine_options = dict(engine_options or {})
+        self.sticky_seconds = sticky_seconds
+        self.health_interval = health_interval
+        self._recent_writes = {}  # clave -> instante hasta el que se lee del primario
+        self._healthy = True
+        self._checked_at = None
+        self._lock = threading.RLock()
+        self._engine = None
+
+    # --------------------------------------------------------------------------
+    # Salud
+    # --------------------------------------------------------------------------
+    def engine(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    engine = create_engine(self.uri, **self.engine_options)
+                    event.listen(engine, 'handle_error', self._on_error)
+                    self._engine = engine
+        return self._engine
+
+    def dispose(self, close=True):
+        if self._engine is not None:
+            self._engine.dispose(close=close)
+
+    def _on_error(self, context):
+        # Un error de conexión en la réplica la saca de rotación hasta el próximo chequeo
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+            self.mark_unhealthy()
+
+    def mark_unhealthy(self):
+        with self._lock:
+            self._healthy = False
+            self._checked_at = time.monotonic()
+
+    def is_healthy(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.health_interval:
+            return self._healthy
+
+        with self._lock:
+            # Otro hilo pudo haber hecho el chequeo mientras esperábamos
+            if self._checked_at is not None and now - self._checked_at < self.health_interval:
+                return self._healthy
+            self._checked_at = now
+            try:
+                with self.engine().connect() as conn:
+                    conn.execute(text('SELECT 1'))
+                self._healthy = True
+            except Exception:
+                current_app.logger.warning("Réplica de lectura no disponible; usando el primario")
+                self._healthy = False
+            return self._healthy
+
+    # --------------------------------------------------------------------------
+    # Read-your-writes
+    # --------------------------------------------------------------------------
+    def remember_write(self, keys):
+        if self.sticky_seconds <= 0:
+            return
+        until = time.monotonic() + self.sticky_seconds
+        with self._lock:
+            if len(self._recent_writes) >= MAX_STICKY_ENTRIES:
+                now = time.monotonic()
+                self._recent_writes = {k: v for k, v in self._recent_writes.items() if v > now}
+            for key in keys:
+                self._recent_writes[key] = until
+
+    def wrote_recently(self, keys):
+        now = time.monotonic()
+        return any(self._recent_writes.get(key, 0) > now for key in keys)
+
+
+def _jwt_identity():
+    """Usuario del JWT de la petición (verificado o no por la ruta), o None."""
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        identity = None
+    if identity is None and 'Authorization' in request.headers:
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+    return identity
+
+
+def _request_keys():
+    """
+    Identifica a quien hace la petición: el usuario del JWT y, solo en
+    peticiones anónimas, la IP (detrás de un NAT o proxy compartido la IP
+    fijaría al primario a todos los usuarios que salen por ella).
+
+    Se calcula una vez por petición (get_bind la consulta en cada sentencia):
+    un token vencido o inválido no se vuelve a verificar.
+    """
+    keys = g.get('_db_request_keys')
+    if keys is None:
+        identity = _jwt_identity()
+        keys = g._db_request_keys = [f"user:{identity}"] if identity else [f"ip:{request.remote_addr}"]
+    return keys
+
+
+def use_primary():
+    """Fuerza que el resto de la petición lea del primario."""
+    g._db_use_primary = True
+
+
+@contextmanager
+def primary_reads():
+    """Lee del primario dentro del bloque (ej: al llenar la caché)."""
+    if not has_app_context():
+        yield
+        return
+    previous = g.get('_db_use_primary', False)
+    g._db_use_primary = True
+    try:
+        yield
+    finally:
+        g._db_use_primary = previous
+
+
+def skip_write_tracking():
+    """La petición en curso no cuenta como escritura aunque su método no sea GET."""
+    g._db_skip_write_tracking = True
+
+
+def remember_write():
+    """Registra ahora una escritura del llamador (read-your-writes)."""
+    router = current_app.extensions.get('replica')
+    if router is not None:
+        router.remember_write(_request_keys())
+
+
+def _replica_for_request(router):
+    """Retorna el engine de la réplica si la petición en curso puede usarla."""
+    if not has_request_context() or request.method not in SAFE_METHODS:
+        return None
+    if g.get('_db_use_primary'):
+        return None
+    if router.wrote_recently(_request_keys()):
+        return None
+    if not router.is_healthy():
+        return None
+    return router.engine()
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas de peticiones GET a la réplica.
+    Sin réplica configurada se comporta igual que la sesión por defecto.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and not self._flushing \
+                and not self.info.get('wrote') and not isinstance(clause, UpdateBase):
+            router = current_app.extensions.get('replica')
+            if router is not None:
+                engine = _replica_for_request(router)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def flush(self, objects=None):
+        # A partir de la primera escritura la sesión solo usa el primario
+        if self.new or self.dirty or self.deleted:
+            self.info['wrote'] = True
+        return super().flush(objects)
+
+
+def init_replica(app):
+    """
+    Configura el enrutado de lecturas a la réplica (el engine se crea al primer uso).
+
+    Config:
+        SQLALCHEMY_REPLICA_URI (str, optional): URI de la réplica de solo lectura.
+        REPLICA_STICKY_SECONDS (float): Ventana read-your-writes tras una escritura.
+        REPLICA_HEALTH_INTERVAL (float): Segundos entre chequeos de salud.
+    """
+    replica_uri = app.config.get('SQLALCHEMY_REPLICA_URI')
+    if not replica_uri:
+        return None
+
+    router = ReplicaRouter(
+        replica_uri,
+        engine_options=app.config.get('SQLALCHEMY_ENGINE_OPTIONS'),
+        sticky_seconds=float(app.config.get('REPLICA_STICKY_SECONDS', 5)),
+        health_interval=float(app.config.get('REPLICA_HEALTH_INTERVAL', 10)),
+    )
+    app.extensions['replica'] = router
+
+    @app.after_request
+    def _remember_writes(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400 \
+                and not g.get('_db_skip_write_tracking'):
+            router.remember_write(_request_keys())
+        return response
+
+    return router
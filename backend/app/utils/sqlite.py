@@ -0,0 +1,121 @@
+import threading
+import time
+
+from sqlalchemy import event
+
+# ==============================================================================
+# Utilidades - Conexiones SQLite
+# ==============================================================================
+# Con SQLite (sqlite:///local.db) cada conexión nueva se configura en el evento
+# 'connect' de los engines de la app (no afecta a Postgres):
+#   - foreign_keys=ON: sin eso ON DELETE CASCADE no borra nada y se pueden
+#     insertar filas huérfanas.
+#   - journal_mode=WAL: los lectores no se bloquean con el escritor (y
+#     viceversa); synchronous=NORMAL es seguro con WAL y evita un fsync por commit.
+#   - busy_timeout: un escritor espera el lock en vez de fallar con
+#     "database is locked".
+#   - cache_size y mmap_size: páginas en memoria y lectura mapeada del archivo.
+#
+# Cada SQLITE_MAINTENANCE_INTERVAL segundos, la conexión que vuelve al pool
+# ejecuta PRAGMA optimize (estadísticas del planificador) y un checkpoint
+# PASSIVE del WAL (no espera a los lectores), sin hilos aparte.
+# ==============================================================================
+
+
+def _pragmas(config):
+    """Sentencias PRAGMA por conexión según la config (en orden)."""
+    pragmas = ['PRAGMA foreign_keys=ON',
+               f"PRAGMA busy_timeout={int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}"]
+    journal_mode = config.get('SQLITE_JOURNAL_MODE', 'WAL')
+    if journal_mode:
+        pragmas.append(f'PRAGMA journal_mode={journal_mode}')
+    synchronous = config.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    if synchronous:
+        pragmas.append(f'PRAGMA synchronous={synchronous}')
+    cache_size_kb = int(config.get('SQLITE_CACHE_SIZE_KB', 0))
+    if cache_size_kb:
+        pragmas.append(f'PRAGMA cache_size=-{cache_size_kb}')  # negativo = KiB
+    mmap_size = int(config.get('SQLITE_MMAP_SIZE', 0))
+    if mmap_size:
+        pragmas.append(f'PRAGMA mmap_size={mmap_size}')
+    return pragmas
+
+
+def _execute(dbapi_connection, statements):
+    cursor = dbapi_connection.cursor()
+    try:
+        for statement in statements:
+            cursor.execute(statement)
+            cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _is_file_database(engine):
+    return engine.url.database not in (None, '', ':memory:') and not engine.url.database.startswith('file::memory:')
+
+
+class SqliteMaintenance:
+    """PRAGMA optimize + checkpoint del WAL, como mucho una vez por intervalo."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.last_run = None
+        self.runs = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def due(self):
+        return time.monotonic() - (self.last_run or self._started) >= self.interval
+
+    def run(self, dbapi_connection):
+        # Un solo hilo la ejecuta; el resto devuelve su conexión sin esperar
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if not self.due():
+                return False
+            self.last_run = time.monotonic()
+            _execute(dbapi_connection, ['PRAGMA optimize', 'PRAGMA wal_checkpoint(PASSIVE)'])
+            self.runs += 1
+            return True
+        finally:
+            self._lock.release()
+
+
+def init_sqlite(app, db):
+    """
+    Configura los engines SQLite de la app (pragmas por conexión y mantenimiento).
+
+    Config:
+        SQLITE_JOURNAL_MODE (str): 'WAL' por defecto; vacío no lo cambia.
+        SQLITE_SYNCHRONOUS (str): 'NORMAL' por defecto; vacío no lo cambia.
+        SQLITE_BUSY_TIMEOUT_MS (int): Espera máxima por el lock de escritura.
+        SQLITE_CACHE_SIZE_KB (int): Caché de páginas por conexión (0 = por defecto).
+        SQLITE_MMAP_SIZE (int): Bytes del archivo leídos con mmap (0 = desactivado).
+        SQLITE_MAINTENANCE_INTERVAL (float): Segundos entre PRAGMA optimize y
+            checkpoints (0 = desactivado).
+    """
+    pragmas = _pragmas(app.config)
+    interval = float(app.config.get('SQLITE_MAINTENANCE_INTERVAL', 0))
+
+    def on_connect(dbapi_connection, connection_record):
+        _execute(dbapi_connection, pragmas)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name != 'sqlite':
+                continue
+            event.listen(engine, 'connect', on_connect)
+            if interval > 0 and _is_file_database(engine):
+                maintenance = SqliteMaintenance(interval)
+                app.extensions.setdefault('sqlite_maintenance', {})[engine.url.database] = maintenance
+
+                def on_checkin(dbapi_connection, connection_record, maintenance=maintenance):
+                    if dbapi_connection is not None and maintenance.due():
+                        try:
+                            maintenance.run(dbapi_connection)
+                        except Exception:
+                            app.logger.exception("Error en el mantenimiento de SQLite")
+
+                event.listen(engine, 'checkin', on_checkin)
@@ -0,0 +1,26 @@
+from flask import g, has_app_context
+from flask_jwt_extended import JWTManager as BaseJWTManager
+
+# ==============================================================================
+# Utilidades - Tokens JWT
+# ==============================================================================
+# JWTManager que puede reutilizar un token ya verificado en la misma
+# petición en lugar de volver a decodificarlo y comprobar su firma. Lo usa
+# /api/batch: el lote verifica el token una vez y sus sub-peticiones reciben
+# los claims ya decodificados. Los demás chequeos de @jwt_required (tipo de
+# token, frescura, lista de revocados) se siguen haciendo en cada vista.
+# ==============================================================================
+
+
+def trust_verified_token(encoded_token, claims):
+    """Marca `encoded_token` como ya verificado (con esos claims) en el contexto actual."""
+    g._verified_jwt = (encoded_token, claims)
+
+
+class JWTManager(BaseJWTManager):
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        verified = g.get('_verified_jwt') if has_app_context() else None
+        if verified is not None and verified[0] == encoded_token and csrf_value is None:
+            return verified[1]
+        return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
@@ -0,0 +1,82 @@
+import re
+
+from sqlalchemy import select
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import db
+
+# ==============================================================================
+# Utilidades - Escrituras en un viaje a la base de datos
+# ==============================================================================
+# Las altas y modificaciones no consultan antes si el dato ya existe: el
+# INSERT/UPDATE va directo y las restricciones de la base (UNIQUE, NOT NULL,
+# FK) deciden. La IntegrityError se traduce al mismo ValueError que daba la
+# validación previa (raise_constraint_error).
+#
+# Los valores generados (id, defaults) vuelven en el propio INSERT (RETURNING
+# en Postgres, lastrowid en SQLite) y commit_without_reload() no expira los
+# objetos escritos: la respuesta se serializa sin volver a leerlos.
+# ==============================================================================
+
+
+def _constraint_patterns(table, column):
+    return (
+        rf'\b{table}\.{column}\b',                  # SQLite: UNIQUE constraint failed: users.email
+        rf'"{table}_{column}_(?:key|fkey)"',        # Postgres: nombre por defecto de UNIQUE / FK
+        rf'"uq_{table}_{column}"',                  # Postgres: índice único parcial (entre los activos)
+        rf'column "{column}" of relation "{table}"',  # Postgres: NOT NULL
+    )
+
+
+def raise_constraint_error(error, messages, default=None):
+    """
+    Lanza un ValueError con el mensaje de la restricción violada.
+
+    Args:
+        error (IntegrityError): Error de la base de datos.
+        messages (dict[str, str]): Mensaje por 'tabla.columna'.
+        default (str, optional): Mensaje si no coincide ninguna; sin él se
+            relanza `error`.
+
+    Raises:
+        ValueError: Con el mensaje correspondiente.
+    """
+    text = str(error.orig)
+    for key, message in messages.items():
+        table, column = key.split('.')
+        if any(re.search(pattern, text) for pattern in _constraint_patterns(table, column)):
+            raise ValueError(message) from error
+    if default is None:
+        raise error
+    raise ValueError(default) from error
+
+
+def flush_active_reference(obj, key, model, ident):
+    """
+    Asigna a la FK `key` de `obj` el registro `ident` de `model` y hace flush,
+    validando en el mismo INSERT/UPDATE que exista y no tenga borrado lógico:
+    el valor es una subconsulta que da NULL si no, y la columna NOT NULL
+    rechaza la fila (IntegrityError sobre 'tabla.key').
+    """
+    setattr(obj, key, select(model.id).where(model.id == ident, model.deleted_at.is_(None)).scalar_subquery())
+    db.session.add(obj)
+    db.session.flush()
+    # La subconsulta solo pudo valer el id de `ident`: se deja en el objeto sin
+    # releerlo, con el tipo de la columna (el JSON puede traer "2" en vez de 2)
+    try:
+        value = model.id.type.python_type(ident)
+    except (TypeError, ValueError):
+        db.session.expire(obj, [key])  # Se relee al usarlo
+        return
+    set_committed_value(obj, key, value)
+
+
+def commit_without_reload():
+    """Confirma la transacción sin expirar los objetos de la sesión."""
+    session = db.session()
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
@@ -0,0 +1,49 @@
+import argparse
+import json
+from datetime import date
+
+from app import create_app
+from app.services.archive_service import ArchiveService, parse_month
+from app.models import ArchivedMonth
+
+# ==============================================================================
+# Archivo Histórico
+# ==============================================================================
+# Mueve las órdenes entregadas y pagadas de meses viejos a las tablas de
+# archivo y, con --export, exporta los meses archivados a ARCHIVE_DIR como
+# .jsonl.gz (se borran de las tablas). Pensado para correr una vez al mes (cron).
+#
+#   python archive.py                     # archiva lo anterior a ARCHIVE_AFTER_MONTHS
+#   python archive.py --before 2024-01    # archiva hasta diciembre de 2023
+#   python archive.py --export            # además exporta los meses archivados
+# ==============================================================================
+
+
+def default_before(months):
+    """Primer mes que se mantiene en las tablas activas."""
+    today = date.today()
+    index = today.year * 12 + today.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archiva órdenes cerradas de meses anteriores")
+    parser.add_argument('--before', help='Archivar los meses anteriores a este (AAAA-MM)')
+    parser.add_argument('--export', action='store_true', help='Exportar los meses archivados a .jsonl.gz')
+    parser.add_argument('--batch-size', type=int, default=500, help='Órdenes por transacción')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        before = parse_month(args.before) if args.before else default_before(app.config['ARCHIVE_AFTER_MONTHS'])
+        report = {'archived': ArchiveService.archive_before(before, batch_size=args.batch_size), 'exported': {}}
+        if args.export:
+            for summary in ArchivedMonth.query.filter(ArchivedMonth.month < before).all():
+                report['exported'][f"{summary.month:%Y-%m}"] = ArchiveService.export_month(
+                    summary.month, app.config['ARCHIVE_DIR'])
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+from app import create_app
+
+# ==============================================================================
+# Punto de Entrada ASGI
+# ==============================================================================
+# Monta la app Flask (WSGI) detrás de un adaptador ASGI para servirla con
+# uvicorn. El servidor atiende conexiones, keep-alive y clientes lentos en el
+# event loop; los hilos del pool solo se ocupan mientras corre el handler.
+#
+#   uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 4
+#
+# ASGI_THREADS controla cuántas peticiones ejecuta en paralelo cada proceso.
+# Se usa a2wsgi y no asgiref.wsgi.WsgiToAsgi: este último ejecuta todas las
+# peticiones en un único hilo compartido y serializa la aplicación.
+# ==============================================================================
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError as e:  # Dependencia opcional
+    raise ImportError("El modo ASGI requiere 'a2wsgi' y 'uvicorn': pip install a2wsgi uvicorn") from e
+
+flask_app = create_app()
+app = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_THREADS'])
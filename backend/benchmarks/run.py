@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import MetaData
+
+from app import create_app, db
+from app.config.config import Config
+from app.migrations import MigrationRunner
+from datagen import ADMIN_EMAIL, DEFAULT_PASSWORD, generate, non_empty_tables
+
+# ==============================================================================
+# Micro-benchmarks de Servicios y Serialización
+# ==============================================================================
+# Siembra un dataset con datagen.py, mide los casos registrados con
+# @benchmark y guarda los resultados en benchmarks/results/<commit>.json para
+# comparar entre commits.
+#
+# Ejemplos:
+#   python -m benchmarks.run                      # SQLite temporal, 200 clientes
+#   python -m benchmarks.run --clients 2000 --rounds 20
+#   python -m benchmarks.run --compare benchmarks/results/abc1234.json
+#   BENCH_DATABASE_URI=postgresql://... python -m benchmarks.run          # base vacía
+#   BENCH_DATABASE_URI=postgresql://... python -m benchmarks.run --drop   # borra todas sus tablas
+#
+# El esquema se crea con las migraciones: se miden los índices que existen en
+# producción, no los que declaran los modelos.
+# ==============================================================================
+
+# Fecha fija: el dataset es idéntico entre ejecuciones y commits
+DATASET_END_DATE = datetime(2026, 1, 1)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+CASES = []
+
+
+def benchmark(name):
+    """Registra una función como caso de benchmark. Recibe (app, client, ctx)."""
+    def decorator(func):
+        CASES.append((name, func))
+        return func
+    return decorator
+
+
+# ==============================================================================
+# Casos
+# ==============================================================================
+@benchmark('orders.get_all_orders+serialize')
+def bench_orders_list(app, client, ctx):
+    from app.services.order_service import OrderService
+    from app.utils.fieldsets import FIELDSETS
+    # Mismo camino que GET /api/orders: selección por defecto, load_only y dump
+    fieldset = FIELDSETS['order']
+    selection = fieldset.select()
+    orders = OrderService.get_all_orders(options=fieldset.options(selection, required=('created_at',)))
+    response = [fieldset.dump(order, selection) for order in orders]
+    return len(response)
+
+
+@benchmark('reports.get_monthly_metrics')
+def bench_monthly_metrics(app, client, ctx):
+    from app.services.report_service import ReportService
+    return ReportService.get_monthly_metrics()
+
+
+@benchmark('GET /api/vehicles?plate=')
+def bench_vehicle_search(app, client, ctx):
+    return client.get('/api/vehicles?plate=AAA-01').status_code
+
+
+@benchmark('GET /api/vehicles (paginado)')
+def bench_vehicle_page(app, client, ctx):
+    return client.get('/api/vehicles?page=1&per_page=50').status_code
+
+
+@benchmark('POST /api/auth/login')
+def bench_login(app, client, ctx):
+    return client.post('/api/auth/login', json={'email': ADMIN_EMAIL, 'password': DEFAULT_PASSWORD}).status_code
+
+
+@benchmark('GET /api/marketplace/')
+def bench_marketplace(app, client, ctx):
+    return client.get('/api/marketplace/').status_code
+
+
+# ==============================================================================
+# Ejecución
+# ==============================================================================
+def measure(func, args, rounds, warmup=1):
+    """Ejecuta `func` y devuelve estadísticas en milisegundos."""
+    for _ in range(warmup):
+        func(*args)
+        db.session.remove()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.remove()  # Sin identity map entre rondas: cada una va a la BD
+    return {
+        'rounds': rounds,
+        'min_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'mean_ms': statistics.mean(timings),
+        'stdev_ms': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(current, baseline, threshold):
+    """Imprime la diferencia de medianas y devuelve los casos que empeoraron."""
+    regressions = []
+    print(f"\nComparación contra {baseline.get('revision')} (umbral {threshold:.0%}):")
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if not previous:
+            print(f"  {name:<36} (nuevo)")
+            continue
+        change = (result['median_ms'] - previous['median_ms']) / previous['median_ms']
+        flag = '  <-- REGRESIÓN' if change > threshold else ''
+        print(f"  {name:<36} {previous['median_ms']:>9.2f} -> {result['median_ms']:>9.2f} ms ({change:+.1%}){flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks del backend")
+    parser.add_argument('--clients', type=int, default=200, help='Tamaño del dataset (clientes)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--filter', help='Solo casos cuyo nombre contenga este texto')
+    parser.add_argument('--compare', help='Archivo de resultados previo para comparar')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Empeoramiento tolerado (0.10 = 10%%)')
+    parser.add_argument('--no-save', action='store_true', help='No guardar resultados')
+    parser.add_argument('--drop', action='store_true',
+                        help='Con BENCH_DATABASE_URI: borra todas las tablas de esa base antes de sembrar')
+    args = parser.parse_args(argv)
+
+    database_uri = os.getenv('BENCH_DATABASE_URI')
+    tmp_path = None
+    if not database_uri:
+        fd, tmp_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        database_uri = f"sqlite:///{tmp_path}"
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SQLALCHEMY_REPLICA_URI = None
+        METRICS_ENABLED = False
+        CACHE_ENABLED = False  # se mide el cálculo, no aciertos de la caché
+
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    results = {}
+    try:
+        with app.app_context() as ctx:
+            if args.drop and not tmp_path:
+                metadata = MetaData()
+                metadata.reflect(bind=db.engine)
+                metadata.drop_all(bind=db.engine)
+            with db.engine.connect() as conn:
+                tables = non_empty_tables(conn)
+            if tables:
+                print(f"❌ La base ya tiene datos ({', '.join(tables)}). Use una base vacía o --drop.")
+                return 1
+            MigrationRunner(db.engine).upgrade()
+            with db.engine.begin() as conn:
+                counts = generate(conn, clients=args.clients, seed=args.seed, end_date=DATASET_END_DATE,
+                                  verbose=False)
+            print(f"Dataset: {counts}")
+
+            for name, func in CASES:
+                if args.filter and args.filter not in name:
+                    continue
+                results[name] = measure(func, (app, client, ctx), args.rounds)
+                r = results[name]
+                print(f"  {name:<36} mediana {r['median_ms']:>9.2f} ms  min {r['min_ms']:>9.2f} ms")
+            db.session.remove()
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+    report = {
+        'revision': git_revision(),
+        'date': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'database': database_uri.split('://')[0],
+        'dataset': counts,
+        'results': results,
+    }
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{report['revision']}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados guardados en {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from app import create_app, db
+from app.config.config import Config
+from app.migrations import MigrationRunner
+from datagen import generate
+from loadtest import HttpTransport, parse_stages, percentile, run_load
+
+# ==============================================================================
+# Benchmark de Modos de Servicio (WSGI vs ASGI)
+# ==============================================================================
+# Levanta la misma app y base de datos con cada servidor, ejecuta la misma
+# carga de loadtest.py y compara throughput y latencias.
+#
+#   python -m benchmarks.serving --stages 16:5,16:20 --clients 500
+# ==============================================================================
+
+SERVERS = {
+    # Servidor de desarrollo de Flask con un hilo por petición (run.py)
+    'wsgi-dev': [sys.executable, '-c', "from run import app; app.run(port={port}, threaded=True)"],
+    # gunicorn con preload y workers gthread (gunicorn.conf.py)
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', '127.0.0.1:{port}',
+                 '--access-logfile', '/dev/null', 'wsgi:app'],
+    # Adaptador ASGI con pool de hilos (asgi.py)
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', '{port}', '--log-level', 'warning'],
+}
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El servidor en {base_url} no respondió")
+
+
+def prepare_database(path, clients):
+    class SeedConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+    app = create_app(SeedConfig)
+    with app.app_context():
+        MigrationRunner(db.engine).upgrade()
+        with db.engine.begin() as conn:
+            generate(conn, clients=clients, verbose=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara servidores WSGI y ASGI con la misma carga")
+    parser.add_argument('--stages', default='16:5,16:20', help='Perfil de rampa de loadtest.py')
+    parser.add_argument('--clients', type=int, default=500, help='Tamaño del dataset')
+    parser.add_argument('--modes', default=','.join(SERVERS), help='Servidores a comparar')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}", METRICS_ENABLED='false')
+    results = {}
+    try:
+        prepare_database(path, args.clients)
+        for mode in args.modes.split(','):
+            command = [part.format(port=args.port) for part in SERVERS[mode]]
+            server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            base_url = f"http://127.0.0.1:{args.port}"
+            try:
+                wait_until_ready(base_url)
+                stats, elapsed, peak = run_load(lambda: HttpTransport(base_url), parse_stages(args.stages), 0)
+            finally:
+                server.terminate()
+                server.wait()
+            latencies = sorted(v for values in stats.latencies.values() for v in values)
+            errors = sum(stats.errors.values())
+            results[mode] = (len(latencies) / elapsed, percentile(latencies, 50), percentile(latencies, 95), errors, peak)
+    finally:
+        os.remove(path)
+
+    print(f"\n{'Modo':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errores':>10}{'usuarios':>10}")
+    for mode, (rps, p50, p95, errors, peak) in results.items():
+        print(f"{mode:<12}{rps:>10.1f}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}{errors:>10}{peak:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+from app.config.config import Config
+from app.migrations import MigrationRunner
+from datagen import generate
+from loadtest import percentile
+
+# ==============================================================================
+# Benchmark de Concurrencia en SQLite (journal clásico vs WAL)
+# ==============================================================================
+# Siembra un archivo SQLite por modo y ejecuta a la vez procesos lectores
+# (OrderService.get_board) y escritores (OrderService.add_order_item), cada uno
+# con su app y su conexión, como los workers de gunicorn. Compara operaciones
+# por segundo, latencias y errores "database is locked".
+#
+#   python -m benchmarks.sqlite_concurrency --readers 4 --writers 2 --seconds 10
+# ==============================================================================
+
+MODES = {
+    # Comportamiento previo: journal DELETE, fsync completo y sin caché ni mmap extra
+    'legacy': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+               'SQLITE_CACHE_SIZE_KB': 0, 'SQLITE_MMAP_SIZE': 0},
+    # Valores por defecto de Config (WAL, synchronous=NORMAL, caché y mmap)
+    'wal': {},
+}
+
+
+def build_app(path, overrides):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        METRICS_ENABLED = False
+        CACHE_ENABLED = False
+
+    for key, value in overrides.items():
+        setattr(BenchConfig, key, value)
+    return create_app(BenchConfig)
+
+
+def worker(path, overrides, role, order_ids, service_ids, start_at, seconds, results):
+    from app.services.order_service import OrderService
+
+    if role == 'read':
+        operation = lambda: OrderService.get_board(10)
+    else:
+        operation = lambda: OrderService.add_order_item(random.choice(order_ids), random.choice(service_ids))
+
+    app = build_app(path, overrides)
+    latencies, errors = [], 0
+    with app.app_context():
+        time.sleep(max(0.0, start_at - time.time()))
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                operation()
+                latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                errors += 1
+                db.session.rollback()
+            finally:
+                db.session.remove()
+    results.put((role, latencies, errors))
+
+
+def run_mode(overrides, clients, readers, writers, seconds):
+    from app.models import Service, WorkOrder
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    app = build_app(path, overrides)
+    try:
+        with app.app_context():
+            MigrationRunner(db.engine).upgrade()
+            with db.engine.begin() as conn:
+                generate(conn, clients=clients, verbose=False)
+            order_ids = [row[0] for row in db.session.query(WorkOrder.id).limit(1000)]
+            service_ids = [row[0] for row in db.session.query(Service.id)]
+            db.session.remove()
+            db.engine.dispose()
+
+        # Todos los procesos arrancan a la vez, tras crear su app
+        queue = multiprocessing.Queue()
+        start_at = time.time() + 2
+        roles = ['read'] * readers + ['write'] * writers
+        processes = [multiprocessing.Process(target=worker, args=(path, overrides, role, order_ids, service_ids,
+                                                                  start_at, seconds, queue))
+                     for role in roles]
+        for process in processes:
+            process.start()
+        results = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def summary(role):
+        selected = [(values, errors) for r, values, errors in results if r == role]
+        latencies = sorted(v for values, _ in selected for v in values)
+        return len(latencies) / seconds, percentile(latencies, 95), sum(errors for _, errors in selected)
+    return summary('read'), summary('write')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara lecturas/escrituras concurrentes en SQLite por modo")
+    parser.add_argument('--clients', type=int, default=200, help='Tamaño del dataset')
+    parser.add_argument('--readers', type=int, default=4, help='Procesos lectores')
+    parser.add_argument('--writers', type=int, default=2, help='Procesos escritores')
+    parser.add_argument('--seconds', type=float, default=10, help='Duración por modo')
+    parser.add_argument('--modes', default=','.join(MODES), help='Modos a comparar')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in args.modes.split(','):
+        results[mode] = run_mode(MODES[mode], args.clients, args.readers, args.writers, args.seconds)
+
+    print(f"\n{'Modo':<10}{'lect/s':>10}{'p95 ms':>10}{'escr/s':>10}{'p95 ms':>10}{'errores':>10}")
+    for mode, ((rps, rp95, rerr), (wps, wp95, werr)) in results.items():
+        print(f"{mode:<10}{rps:>10.1f}{rp95 * 1000:>10.1f}{wps:>10.1f}{wp95 * 1000:>10.1f}{rerr + werr:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+import argparse
+import bisect
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import delete, func, insert, inspect, select, text
+from werkzeug.security import generate_password_hash
+
+from app import create_app, db
+from app.models import (User, Client, Vehicle, Service, WorkOrder, OrderItem, Payment, CarListing,
+                        OrderEvent, SyncTombstone, ArchivedVehicleMonth, ARCHIVE_MODELS)
+
+# ==============================================================================
+# Generador de Datos Sintéticos
+# ==============================================================================
+# Genera de forma determinista (semilla) un volumen realista de datos:
+# - Clientes recurrentes: la cantidad de visitas por vehículo sigue una
+#   distribución geométrica y un 5% de clientes son flotas con muchos autos.
+# - Estacionalidad: más órdenes antes de vacaciones y a fin de año.
+# - Mezcla de servicios sesgada (Zipf): pocos servicios concentran la demanda.
+# - Pagos parciales, en cuotas o pendientes en las órdenes cerradas.
+#
+# Inserta en lotes con SQLAlchemy Core, respetando el orden de las FKs.
+# También es el fixture compartido de benchmarks/ y loadtest.py.
+#
+# Ejemplos:
+#   python datagen.py --clients 1000
+#   python datagen.py --clients 135000 --batch-size 20000   # ~5M filas
+#   python datagen.py --clients 5000 --reset --seed 7
+# ==============================================================================
+
+DEFAULT_PASSWORD = 'taller123'
+ADMIN_EMAIL = 'admin@taller.test'
+
+SERVICE_CATALOG = [
+    ('Cambio de Aceite', 120.0), ('Rotación de Llantas', 60.0), ('Alineación y Balanceo', 90.0),
+    ('Cambio de Pastillas de Freno', 300.0), ('Diagnóstico Computarizado', 150.0), ('Afinación Completa', 450.5),
+    ('Cambio de Batería', 520.0), ('Cambio de Filtro de Aire', 80.0), ('Revisión de Suspensión', 200.0),
+    ('Cambio de Amortiguadores', 900.0), ('Carga de Aire Acondicionado', 250.0), ('Cambio de Embrague', 1500.0),
+    ('Reparación de Transmisión', 2800.0), ('Cambio de Correa de Distribución', 1100.0), ('Lavado de Motor', 70.0),
+    ('Pintura de Pieza', 600.0), ('Reparación de Chapa', 750.0), ('Cambio de Bujías', 180.0),
+    ('Revisión Eléctrica', 220.0), ('Cambio de Radiador', 980.0),
+]
+BRANDS = [
+    ('Toyota', ['Corolla', 'Hilux', 'Yaris', 'RAV4']), ('Nissan', ['Sentra', 'Frontier', 'Versa']),
+    ('Chevrolet', ['Spark', 'Onix', 'Tracker']), ('Hyundai', ['Accent', 'Tucson', 'Elantra']),
+    ('Kia', ['Rio', 'Sportage', 'Picanto']), ('Suzuki', ['Swift', 'Vitara']), ('Ford', ['Ranger', 'Fiesta']),
+]
+FIRST_NAMES = ['Juan', 'María', 'José', 'Ana', 'Luis', 'Carmen', 'Carlos', 'Rosa', 'Jorge', 'Lucía',
+               'Pedro', 'Elena', 'Miguel', 'Sofía', 'Diego', 'Valeria', 'Andrés', 'Paula']
+LAST_NAMES = ['Pérez', 'Gómez', 'Rodríguez', 'Fernández', 'López', 'Martínez', 'Sánchez', 'Romero',
+              'Torres', 'Flores', 'Rojas', 'Vargas', 'Castro', 'Mendoza', 'Quispe', 'Mamani']
+PAYMENT_METHODS = ['efectivo', 'tarjeta', 'transferencia']
+# Peso relativo de órdenes por mes (enero..diciembre)
+SEASONALITY = [0.8, 0.75, 0.9, 1.0, 1.0, 1.1, 1.3, 1.2, 1.0, 1.0, 1.1, 1.4]
+
+# Orden de inserción (padres antes que hijos) y de borrado (inverso)
+TABLES = [User, Service, Client, Vehicle, WorkOrder, OrderItem, Payment, CarListing]
+# Tablas que la app llena a partir de las anteriores (eventos, sync, archivo):
+# no se generan, pero se vacían con --reset para no dejar filas huérfanas
+DERIVED_TABLES = [OrderEvent, SyncTombstone, *ARCHIVE_MODELS, ArchivedVehicleMonth]
+
+
+def plate_for(vehicle_id):
+    """Placa única y legible derivada del ID (ej: 'BAC-042')."""
+    number, letters = vehicle_id % 1000, vehicle_id // 1000
+    chars = ''
+    for _ in range(3):
+        letters, rest = divmod(letters, 26)
+        chars = chr(65 + rest) + chars
+    return f"{chars}-{number:03d}"
+
+
+class BatchWriter:
+    """
+    Acumula filas por tabla y las inserta en lotes. Al llenarse cualquier
+    buffer se vacían todos en orden de FKs, para que un hijo nunca llegue
+    antes que su padre.
+    """
+
+    def __init__(self, connection, batch_size, verbose=True):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.buffers = {model: [] for model in TABLES}
+        self.counts = {model.__tablename__: 0 for model in TABLES}
+        self.started = time.perf_counter()
+
+    def add(self, model, row):
+        buffer = self.buffers[model]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model in TABLES:
+            rows = self.buffers[model]
+            if rows:
+                self.connection.execute(insert(model.__table__), rows)
+                self.counts[model.__tablename__] += len(rows)
+                self.buffers[model] = []
+        if self.verbose:
+            total = sum(self.counts.values())
+            elapsed = time.perf_counter() - self.started
+            print(f"  {total:>10,} filas  ({total / elapsed:,.0f} filas/s)", end='\r', flush=True)
+
+
+def month_weights(start, months):
+    """Lista de (inicio_de_mes, peso) para los `months` meses desde `start`."""
+    result = []
+    year, month = start.year, start.month
+    for _ in range(months):
+        result.append((datetime(year, month, 1), SEASONALITY[month - 1]))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return result
+
+
+def generate(connection, clients=1000, seed=42, months=24, end_date=None, mechanics=12,
+             batch_size=10000, verbose=True):
+    """
+    Genera e inserta el dataset. Las tablas deben estar vacías.
+
+    Args:
+        connection: Conexión de SQLAlchemy (en una transacción).
+        clients (int): Cantidad de clientes; el resto de tablas escala con él.
+        seed (int): Semilla; mismos argumentos producen los mismos datos.
+        months (int): Meses de historial hacia atrás desde `end_date`.
+        end_date (datetime, optional): Fin del historial (por defecto, inicio del mes actual).
+        mechanics (int): Cantidad de mecánicos.
+        batch_size (int): Filas por INSERT.
+
+    Returns:
+        dict: Filas insertadas por tabla.
+    """
+    rng = random.Random(seed)
+    if end_date is None:
+        today = datetime.utcnow()
+        end_date = datetime(today.year, today.month, 1)
+    start_month = end_date - timedelta(days=31 * months)
+    calendar = month_weights(datetime(start_month.year, start_month.month, 1), months)
+    month_starts, weights = zip(*calendar)
+    cumulative_months = list(accumulate(weights))
+
+    writer = BatchWriter(connection, batch_size, verbose)
+    password_hash = generate_password_hash(DEFAULT_PASSWORD)
+
+    # --- Usuarios y catálogo ------------------------------------------------
+    writer.add(User, {'id': 1, 'username': 'admin', 'email': ADMIN_EMAIL, 'password_hash': password_hash,
+                      'role': 'admin', 'created_at': month_starts[0]})
+    writer.add(User, {'id': 2, 'username': 'recepcion', 'email': 'recepcion@taller.test',
+                      'password_hash': password_hash, 'role': 'recepcion', 'created_at': month_starts[0]})
+    mechanic_ids = []
+    for i in range(mechanics):
+        user_id = 3 + i
+        mechanic_ids.append(user_id)
+        writer.add(User, {'id': user_id, 'username': f"mecanico{i + 1}", 'email': f"mecanico{i + 1}@taller.test",
+                          'password_hash': password_hash, 'role': 'mecanico', 'created_at': month_starts[0]})
+
+    service_ids, service_prices = [], []
+    for i, (name, price) in enumerate(SERVICE_CATALOG, start=1):
+        service_ids.append(i)
+        service_prices.append(price)
+        writer.add(Service, {'id': i, 'name': name, 'description': f"Servicio de {name.lower()}",
+                             'base_price': price})
+    # Zipf: el servicio k tiene peso 1/k^1.1
+    cumulative_services = list(accumulate([1.0 / (k ** 1.1) for k in range(1, len(service_ids) + 1)]))
+
+    # --- Clientes, vehículos, órdenes, items y pagos ---------------------------
+    vehicle_id = order_id = item_id = payment_id = 0
+    horizon = end_date - timedelta(days=14)
+    for client_id in range(1, clients + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        is_fleet = rng.random() < 0.05
+        client_since = month_starts[rng.randrange(len(month_starts))]
+        writer.add(Client, {
+            'id': client_id, 'first_name': first, 'last_name': last,
+            'email': f"cliente{client_id}@correo.test", 'phone': f"7{rng.randint(1000000, 9999999)}",
+            'address': f"Calle {rng.randint(1, 200)} #{rng.randint(1, 999)}", 'created_at': client_since,
+        })
+
+        vehicle_count = rng.randint(5, 20) if is_fleet else rng.choices([1, 2, 3, 4], [60, 28, 9, 3])[0]
+        for _ in range(vehicle_count):
+            vehicle_id += 1
+            brand, models = rng.choice(BRANDS)
+            writer.add(Vehicle, {
+                'id': vehicle_id, 'client_id': client_id, 'plate': plate_for(vehicle_id), 'brand': brand,
+                'model': rng.choice(models), 'year': rng.randint(1998, end_date.year),
+                'vin': f"VIN{vehicle_id:014d}" if rng.random() < 0.5 else None,
+            })
+
+            # Visitas por vehículo: geométrica (media ~3; flotas ~6)
+            p = 0.16 if is_fleet else 0.3
+            visits = 1 + int(math.log(1.0 - rng.random()) / math.log(1.0 - p))
+            for _ in range(visits):
+                order_id += 1
+                month = month_starts[bisect.bisect_left(cumulative_months, rng.random() * cumulative_months[-1])]
+                created = month + timedelta(days=rng.randint(0, 27), hours=rng.randint(8, 18),
+                                            minutes=rng.randint(0, 59))
+
+                total = 0.0
+                for _ in range(rng.choices([1, 2, 3, 4], [50, 30, 15, 5])[0]):
+                    item_id += 1
+                    idx = bisect.bisect_left(cumulative_services, rng.random() * cumulative_services[-1])
+                    total += service_prices[idx]
+                    writer.add(OrderItem, {'id': item_id, 'work_order_id': order_id,
+                                           'service_id': service_ids[idx], 'price_at_moment': service_prices[idx]})
+
+                if created < horizon:
+                    status = rng.choices(['entregado', 'finalizado', 'en_progreso'], [80, 17, 3])[0]
+                else:
+                    status = rng.choices(['pendiente', 'en_progreso', 'finalizado'], [40, 40, 20])[0]
+                user_id = rng.choice(mechanic_ids)
+
+                # Pagos: completos, en cuotas, parciales o ninguno
+                if status in ('finalizado', 'entregado'):
+                    kind = rng.choices(['full', 'installments', 'partial', 'none'], [70, 12, 10, 8])[0]
+                else:
+                    kind = rng.choices(['partial', 'none'], [25, 75])[0]
+                amounts = []
+                if kind == 'full':
+                    amounts = [total]
+                elif kind == 'installments':
+                    first_part = round(total * rng.uniform(0.3, 0.7), 2)
+                    amounts = [first_part, total - first_part]
+                elif kind == 'partial':
+                    amounts = [round(total * rng.uniform(0.2, 0.6), 2)]
+                paid = 0.0
+                for n, amount in enumerate(amounts):
+                    payment_id += 1
+                    payment_method = rng.choices(PAYMENT_METHODS, [45, 40, 15])[0]
+                    payment_status = 'pagado' if rng.random() < 0.97 else 'pendiente'
+                    if payment_status == 'pagado':
+                        paid += round(amount, 2)
+                    writer.add(Payment, {
+                        'id': payment_id, 'work_order_id': order_id, 'amount': round(amount, 2),
+                        'payment_method': payment_method,
+                        'status': payment_status,
+                        'created_at': created + timedelta(days=n * rng.randint(7, 30), hours=rng.randint(0, 6)),
+                    })
+
+                writer.add(WorkOrder, {'id': order_id, 'vehicle_id': vehicle_id,
+                                       'user_id': user_id, 'status': status,
+                                       'total': round(total, 2), 'amount_paid': round(paid, 2),
+                                       'balance': round(total - paid, 2), 'created_at': created})
+
+    # --- Marketplace ---------------------------------------------------------
+    for listing_id in range(1, max(clients // 10, 1) + 1):
+        brand, models = rng.choice(BRANDS)
+        year = rng.randint(2005, end_date.year)
+        writer.add(CarListing, {
+            'id': listing_id, 'user_id': rng.choice([1, 2] + mechanic_ids),
+            'title': f"{brand} {year} en buen estado", 'brand': brand, 'model': rng.choice(models),
+            'year': year, 'price': float(rng.randint(30, 400) * 100), 'description': 'Único dueño',
+            'image_url': '', 'status': rng.choices(['available', 'sold'], [70, 30])[0],
+            'created_at': end_date - timedelta(days=rng.randint(0, 120)),
+        })
+
+    writer.flush()
+    if verbose:
+        print()
+    _sync_sequences(connection)
+    return writer.counts
+
+
+def reset(connection):
+    """Vacía las tablas del dataset (hijos primero) y las derivadas."""
+    for model in DERIVED_TABLES + list(reversed(TABLES)):
+        connection.execute(delete(model.__table__))
+
+
+def non_empty_tables(connection):
+    """Tablas con filas: los IDs explícitos del dataset chocarían con ellas (las que aún no existen no cuentan)."""
+    existing = set(inspect(connection).get_table_names())
+    return [model.__tablename__ for model in TABLES + DERIVED_TABLES
+            if model.__tablename__ in existing
+            and connection.execute(select(func.count()).select_from(model.__table__)).scalar()]
+
+
+def _sync_sequences(connection):
+    """En Postgres, los IDs explícitos no avanzan las secuencias: se ajustan."""
+    if connection.dialect.name != 'postgresql':
+        return
+    for model in TABLES:
+        table = model.__tablename__
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos realistas")
+    parser.add_argument('--clients', type=int, default=1000, help='Clientes (135000 ≈ 5M filas)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--months', type=int, default=24, help='Meses de historial')
+    parser.add_argument('--end-date', help='Fin del historial AAAA-MM-DD (fíjelo para reproducibilidad total)')
+    parser.add_argument('--mechanics', type=int, default=12)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--reset', action='store_true', help='Vacía las tablas antes de generar')
+    args = parser.parse_args(argv)
+
+    end_date = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None
+    app = create_app()
+    with app.app_context():
+        print(f"Base de datos: {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}")
+        started = time.perf_counter()
+        with db.engine.begin() as conn:
+            if args.reset:
+                reset(conn)
+            elif tables := non_empty_tables(conn):
+                print(f"❌ Las tablas ya tienen datos ({', '.join(tables)}). Use --reset para vaciarlas.")
+                return 1
+            counts = generate(conn, clients=args.clients, seed=args.seed, months=args.months,
+                              end_date=end_date, mechanics=args.mechanics, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"✅ {sum(counts.values()):,} filas en {elapsed:.1f}s")
+        for table, count in counts.items():
+            print(f"   {table:<14} {count:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+
+# ==============================================================================
+# Configuración de gunicorn (Producción)
+# ==============================================================================
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# - preload_app: create_app(), los blueprints y el mapeo de modelos se cargan
+#   una sola vez en el proceso maestro antes del fork (copy-on-write).
+# - Workers e hilos se derivan de la cantidad de CPUs (WEB_CONCURRENCY y
+#   GUNICORN_THREADS los reemplazan).
+# - max_requests recicla workers periódicamente (con jitter, para que no se
+#   reinicien todos a la vez).
+# - Tras el fork, cada worker descarta el pool de conexiones heredado del
+#   maestro; al salir, cierra el suyo.
+# - Al arrancar avisa si varios workers usan la caché en memoria (las
+#   invalidaciones no llegan a los demás procesos: usar CACHE_BACKEND=redis).
+# ==============================================================================
+
+cpus = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", cpus * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+preload_app = True
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def _dispose_engines(close):
+    """Descarta los pools de conexiones de todos los engines (principal, binds y réplica)."""
+    from app import db
+    from wsgi import app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+    replica = app.extensions.get('replica')
+    if replica is not None:
+        replica.dispose(close=close)
+
+
+def when_ready(server):
+    from app.utils.cache import has_shared_invalidation
+    from wsgi import app
+
+    if not has_shared_invalidation(app, workers):
+        server.log.warning("%s workers con CACHE_BACKEND=memory: cada proceso invalida solo su caché y "
+                           "los demás sirven datos viejos hasta el TTL. Use CACHE_BACKEND=redis.", workers)
+
+
+def post_fork(server, worker):
+    # Las conexiones abiertas en el maestro no deben compartirse entre procesos:
+    # close=False las abandona sin cerrarlas (siguen siendo del maestro).
+    _dispose_engines(close=False)
+    server.log.info("Worker %s listo (pool de conexiones reiniciado)", worker.pid)
+
+
+def worker_exit(server, worker):
+    # Apagado ordenado: devuelve las conexiones a la base de datos.
+    _dispose_engines(close=True)
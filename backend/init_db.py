@@ -1,12 +1,11 @@
-import os
 from app import create_app, db
-# Importamos todos los modelos para asegurarnos de que SQLAlchemy los reconozca
-# antes de llamar a create_all().
-from app.models import User, Client, Vehicle, Service, WorkOrder, OrderItem, Payment
+from app.migrations import MigrationRunner
 
 def init_db():
     """
-    Inicializa la base de datos creando todas las tablas definidas en los modelos.
+    Inicializa la base de datos aplicando todas las migraciones versionadas
+    (ver app/migrations/versions). La migración 0001 crea las tablas de los
+    modelos; las siguientes agregan columnas e índices.
     Se conecta a la base de datos configurada en .env (Supabase).
     """
     # Creamos la instancia de la aplicación Flask
@@ -19,9 +18,9 @@ def init_db():
         print(f"Conectando a la base de datos: {db_uri.split('@')[-1]}") # Solo mostramos el host por seguridad
 
         try:
-            # Crea todas las tablas definidas en los modelos que hereden de db.Model
-            db.create_all()
-            print("Tablas creadas exitosamente en Supabase.")
+            runner = MigrationRunner(db.engine, lock_timeout=app.config.get('MIGRATION_LOCK_TIMEOUT'))
+            applied = runner.upgrade()
+            print(f"Base de datos lista ({len(applied)} migraciones aplicadas).")
         except Exception as e:
             print(f"Error al crear las tablas: {e}")
 
@@ -0,0 +1,387 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+# ==============================================================================
+# Generador de Carga
+# ==============================================================================
+# Ejecuta muchos usuarios virtuales concurrentes (hilos) que repiten los flujos
+# de los scripts verify_*.py (recepción, taller, caja y administración) contra
+# un servidor local o contra la app en el mismo proceso, y reporta throughput y
+# percentiles de latencia por endpoint.
+#
+# Ejemplos:
+#   python loadtest.py --users 20 --duration 60
+#   python loadtest.py --stages 10:30,50:60,0:10 --base-url http://127.0.0.1:8000
+#   python loadtest.py --in-process --users 8 --duration 20 --json resultado.json
+#   python loadtest.py --in-process --seed-clients 5000 --users 8   # con datos de datagen.py
+#
+# --in-process usa un SQLite temporal (nunca la base de .env): los usuarios
+# virtuales crean clientes, órdenes y pagos. Otra base solo con --database-uri.
+# ==============================================================================
+
+DEFAULT_BASE_URL = "http://127.0.0.1:5000"
+
+
+# ==============================================================================
+# Transportes
+# ==============================================================================
+class HttpTransport:
+    """Envía las peticiones por HTTP con una sesión de `requests` por usuario."""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, json_body=None, headers=None):
+        resp = self.session.request(method, f"{self.base_url}{path}", json=json_body, headers=headers, timeout=30)
+        try:
+            data = resp.json()
+        except ValueError:
+            data = None
+        return resp.status_code, data
+
+
+class InProcessTransport:
+    """Usa el cliente de pruebas de Flask: mide la app sin red ni servidor."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, headers=None):
+        resp = self.client.open(path, method=method, json=json_body, headers=headers)
+        return resp.status_code, resp.get_json(silent=True)
+
+
+# ==============================================================================
+# Estadísticas
+# ==============================================================================
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class Stats:
+    """Latencias y errores por endpoint. Cada usuario virtual tiene la suya."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, elapsed, ok):
+        self.latencies[name].append(elapsed)
+        if not ok:
+            self.errors[name] += 1
+
+    def merge(self, other):
+        for name, values in other.latencies.items():
+            self.latencies[name].extend(values)
+        for name, count in other.errors.items():
+            self.errors[name] += count
+
+    def summary(self, elapsed_total):
+        rows = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows.append({
+                'endpoint': name,
+                'requests': len(values),
+                'errors': self.errors.get(name, 0),
+                'rps': len(values) / elapsed_total if elapsed_total else 0.0,
+                'p50_ms': percentile(values, 50) * 1000,
+                'p90_ms': percentile(values, 90) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000,
+            })
+        return rows
+
+
+# ==============================================================================
+# Flujos (basados en verify_*.py)
+# ==============================================================================
+class VirtualUser(threading.Thread):
+    """
+    Usuario virtual: repite flujos de trabajo elegidos al azar según su peso
+    hasta que se le pide detenerse.
+    """
+
+    def __init__(self, transport, context, think_time, seed):
+        super().__init__(daemon=True)
+        self.transport = transport
+        self.context = context
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.stats = Stats()
+        self.stop_event = threading.Event()
+        self.vehicle_ids = []
+        self.order_ids = []
+        self.flows = [
+            (self.flow_reception, 2),
+            (self.flow_workshop, 4),
+            (self.flow_cashier, 2),
+            (self.flow_browse, 3),
+            (self.flow_admin, 1),
+        ]
+
+    def call(self, name, method, path, json_body=None, expected=(200, 201)):
+        start = time.perf_counter()
+        try:
+            status, data = self.transport.request(method, path, json_body, self.context['headers'])
+            ok = status in expected
+        except Exception:
+            data, ok = None, False
+        self.stats.record(name, time.perf_counter() - start, ok)
+        return data if ok else None
+
+    def run(self):
+        flows, weights = zip(*self.flows)
+        while not self.stop_event.is_set():
+            self.random.choices(flows, weights)[0]()
+            if self.think_time:
+                self.stop_event.wait(self.random.uniform(0, self.think_time))
+
+    def flow_reception(self):
+        """verify_clients.py: alta de cliente y vehículo."""
+        suffix = f"{self.ident}-{self.random.randint(0, 10 ** 9)}"
+        data = self.call('POST /api/clients', 'POST', '/api/clients', {
+            'first_name': 'Carga', 'last_name': 'Test', 'email': f"carga{suffix}@test.com"
+        })
+        if not data:
+            return
+        client_id = data['client']['id']
+        data = self.call('POST /api/clients/{id}/vehicles', 'POST', f"/api/clients/{client_id}/vehicles", {
+            'plate': f"LT-{suffix}", 'brand': 'Nissan', 'model': 'Sentra', 'year': 2022
+        })
+        if data:
+            self.vehicle_ids.append(data['vehicle']['id'])
+        self.call('GET /api/clients/{id}/vehicles', 'GET', f"/api/clients/{client_id}/vehicles")
+
+    def flow_workshop(self):
+        """verify_orders.py: orden, item, detalle y cambio de estado."""
+        if not self.vehicle_ids:
+            return self.flow_reception()
+        data = self.call('POST /api/orders', 'POST', '/api/orders',
+                         {'vehicle_id': self.random.choice(self.vehicle_ids)})
+        if not data:
+            return
+        order_id = data['order']['id']
+        self.order_ids.append(order_id)
+        for _ in range(self.random.randint(1, 3)):
+            self.call('POST /api/orders/{id}/items', 'POST', f"/api/orders/{order_id}/items",
+                      {'service_id': self.random.choice(self.context['service_ids'])})
+        self.call('GET /api/orders/{id}', 'GET', f"/api/orders/{order_id}")
+        self.call('PUT /api/orders/{id}/status', 'PUT', f"/api/orders/{order_id}/status",
+                  {'status': self.random.choice(['en_progreso', 'finalizado'])})
+
+    def flow_cashier(self):
+        """verify_payments.py: pago, historial y resumen de ingresos."""
+        if not self.order_ids:
+            return self.flow_workshop()
+        self.call('POST /api/payments/', 'POST', '/api/payments/', {
+            'work_order_id': self.random.choice(self.order_ids),
+            'amount': round(self.random.uniform(50, 500), 2),
+            'payment_method': self.random.choice(['efectivo', 'tarjeta', 'transferencia']),
+        })
+        self.call('GET /api/payments/history', 'GET', '/api/payments/history?limit=50')
+        self.call('GET /api/payments/revenue', 'GET', '/api/payments/revenue')
+
+    def flow_browse(self):
+        """Pantallas de listado: órdenes, vehículos, servicios y marketplace."""
+        self.call('GET /api/orders', 'GET', '/api/orders')
+        self.call('GET /api/vehicles', 'GET', '/api/vehicles?page=1&per_page=20')
+        self.call('GET /api/services', 'GET', '/api/services')
+        self.call('GET /api/marketplace/', 'GET', '/api/marketplace/')
+
+    def flow_admin(self):
+        """verify_reports.py: dashboard de administración."""
+        self.call('GET /api/reports/dashboard', 'GET', '/api/reports/dashboard')
+
+
+# ==============================================================================
+# Perfiles de rampa
+# ==============================================================================
+def parse_stages(spec):
+    """
+    Convierte "10:30,50:60,0:10" en [(10, 30.0), (50, 60.0), (0, 10.0)]:
+    en cada etapa se llega linealmente a N usuarios en S segundos.
+    """
+    stages = []
+    for part in spec.split(','):
+        users, seconds = part.split(':')
+        stages.append((int(users), float(seconds)))
+    return stages
+
+
+def target_users(stages, elapsed):
+    """Usuarios objetivo en el instante `elapsed` (interpolación lineal)."""
+    previous = 0
+    for users, seconds in stages:
+        if elapsed < seconds:
+            return int(round(previous + (users - previous) * (elapsed / seconds)))
+        elapsed -= seconds
+        previous = users
+    return None  # Fin de la prueba
+
+
+def setup_context(transport):
+    """Crea un administrador y un catálogo de servicios para la prueba."""
+    suffix = random.randint(10 ** 6, 10 ** 7)
+    admin = {'username': f"carga{suffix}", 'email': f"carga{suffix}@example.com",
+             'password': 'securepass', 'role': 'admin'}
+    transport.request('POST', '/api/auth/register', admin)
+    status, data = transport.request('POST', '/api/auth/login',
+                                     {'email': admin['email'], 'password': admin['password']})
+    if status != 200:
+        raise SystemExit(f"❌ No se pudo iniciar sesión como admin ({status}): {data}")
+    headers = {'Authorization': f"Bearer {data['access_token']}"}
+
+    service_ids = []
+    for name, price in [('Cambio de Aceite', 120), ('Afinación', 450.5), ('Frenos', 300), ('Alineación', 90)]:
+        status, data = transport.request('POST', '/api/services',
+                                         {'name': name, 'base_price': price}, headers)
+        if status == 201:
+            service_ids.append(data['service']['id'])
+    return {'headers': headers, 'service_ids': service_ids}
+
+
+def run_load(make_transport, stages, think_time, seed=0):
+    """
+    Ejecuta la prueba de carga.
+
+    Returns:
+        tuple(Stats, float, int): Estadísticas combinadas, duración y pico de usuarios.
+    """
+    context = setup_context(make_transport())
+    active, finished = [], []
+    peak = 0
+    start = time.perf_counter()
+
+    while True:
+        target = target_users(stages, time.perf_counter() - start)
+        if target is None:
+            break
+        while len(active) < target:
+            user = VirtualUser(make_transport(), context, think_time, seed + len(active) + len(finished))
+            user.start()
+            active.append(user)
+        while len(active) > target:
+            user = active.pop()
+            user.stop_event.set()
+            finished.append(user)
+        peak = max(peak, len(active))
+        time.sleep(0.1)
+
+    for user in active:
+        user.stop_event.set()
+    finished.extend(active)
+    for user in finished:
+        user.join()
+
+    elapsed = time.perf_counter() - start
+    stats = Stats()
+    for user in finished:
+        stats.merge(user.stats)
+    return stats, elapsed, peak
+
+
+def print_report(rows, elapsed, peak):
+    total = sum(r['requests'] for r in rows)
+    errors = sum(r['errors'] for r in rows)
+    print(f"\nDuración: {elapsed:.1f}s | Usuarios pico: {peak} | Peticiones: {total} "
+          f"({total / elapsed:.1f} req/s) | Errores: {errors}\n")
+    header = f"{'Endpoint':<36}{'req':>7}{'err':>6}{'req/s':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<36}{r['requests']:>7}{r['errors']:>6}{r['rps']:>8.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p90_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    print("\n(latencias en ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del backend")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='Servidor a probar')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Usa la app en el mismo proceso (SQLite temporal; aplica migraciones)')
+    parser.add_argument('--database-uri',
+                        help='Con --in-process: base de datos a usar en lugar del SQLite temporal (recibe escrituras)')
+    parser.add_argument('--seed-clients', type=int, default=0,
+                        help='Con --in-process: genera este volumen de datos con datagen.py (tablas vacías)')
+    parser.add_argument('--users', type=int, default=10, help='Usuarios concurrentes (sin --stages)')
+    parser.add_argument('--ramp-up', type=float, default=5.0, help='Segundos para llegar a --users')
+    parser.add_argument('--duration', type=float, default=30.0, help='Segundos a carga completa')
+    parser.add_argument('--stages', help='Perfil de rampa "usuarios:segundos,..." (reemplaza --users)')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Pausa máxima entre flujos (s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Guarda el reporte en este archivo')
+    args = parser.parse_args(argv)
+
+    if args.stages:
+        stages = parse_stages(args.stages)
+    else:
+        stages = [(args.users, args.ramp_up), (args.users, args.duration)]
+
+    tmp_path = None
+    if args.in_process:
+        from app import create_app, db
+        from app.config.config import Config
+        from app.migrations import MigrationRunner
+
+        database_uri = args.database_uri
+        if not database_uri:
+            fd, tmp_path = tempfile.mkstemp(suffix='.db')
+            os.close(fd)
+            database_uri = f"sqlite:///{tmp_path}"
+
+        class LoadConfig(Config):
+            SQLALCHEMY_DATABASE_URI = database_uri
+            SQLALCHEMY_REPLICA_URI = None  # la réplica de .env no es copia de esta base
+
+        app = create_app(LoadConfig)
+        print(f"Base de datos: {database_uri.split('@')[-1]}")
+        with app.app_context():
+            MigrationRunner(db.engine).upgrade()
+            if args.seed_clients:
+                from datagen import generate, non_empty_tables
+                with db.engine.begin() as conn:
+                    if tables := non_empty_tables(conn):
+                        print(f"❌ Las tablas ya tienen datos ({', '.join(tables)}): no se siembra sobre ellas.")
+                        return 1
+                    generate(conn, clients=args.seed_clients, seed=args.seed, verbose=False)
+        make_transport = lambda: InProcessTransport(app)
+    else:
+        make_transport = lambda: HttpTransport(args.base_url)
+
+    try:
+        stats, elapsed, peak = run_load(make_transport, stages, args.think_time, args.seed)
+    finally:
+        if tmp_path:
+            with app.app_context():
+                db.engine.dispose()
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(tmp_path + suffix):
+                    os.remove(tmp_path + suffix)
+    rows = stats.summary(elapsed)
+    print_report(rows, elapsed, peak)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'duration_s': elapsed, 'peak_users': peak, 'stages': stages, 'endpoints': rows}, f, indent=2)
+        print(f"Reporte guardado en {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
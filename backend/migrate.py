@@ -0,0 +1,107 @@
+import argparse
+import os
+import re
+import sys
+
+from app import create_app, db
+from app.migrations import MigrationRunner, MigrationError
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'migrations', 'versions')
+
+TEMPLATE = '''"""
+{description}
+"""
+
+revision = '{revision}'
+description = '{description}'
+# Cambiar a False para operaciones que no pueden ir en una transacción
+# (ej: op.create_index en Postgres usa CREATE INDEX CONCURRENTLY).
+transactional = True
+
+
+def upgrade(op):
+    pass
+
+
+def downgrade(op):
+    pass
+'''
+
+
+def cmd_new(runner, args):
+    """Crea un archivo de migración vacío con la siguiente revisión."""
+    existing = [m.revision for m in runner.discover()]
+    revision = f"{(int(existing[-1]) + 1) if existing else 1:04d}"
+    slug = re.sub(r'[^a-z0-9]+', '_', args.description.lower()).strip('_')[:40]
+    path = os.path.join(VERSIONS_DIR, f"v{revision}_{slug}.py")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE.format(revision=revision, description=args.description))
+    print(f"Migración creada: {path}")
+
+
+def cmd_status(runner, args):
+    for migration, applied_at in runner.status():
+        mark = f"aplicada {applied_at:%Y-%m-%d %H:%M}" if applied_at else "PENDIENTE"
+        print(f"{migration.revision}  {mark:<24}  {migration.description}")
+
+
+def cmd_upgrade(runner, args):
+    applied = runner.upgrade(args.target)
+    for migration in applied:
+        print(f"✅ {migration.revision} {migration.description}")
+    if not applied:
+        print("El esquema ya está actualizado.")
+
+
+def cmd_downgrade(runner, args):
+    for migration in runner.downgrade(args.target):
+        print(f"↩️  {migration.revision} {migration.description}")
+
+
+def cmd_stamp(runner, args):
+    runner.stamp(args.target)
+    print(f"Historial marcado hasta {args.target}.")
+
+
+def main(argv=None):
+    """
+    CLI de migraciones. Usa la base de datos configurada en .env.
+
+    Ejemplos:
+        python migrate.py status
+        python migrate.py upgrade
+        python migrate.py downgrade 0002
+        python migrate.py new "indices de ordenes"
+    """
+    parser = argparse.ArgumentParser(description="Migraciones de esquema versionadas")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('status', help='Muestra migraciones aplicadas y pendientes')
+    p = sub.add_parser('upgrade', help='Aplica migraciones pendientes')
+    p.add_argument('target', nargs='?', help='Revisión final (por defecto, la última)')
+    p = sub.add_parser('downgrade', help='Revierte migraciones posteriores a target')
+    p.add_argument('target')
+    p = sub.add_parser('stamp', help='Marca migraciones como aplicadas sin ejecutarlas')
+    p.add_argument('target')
+    p = sub.add_parser('new', help='Crea un archivo de migración')
+    p.add_argument('description')
+
+    args = parser.parse_args(argv)
+    commands = {
+        'status': cmd_status, 'upgrade': cmd_upgrade, 'downgrade': cmd_downgrade,
+        'stamp': cmd_stamp, 'new': cmd_new,
+    }
+
+    app = create_app()
+    with app.app_context():
+        runner = MigrationRunner(db.engine, lock_timeout=app.config.get('MIGRATION_LOCK_TIMEOUT'))
+        try:
+            commands[args.command](runner, args)
+        except MigrationError as e:
+            print(f"❌ {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
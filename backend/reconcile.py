@@ -0,0 +1,48 @@
+import argparse
+import json
+import sys
+
+from app import create_app
+from app.services.payment_service import PaymentService
+
+# ==============================================================================
+# Conciliación de Saldos
+# ==============================================================================
+# Verifica que work_orders.amount_paid / balance coincidan con los pagos
+# registrados y, con --repair, corrige los descuadres. Pensado para correr
+# periódicamente (cron); sale con código 1 si encuentra descuadres sin reparar.
+#
+#   python reconcile.py               # solo verifica
+#   python reconcile.py --repair      # verifica y corrige
+# ==============================================================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concilia saldos de órdenes contra pagos")
+    parser.add_argument('--repair', action='store_true', help='Corrige los descuadres encontrados')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Órdenes por lote')
+    parser.add_argument('--json', action='store_true', help='Imprime el reporte completo en JSON')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        report = PaymentService.reconcile(repair=args.repair, batch_size=args.batch_size)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Órdenes revisadas: {report['checked']:,}")
+        print(f"Con descuadre:     {report['drifted']:,}")
+        if args.repair:
+            print(f"Corregidas:        {report['repaired']:,}")
+        for sample in report['samples'][:20]:
+            print(f"  #{sample['work_order_id']}: pagado {sample['amount_paid']} "
+                  f"(esperado {sample['expected_amount_paid']}), saldo {sample['balance']} "
+                  f"(esperado {sample['expected_balance']})")
+
+    unresolved = report['drifted'] - report['repaired']
+    sys.exit(1 if unresolved else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
+import os
 from app import create_app
 
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Servidor de desarrollo. En producción: gunicorn -c gunicorn.conf.py wsgi:app (o python serve.py)
+    app.run(debug=os.getenv("FLASK_DEBUG", "true").lower() == "true", threaded=True)
@@ -0,0 +1,27 @@
+import multiprocessing
+import os
+
+from wsgi import app
+
+# ==============================================================================
+# Servidor de Producción para Windows (waitress)
+# ==============================================================================
+# gunicorn no funciona en Windows; waitress es un servidor WSGI de un proceso
+# con varios hilos. Los hilos se derivan de las CPUs (WAITRESS_THREADS lo
+# reemplaza).
+#
+#   python serve.py
+# ==============================================================================
+
+def main():
+    from waitress import serve
+
+    threads = int(os.getenv("WAITRESS_THREADS", multiprocessing.cpu_count() * 4))
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", 5000))
+    print(f"Sirviendo en http://{host}:{port} con {threads} hilos (waitress)")
+    serve(app, host=host, port=port, threads=threads, channel_timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# ==============================================================================
+# Perfil de Arranque (python -X importtime)
+# ==============================================================================
+# Ejecuta create_app() en un proceso limpio con -X importtime y resume qué
+# módulos consumen el tiempo de importación, el tiempo total y cuántos módulos
+# quedan cargados.
+#
+#   python startup_profile.py
+#   python startup_profile.py --top 30 --filter app.
+# ==============================================================================
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "from app import create_app\n"
+    "create_app()\n"
+    "print(f'STARTUP {time.perf_counter() - start:.6f} {len(sys.modules)}')\n"
+)
+
+
+def measure_startup(importtime=False):
+    """
+    Mide create_app() en un subproceso.
+
+    Returns:
+        tuple(float, int, list): Segundos, módulos cargados y filas de importtime
+        (self_us, cumulative_us, módulo).
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', PROBE]
+    result = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+
+    seconds = modules = None
+    for line in result.stdout.splitlines():
+        if line.startswith('STARTUP '):
+            _, seconds, modules = line.split()
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return float(seconds), int(modules), rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumen de -X importtime para create_app()")
+    parser.add_argument('--top', type=int, default=20, help='Módulos a mostrar')
+    parser.add_argument('--filter', help='Solo módulos que empiecen con este prefijo (ej: app.)')
+    args = parser.parse_args(argv)
+
+    seconds, modules, rows = measure_startup(importtime=True)
+    if args.filter:
+        rows = [r for r in rows if r[2].startswith(args.filter)]
+
+    print(f"create_app(): {seconds * 1000:.1f} ms (con -X importtime), {modules} módulos cargados\n")
+    print(f"{'acumulado ms':>13}{'propio ms':>11}  módulo")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>13.1f}{self_us / 1000:>11.1f}  {name}")
+
+    print(f"\n{'propio ms':>13}  módulos más costosos por sí mismos")
+    for self_us, _, name in sorted(rows, key=lambda r: r[0], reverse=True)[:args.top // 2]:
+        print(f"{self_us / 1000:>13.1f}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
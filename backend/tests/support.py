@@ -0,0 +1,37 @@
+import unittest
+from app import create_app, db
+from app.config.config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Caso base para pruebas que necesitan base de datos.
+    Usa SQLite en memoria y crea/destruye las tablas en cada prueba.
+    """
+    config_class = TestConfig
+
+    def setUp(self):
+        self.app = create_app(self.config_class)
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def register_and_login(self, username='admin', role='admin'):
+        """Registra un usuario y devuelve los headers con su token JWT."""
+        email = f"{username}@example.com"
+        self.client.post('/api/auth/register', json={
+            'username': username, 'email': email, 'password': 'secret', 'role': role
+        })
+        resp = self.client.post('/api/auth/login', json={'email': email, 'password': 'secret'})
+        return {'Authorization': f"Bearer {resp.get_json()['access_token']}"}
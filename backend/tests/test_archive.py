@@ -0,0 +1,200 @@
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from app import db
+from app.models import ArchivedMonth, ArchivedVehicleMonth, OrderItemArchive, Payment, WorkOrder, WorkOrderArchive
+from app.services import archive_service
+from app.services.archive_service import ArchiveService
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from support import DatabaseTestCase
+
+
+class ArchiveTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.app.config['ARCHIVE_DIR'] = self.directory
+        self.headers = self.register_and_login()
+        self.client_id = ClientService.create_client('Ana', 'Pérez').id
+        self.vehicle_id = ClientService.add_vehicle(self.client_id, 'ABC123', 'Toyota', 'Corolla', 2015).id
+        self.service_id = service_id = OrderService.create_service('Frenos', 100).id
+
+        # Enero y febrero de 2024: entregadas y pagadas, salvo una con saldo;
+        # marzo de 2024 queda activa (sin entregar)
+        self.ids = []
+        for created_at, status, paid in [(datetime(2024, 1, 5), 'entregado', 100),
+                                         (datetime(2024, 1, 20), 'entregado', 60),
+                                         (datetime(2024, 2, 10), 'entregado', 100),
+                                         (datetime(2024, 3, 1), 'finalizado', 0)]:
+            order = OrderService.create_order(self.vehicle_id, user_id=1)
+            OrderService.add_order_item(order.id, service_id)
+            if paid:
+                PaymentService.register_payment(order, paid, 'efectivo')
+            order.created_at, order.status = created_at, status
+            db.session.commit()
+            self.ids.append(order.id)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.directory)
+
+    def get(self, url, **params):
+        resp = self.client.get(url, query_string=params, headers=self.headers)
+        self.assertEqual(resp.status_code, 200, resp.get_json())
+        return resp.get_json()
+
+    def history(self, limit=2, vehicle_id=None):
+        orders, cursor = [], None
+        while True:
+            params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+            page = self.get(f'/api/vehicles/{vehicle_id or self.vehicle_id}/history', **params)
+            orders += page['orders']
+            cursor = page['next_cursor']
+            if not cursor:
+                return orders
+
+    def payment_pages(self, limit, **params):
+        payments, cursor = [], None
+        while True:
+            page = self.get('/api/payments/history', limit=limit, **params, **({'cursor': cursor} if cursor else {}))
+            payments += page['payments']
+            cursor = page['next_cursor']
+            if not cursor:
+                return payments
+
+    def read_files(self, func, *args, **kwargs):
+        """Resultado de func y los archivos exportados que abrió."""
+        with mock.patch.object(archive_service, '_read_file', wraps=archive_service._read_file) as read:
+            result = func(*args, **kwargs)
+        return result, [call.args[1] for call in read.call_args_list]
+
+    def test_archive_moves_closed_orders(self):
+        revenue = self.get('/api/payments/revenue')
+        self.assertEqual(ArchiveService.archive_before(date(2024, 3, 1)), {'2024-01': 1, '2024-02': 1})
+
+        archived = {self.ids[0], self.ids[2]}
+        self.assertFalse(WorkOrder.query.filter(WorkOrder.id.in_(archived)).count())
+        self.assertEqual(Payment.query.count(), 1)  # solo el de la orden con saldo
+        self.assertEqual(OrderItemArchive.query.count(), 2)
+        self.assertEqual(db.session.get(ArchivedMonth, date(2024, 1, 1)).orders, 1)
+
+        # El historial, los pagos y los reportes siguen viendo las órdenes archivadas
+        orders = self.history()
+        self.assertEqual([o['id'] for o in orders], self.ids[::-1])
+        self.assertEqual([o.get('archived', False) for o in orders], [False, True, False, True])
+        self.assertEqual(orders[1]['items'][0]['service_name'], 'Frenos')
+        self.assertEqual(self.get('/api/payments/revenue'), revenue)
+        self.assertEqual(len(self.get('/api/payments/history')), 3)
+
+        # Repetir no archiva nada nuevo
+        self.assertEqual(ArchiveService.archive_before(date(2024, 3, 1)), {})
+
+    def test_summaries_include_archived_orders(self):
+        def summaries():
+            vehicle = self.get(f'/api/vehicles/{self.vehicle_id}/history', summary=1)['summary']
+            client = self.get(f'/api/clients/{self.client_id}/summary')
+            return ({key: vehicle[key] for key in ('total_orders', 'lifetime_spend', 'total_paid', 'last_visit')},
+                    {key: client[key] for key in ('order_count', 'total_billed', 'total_paid',
+                                                  'outstanding_balance', 'last_visit')})
+
+        before = summaries()
+        self.assertEqual(before[0]['total_orders'], 4)
+        ArchiveService.archive_month(date(2024, 1, 1))
+        self.assertEqual(summaries(), before)
+        ArchiveService.archive_month(date(2024, 2, 1))
+        ArchiveService.export_month(date(2024, 2, 1), self.directory)
+        self.assertEqual(summaries(), before)
+
+        # La orden más reciente archivada: la última visita sale del índice
+        order = db.session.get(WorkOrder, self.ids[3])
+        order.status = 'entregado'
+        PaymentService.register_payment(order, 100, 'efectivo')
+        db.session.commit()
+        db.session.remove()
+        expected = summaries()
+        ArchiveService.archive_month(date(2024, 3, 1))
+        ArchiveService.export_month(date(2024, 3, 1), self.directory)
+        self.assertIsNone(db.session.get(WorkOrder, self.ids[3]))
+        self.assertEqual(summaries(), expected)
+        self.assertEqual(expected[0]['last_visit'], '2024-03-01T00:00:00')
+
+    def test_exported_months_are_still_readable(self):
+        ArchiveService.archive_before(date(2024, 3, 1))
+        self.assertEqual(ArchiveService.export_month(date(2024, 1, 1), self.directory), 1)
+        self.assertEqual(ArchiveService.export_month(date(2024, 1, 1), self.directory), 0)
+        self.assertEqual(WorkOrderArchive.query.count(), 1)  # solo febrero sigue en la tabla
+        self.assertEqual(db.session.get(ArchivedMonth, date(2024, 1, 1)).file, 'orders-2024-01.jsonl.gz')
+
+        for limit in (1, 3, 10):
+            self.assertEqual([o['id'] for o in self.history(limit)], self.ids[::-1])
+        payments = self.get('/api/payments/history')
+        self.assertEqual(sorted(p['work_order_id'] for p in payments), sorted([self.ids[0], self.ids[1], self.ids[2]]))
+
+    def test_history_opens_only_the_months_it_needs(self):
+        # Pagos al día siguiente de cada orden y otro vehículo con una orden en enero
+        other = ClientService.add_vehicle(self.client_id, 'XYZ789', 'Ford', 'Fiesta', 2012).id
+        order = OrderService.create_order(other, user_id=1)
+        OrderService.add_order_item(order.id, self.service_id)
+        PaymentService.register_payment(order, 100, 'tarjeta')
+        order.created_at, order.status = datetime(2024, 1, 25), 'entregado'
+        order_id = order.id
+        for payment in Payment.query:
+            payment.created_at = db.session.get(WorkOrder, payment.work_order_id).created_at + timedelta(days=1)
+        db.session.commit()
+        ArchiveService.archive_before(date(2024, 3, 1))
+        for month in (date(2024, 1, 1), date(2024, 2, 1)):
+            ArchiveService.export_month(month, self.directory)
+        self.assertEqual({(row.vehicle_id, row.month) for row in ArchivedVehicleMonth.query},
+                         {(self.vehicle_id, date(2024, 1, 1)), (self.vehicle_id, date(2024, 2, 1)),
+                          (other, date(2024, 1, 1))})
+        self.assertEqual(db.session.get(ArchivedMonth, date(2024, 2, 1)).first_payment_at, datetime(2024, 2, 11))
+
+        orders, files = self.read_files(self.history, limit=10, vehicle_id=other)
+        self.assertEqual([o['id'] for o in orders], [order_id])
+        self.assertEqual(files, ['orders-2024-01.jsonl.gz'])
+
+        page, files = self.read_files(self.get, '/api/payments/history', **{'from': '2024-02-01', 'to': '2024-02-29'})
+        self.assertEqual([p['work_order_id'] for p in page['payments']], [self.ids[2]])
+        self.assertEqual(files, ['orders-2024-02.jsonl.gz'])
+        # Con el más reciente ya alcanza: los meses siguientes terminan antes
+        payments, files = self.read_files(ArchiveService.get_archived_payments, self.directory, limit=1)
+        self.assertEqual([p['work_order_id'] for p in payments], [self.ids[2]])
+        self.assertEqual(files, ['orders-2024-02.jsonl.gz'])
+
+        # Paginado da lo mismo que la lista completa
+        full = self.get('/api/payments/history')
+        self.assertEqual(len(full), 4)
+        for limit in (1, 3):
+            self.assertEqual(self.payment_pages(limit), full)
+        self.assertEqual([p['work_order_id'] for p in self.payment_pages(1, to='2024-01-31')],
+                         [order_id, self.ids[1], self.ids[0]])
+
+        # Un mes exportado sin índice (antes de la migración 0013) se lee
+        # siempre, hasta que se vuelve a exportar
+        january = db.session.get(ArchivedMonth, date(2024, 1, 1))
+        january.indexed, january.first_payment_at, january.last_payment_at = False, None, None
+        ArchivedVehicleMonth.query.filter_by(month=january.month).delete()
+        db.session.commit()
+        _, files = self.read_files(self.get, '/api/payments/history', **{'from': '2024-02-01'})
+        self.assertEqual(sorted(files), ['orders-2024-01.jsonl.gz', 'orders-2024-02.jsonl.gz'])
+        self.assertEqual([o['id'] for o in self.history(limit=10, vehicle_id=other)], [order_id])
+
+        self.assertEqual(ArchiveService.export_month(date(2024, 1, 1), self.directory), 0)
+        self.assertTrue(db.session.get(ArchivedMonth, date(2024, 1, 1)).indexed)
+        _, files = self.read_files(self.get, '/api/payments/history', **{'from': '2024-02-01'})
+        self.assertEqual(files, ['orders-2024-02.jsonl.gz'])
+
+    def test_current_month_cannot_be_archived(self):
+        today = datetime.utcnow()
+        with self.assertRaises(ValueError):
+            ArchiveService.archive_month(date(today.year, today.month, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from flask import g
+from flask_jwt_extended import JWTManager
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from support import DatabaseTestCase, TestConfig
+
+
+class BatchTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        client = ClientService.create_client('Ana', 'Pérez')
+        vehicle = ClientService.add_vehicle(client.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        self.service = OrderService.create_service('Frenos', 80)
+        self.order = OrderService.create_order(vehicle.id, user_id=1)
+
+    def batch(self, requests, **extra):
+        return self.client.post('/api/batch', json={'requests': requests, **extra}, headers=self.headers)
+
+    def test_order_detail_screen_in_one_request(self):
+        resp = self.batch([
+            {'id': 'order', 'path': f'/api/orders/{self.order.id}'},
+            {'id': 'services', 'path': '/api/services'},
+            {'id': 'payments', 'path': '/api/payments/history'},
+            {'id': 'technicians', 'path': '/api/users/technicians'},
+        ])
+        self.assertEqual(resp.status_code, 200)
+        responses = {r['id']: r for r in resp.get_json()['responses']}
+        self.assertEqual([r['status'] for r in responses.values()], [200] * 4)
+        self.assertEqual(responses['order']['body']['vehicle_info']['plate'], 'ABC123')
+        self.assertEqual(responses['services']['body'][0]['name'], 'Frenos')
+
+    def test_writes_run_in_order_and_errors_stay_per_request(self):
+        resp = self.batch([
+            {'method': 'POST', 'path': f'/api/orders/{self.order.id}/items', 'body': {'service_id': self.service.id}},
+            {'path': f'/api/orders/{self.order.id}?x=1'},
+            {'path': '/api/no-existe'},
+            {'method': 'POST', 'path': '/api/orders/999/items', 'body': {'service_id': self.service.id}},
+        ])
+        statuses = [r['status'] for r in resp.get_json()['responses']]
+        self.assertEqual(statuses, [201, 200, 404, 404])
+        self.assertEqual(resp.get_json()['responses'][1]['body']['total'], 80)
+        self.assertEqual(resp.get_json()['responses'][0]['id'], 0)
+
+    def test_subrequests_use_the_batch_token(self):
+        resp = self.client.post('/api/batch', json={'requests': [{'path': '/api/services'}]})
+        self.assertEqual(resp.status_code, 401)
+        resp = self.batch([{'path': '/api/payments/history', 'headers': {'Authorization': 'Bearer malo'}}])
+        self.assertEqual(resp.get_json()['responses'][0]['status'], 422)
+
+    def test_batch_token_is_decoded_once(self):
+        other = self.register_and_login('otro', role='recepcion')
+        decode = JWTManager._decode_jwt_from_config
+        with mock.patch.object(JWTManager, '_decode_jwt_from_config', autospec=True, side_effect=decode) as spy:
+            resp = self.batch([
+                {'path': '/api/auth/me'},
+                {'path': '/api/services'},
+                {'path': '/api/auth/me', 'headers': other},
+            ])
+        responses = resp.get_json()['responses']
+        self.assertEqual([r['body']['username'] for r in (responses[0], responses[2])], ['admin', 'otro'])
+        # Una vez el lote y otra la sub-petición con su propio token
+        self.assertEqual(spy.call_count, 2)
+
+    def test_subrequests_get_their_own_g(self):
+        seen = []
+        view = self.app.view_functions['auth.get_current_user']
+
+        def spy(*args, **kwargs):
+            seen.append(set(vars(g)))
+            g.leak = True
+            return view(*args, **kwargs)
+
+        self.app.view_functions['auth.get_current_user'] = spy
+        resp = self.batch([{'path': '/api/auth/me'}, {'path': '/api/auth/me'}])
+        self.assertEqual([r['status'] for r in resp.get_json()['responses']], [200, 200])
+        self.assertEqual(len(seen), 2)
+        for names in seen:
+            self.assertNotIn('leak', names)
+            # before_request corrió en la sub-petición (métricas)
+            self.assertIn('_request_stats', names)
+
+    def test_event_stream_is_not_batched(self):
+        resp = self.batch([{'path': '/api/orders/events'}])
+        self.assertEqual(resp.get_json()['responses'][0]['status'], 400)
+
+    def test_invalid_batches(self):
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch([{'path': '/api/batch'}]).status_code, 400)
+        self.assertEqual(self.batch([{'path': 'http://otro/api/x'}]).status_code, 400)
+        self.assertEqual(self.batch([{'path': '/api/services'}] * 21).status_code, 400)
+
+
+class ParallelBatchTests(DatabaseTestCase):
+    """Cada hilo usa su propia conexión: base en archivo temporal."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'batch.db')
+
+        class Config(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        self.config_class = Config
+        super().setUp()
+        self.headers = self.register_and_login()
+        for i in range(3):
+            OrderService.create_service(f'Servicio {i}', 10 * (i + 1))
+
+    def tearDown(self):
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def test_parallel_reads(self):
+        requests = [{'path': f'/api/services/{i}'} for i in (1, 2, 3)] + [{'path': '/api/payments/history'}]
+        resp = self.client.post('/api/batch', json={'requests': requests, 'parallel': True}, headers=self.headers)
+        responses = resp.get_json()['responses']
+        self.assertEqual([r['status'] for r in responses], [200] * 4)
+        self.assertEqual([r['body']['base_price'] for r in responses[:3]], [10, 20, 30])
+
+
+if __name__ == '__main__':
+    unittest.main()
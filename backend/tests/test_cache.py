@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+
+from app.utils.cache import Cache, MemoryBackend, has_shared_invalidation
+from support import DatabaseTestCase
+
+
+class MemoryBackendTests(unittest.TestCase):
+
+    def test_lru_eviction_and_ttl(self):
+        backend = MemoryBackend(max_entries=2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')          # 'b' pasa a ser la menos usada
+        backend.set('c', 3)
+        self.assertEqual(backend.get('b'), (False, None))
+        self.assertEqual(backend.get('a'), (True, 1))
+
+        backend.set('d', 4, ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(backend.get('d'), (False, None))
+
+    def test_single_flight(self):
+        cache = Cache(MemoryBackend())
+        calls = []
+
+        def slow_producer():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'valor'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_set('k', slow_producer)))
+            for _ in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['valor'] * 20)
+
+
+class CachedEndpointTests(DatabaseTestCase):
+
+    def test_services_hit_and_tag_invalidation(self):
+        headers = self.register_and_login()
+        self.assertEqual(self.client.get('/api/services').headers['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/services').headers['X-Cache'], 'HIT')
+
+        self.client.post('/api/services', json={'name': 'Frenos', 'base_price': 80}, headers=headers)
+        resp = self.client.get('/api/services')
+        self.assertEqual(resp.headers['X-Cache'], 'MISS')
+        self.assertEqual([s['name'] for s in resp.get_json()], ['Frenos'])
+
+        counter = self.app.extensions['metrics'].counter('cache_requests_total', '')
+        self.assertEqual(counter.value(('services', 'hit')), 1)
+        self.assertEqual(counter.value(('services', 'miss')), 2)
+
+    def test_memory_backend_is_not_shared_between_workers(self):
+        self.assertTrue(has_shared_invalidation(self.app, workers=1))
+        self.assertFalse(has_shared_invalidation(self.app, workers=4))
+        self.app.extensions['cache'].backend.shared = True  # como RedisBackend
+        self.assertTrue(has_shared_invalidation(self.app, workers=4))
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/clients/1').status_code, 404)
+        headers = self.register_and_login()
+        self.client.post('/api/clients', json={'first_name': 'Ana', 'last_name': 'Pérez'}, headers=headers)
+        self.assertEqual(self.client.get('/api/clients/1').status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
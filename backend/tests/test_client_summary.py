@@ -0,0 +1,74 @@
+import unittest
+
+from sqlalchemy import event
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from support import DatabaseTestCase
+
+
+class ClientSummaryTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        self.client_id = ClientService.create_client('Ana', 'Pérez').id
+        self.service = OrderService.create_service('Frenos', 80)
+
+    def add_vehicle_with_order(self, plate, status='pendiente'):
+        vehicle = ClientService.add_vehicle(self.client_id, plate, 'Toyota', 'Corolla', 2015)
+        order = OrderService.create_order(vehicle.id, user_id=1)
+        OrderService.add_order_item(order.id, self.service.id)
+        if status != 'pendiente':
+            OrderService.update_order_status(order.id, status)
+        return order
+
+    def get_summary(self):
+        return self.client.get(f'/api/clients/{self.client_id}/summary', headers=self.headers)
+
+    def count_queries(self):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            self.assertEqual(self.get_summary().status_code, 200)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return len(statements)
+
+    def test_summary_and_balance(self):
+        self.add_vehicle_with_order('AAA111')
+        paid = self.add_vehicle_with_order('BBB222', status='entregado')
+        self.client.post('/api/payments/', json={
+            'work_order_id': paid.id, 'amount': 50, 'payment_method': 'efectivo', 'status': 'pagado'
+        }, headers=self.headers)
+
+        data = self.get_summary().get_json()
+        self.assertEqual(len(data['vehicles']), 2)
+        self.assertEqual([o['vehicle_plate'] for o in data['open_orders']], ['AAA111'])
+        self.assertEqual(data['total_billed'], 160)
+        self.assertEqual(data['outstanding_balance'], 110)
+        self.assertIsNotNone(data['last_visit'])
+
+    def test_query_count_does_not_grow(self):
+        self.add_vehicle_with_order('AAA111')
+        few = self.count_queries()
+        for plate in ('BBB222', 'CCC333', 'DDD444'):
+            self.add_vehicle_with_order(plate)
+        self.assertEqual(self.count_queries(), few)
+
+    def test_cache_invalidated_by_writes(self):
+        self.assertEqual(self.get_summary().get_json()['vehicles'], [])
+        self.add_vehicle_with_order('AAA111')
+        self.assertEqual(len(self.get_summary().get_json()['open_orders']), 1)
+
+        self.client.put(f'/api/clients/{self.client_id}', json={'phone': '555'}, headers=self.headers)
+        self.assertEqual(self.get_summary().get_json()['client']['phone'], '555')
+
+    def test_unknown_client(self):
+        self.assertEqual(self.client.get('/api/clients/999/summary', headers=self.headers).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from sqlalchemy import event
+
+from app import db
+from app.models import Client, OrderItem, Payment, SyncTombstone, Vehicle, WorkOrder
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from support import DatabaseTestCase
+
+
+class DeleteTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        self.client_id = ClientService.create_client('Flota', 'SA').id
+        service = OrderService.create_service('Frenos', 100)
+        self.vehicle_ids = []
+        for plate in ('AAA111', 'BBB222'):
+            vehicle = ClientService.add_vehicle(self.client_id, plate, 'Ford', 'Ranger', 2020)
+            self.vehicle_ids.append(vehicle.id)
+            for _ in range(5):
+                order = OrderService.create_order(vehicle.id, user_id=1)
+                OrderService.add_order_item(order.id, service.id)
+                PaymentService.register_payment(order, 50, 'efectivo')
+        db.session.remove()
+
+    def count(self, model):
+        return db.session.query(model).count()
+
+    def delete(self, url):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            resp = self.client.delete(url, headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(resp.status_code, 200, resp.get_json())
+        return [s for s in statements if 'users' not in s]
+
+    def test_client_delete_cascades_in_constant_statements(self):
+        statements = self.delete(f'/api/clients/{self.client_id}')
+        # cliente + tombstones (pagos, items, órdenes, vehículos, cliente) + un DELETE
+        self.assertEqual(len(statements), 7, statements)
+        self.assertEqual([self.count(m) for m in (Client, Vehicle, WorkOrder, OrderItem, Payment)], [0] * 5)
+        entities = dict(db.session.query(SyncTombstone.entity, db.func.count()).group_by(SyncTombstone.entity))
+        self.assertEqual(entities, {'clients': 1, 'vehicles': 2, 'work_orders': 10,
+                                    'order_items': 10, 'payments': 10})
+
+    def test_vehicle_delete_keeps_other_vehicles(self):
+        self.delete(f'/api/vehicles/{self.vehicle_ids[0]}')
+        self.assertEqual(self.count(Vehicle), 1)
+        self.assertEqual(self.count(WorkOrder), 5)
+        self.assertEqual(self.count(Payment), 5)
+
+    def test_soft_delete_hides_client_and_vehicles(self):
+        self.delete(f'/api/clients/{self.client_id}?soft=1')
+        self.assertEqual(self.count(WorkOrder), 10)
+        self.assertIsNotNone(db.session.get(Vehicle, self.vehicle_ids[1]).deleted_at)
+
+        resp = self.client.get('/api/clients', headers=self.headers)
+        self.assertEqual(resp.get_json(), [])
+        resp = self.client.get(f'/api/vehicles/{self.vehicle_ids[0]}/history', headers=self.headers)
+        self.assertEqual(resp.status_code, 404)
+        with self.assertRaises(ValueError):
+            OrderService.create_order(self.vehicle_ids[0], user_id=1)
+
+    def test_soft_deleted_records_release_their_unique_values(self):
+        ClientService.update_client(self.client_id, {'email': 'flota@example.com'})
+        ClientService.update_vehicle(self.vehicle_ids[0], {'vin': 'VIN-1'})
+        self.delete(f'/api/clients/{self.client_id}?soft=1')
+
+        client = ClientService.create_client('Flota', 'Nueva', email='flota@example.com')
+        vehicle = ClientService.add_vehicle(client.id, 'AAA111', 'Ford', 'Ranger', 2020, vin='VIN-1')
+        # Entre los activos siguen siendo únicos
+        with self.assertRaisesRegex(ValueError, 'email'):
+            ClientService.create_client('Otro', 'Cliente', email='flota@example.com')
+        with self.assertRaisesRegex(ValueError, 'placa'):
+            ClientService.add_vehicle(client.id, 'AAA111', 'Ford', 'Ranger', 2020)
+        # La búsqueda por placa encuentra el vehículo activo
+        OrderService.create_order(vehicle.id, user_id=1)
+        resp = self.client.get('/api/orders?plate=AAA111', headers=self.headers)
+        self.assertEqual({o['vehicle_id'] for o in resp.get_json()['orders']}, {vehicle.id})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from sqlalchemy import event
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from support import DatabaseTestCase
+
+
+class FieldsetTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        client = ClientService.create_client('Ana', 'Pérez')
+        self.vehicle = ClientService.add_vehicle(client.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        service = OrderService.create_service('Frenos', 80)
+        for _ in range(3):
+            order = OrderService.create_order(self.vehicle.id, user_id=1)
+            OrderService.add_order_item(order.id, service.id)
+            PaymentService.register_payment(order, 50, 'efectivo')
+
+    def get(self, url, **params):
+        db.session.remove()  # sesión limpia, como en una petición real
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            resp = self.client.get(url, query_string=params, headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return resp, [s for s in statements if 'users' not in s]  # sin la consulta del JWT
+
+    def test_default_response_is_unchanged(self):
+        resp, statements = self.get('/api/orders')
+        order = resp.get_json()[0]
+        self.assertEqual(set(order), {'id', 'vehicle_id', 'user_id', 'status', 'total', 'amount_paid',
+                                      'balance', 'created_at', 'items', 'vehicle_plate'})
+        self.assertEqual(order['vehicle_plate'], 'ABC123')
+        self.assertEqual(order['items'][0]['service_name'], 'Frenos')
+        # órdenes + vehículo (JOIN) e items + servicio (JOIN): sin N+1
+        self.assertEqual(len(statements), 2, statements)
+
+    def test_board_fields_drive_the_select(self):
+        resp, statements = self.get('/api/orders', fields='id,status,total,vehicle_plate', include='')
+        self.assertEqual(resp.get_json()[0], {'id': 3, 'status': 'pendiente', 'total': 80, 'vehicle_plate': 'ABC123'})
+        self.assertEqual(len(statements), 1, statements)
+        self.assertNotIn('amount_paid', statements[0])
+        self.assertNotIn('order_items', statements[0])
+
+    def test_include_relations(self):
+        resp, statements = self.get('/api/orders', fields='id', include='items,payments')
+        order = resp.get_json()[0]
+        self.assertEqual(set(order), {'id', 'items', 'payments'})
+        self.assertEqual(order['payments'][0]['amount'], 50)
+        self.assertEqual(len(statements), 3, statements)
+
+        clients = self.get('/api/clients', fields='id,first_name', include='vehicles')[0].get_json()
+        self.assertEqual(clients[0]['vehicles'][0]['plate'], 'ABC123')
+        vehicles = self.get('/api/vehicles', fields='plate,client_name')[0].get_json()
+        self.assertEqual(vehicles, [{'plate': 'ABC123', 'client_name': 'Ana Pérez'}])
+
+    def test_unknown_fields_are_rejected(self):
+        self.assertEqual(self.get('/api/orders', fields='id,password_hash')[0].status_code, 400)
+        self.assertEqual(self.get('/api/clients', include='orders')[0].status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from sqlalchemy import func, text
+
+from app import db
+from app.migrations.versions import v0003_foreign_key_and_lookup_indexes as v0003
+from app.migrations.versions import v0004_work_orders_vehicle_created_at as v0004
+from app.migrations.versions import v0006_outstanding_orders_index as v0006
+from app.migrations.versions import v0009_updated_at_indexes as v0009
+from app.migrations.versions import v0010_work_orders_search_indexes as v0010
+from app.models import CarListing, OrderItem, Payment, User, Vehicle, WorkOrder
+from support import DatabaseTestCase
+
+
+class IndexUsageTests(DatabaseTestCase):
+    """Verifica con EXPLAIN QUERY PLAN que las consultas críticas usan índices."""
+
+    def explain(self, query):
+        sql = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+        rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+        return ' | '.join(row[-1] for row in rows)
+
+    def assertUsesIndex(self, query, index_name):
+        plan = self.explain(query)
+        self.assertIn(index_name, plan, plan)
+
+    def test_relationship_loads_use_fk_indexes(self):
+        self.assertUsesIndex(Vehicle.query.filter_by(client_id=1), 'ix_vehicles_client_id')
+        self.assertUsesIndex(WorkOrder.query.filter_by(vehicle_id=1), 'ix_work_orders_vehicle_id_created_at')
+        self.assertUsesIndex(OrderItem.query.filter_by(work_order_id=1), 'ix_order_items_work_order_id')
+        self.assertUsesIndex(Payment.query.filter_by(work_order_id=1), 'ix_payments_work_order_id')
+
+    def test_route_queries_use_lookup_indexes(self):
+        self.assertUsesIndex(
+            CarListing.query.filter_by(status='available').order_by(CarListing.created_at.desc()),
+            'ix_car_listings_status_created_at')
+        self.assertUsesIndex(
+            CarListing.query.filter_by(user_id=1).order_by(CarListing.created_at.desc()),
+            'ix_car_listings_user_id_created_at')
+        self.assertUsesIndex(WorkOrder.query.order_by(WorkOrder.created_at.desc()), 'ix_work_orders_created_at')
+        self.assertUsesIndex(User.query.filter_by(role='mecanico'), 'ix_users_role')
+        self.assertUsesIndex(
+            db.session.query(Payment.payment_method, func.sum(Payment.amount))
+            .filter(Payment.status == 'pagado').group_by(Payment.payment_method),
+            'COVERING INDEX ix_payments_status_method_amount')
+
+    def test_vehicle_history_uses_composite_index(self):
+        self.assertUsesIndex(
+            WorkOrder.query.filter_by(vehicle_id=1).order_by(WorkOrder.created_at.desc(), WorkOrder.id.desc()),
+            'ix_work_orders_vehicle_id_created_at')
+
+    def test_outstanding_orders_use_partial_index(self):
+        self.assertUsesIndex(
+            WorkOrder.query.filter(WorkOrder.balance > 0).order_by(WorkOrder.created_at, WorkOrder.id),
+            'ix_work_orders_outstanding')
+
+    def test_order_search_uses_composite_indexes(self):
+        newest_first = (WorkOrder.created_at.desc(), WorkOrder.id.desc())
+        for column, value, index_name in [
+            (WorkOrder.status, 'pendiente', 'ix_work_orders_status_created_at'),
+            (WorkOrder.user_id, 1, 'ix_work_orders_user_id_created_at'),
+            (WorkOrder.vehicle_id, 1, 'ix_work_orders_vehicle_id_created_at'),
+        ]:
+            query = WorkOrder.query.filter(column == value, WorkOrder.created_at >= '2025-01-01')\
+                .order_by(*newest_first)
+            plan = self.explain(query)
+            self.assertIn(index_name, plan, plan)
+            self.assertNotIn('TEMP B-TREE', plan)  # el índice ya entrega el orden
+
+    def test_sync_queries_use_updated_at_indexes(self):
+        self.assertUsesIndex(
+            WorkOrder.query.filter(WorkOrder.updated_at > '2025-01-01').order_by(WorkOrder.updated_at, WorkOrder.id),
+            'ix_work_orders_updated_at')
+
+    def test_migration_matches_model_indexes(self):
+        declared = {index.name for table in db.metadata.tables.values() for index in table.indexes}
+        dropped = {name for name, _, _ in v0004.DROPPED + v0010.DROPPED}
+        created = {index[0] for index in
+                   v0003.INDEXES + v0004.INDEXES + v0006.INDEXES + v0009.INDEXES + v0010.INDEXES}
+        self.assertTrue(created - dropped <= declared)
+        self.assertFalse(dropped & declared)
+
+
+if __name__ == '__main__':
+    unittest.main()
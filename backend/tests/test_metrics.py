@@ -0,0 +1,65 @@
+import unittest
+from support import DatabaseTestCase, TestConfig
+
+
+class ServerTimingConfig(TestConfig):
+    SERVER_TIMING_ENABLED = True
+
+
+class MetricsTests(DatabaseTestCase):
+    config_class = ServerTimingConfig
+
+    def test_records_sql_queries_per_route(self):
+        headers = self.register_and_login()
+        self.client.get('/api/orders', headers=headers)
+
+        registry = self.app.extensions['metrics']
+        labels = ('GET', '/api/orders')
+        self.assertEqual(registry.request_duration.count(labels), 1)
+        self.assertGreaterEqual(registry.sql_queries.sum(labels), 1)
+
+        body = self.client.get('/metrics').get_data(as_text=True)
+        self.assertIn('http_request_sql_queries_count{method="GET",route="/api/orders"} 1', body)
+        self.assertIn('http_requests_total{method="POST",route="/api/auth/login",status="200"} 1', body)
+
+    def test_metrics_require_allowed_ip_or_token(self):
+        self.app.config.update(METRICS_ALLOWED_IPS='', METRICS_TOKEN='scrape-token')
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        resp = self.client.get('/metrics', headers={'Authorization': 'Bearer otro'})
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+        self.assertEqual(resp.status_code, 200)
+
+        self.app.config['METRICS_PUBLIC'] = True
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_server_timing_header(self):
+        resp = self.client.get('/api/health')
+        self.assertIn('db;dur=', resp.headers.get('Server-Timing', ''))
+
+
+class DiagnosticsConfig(TestConfig):
+    SLOW_QUERY_THRESHOLD_MS = 0.000001
+    PROFILING_ENABLED = True
+
+
+class DiagnosticsTests(DatabaseTestCase):
+    config_class = DiagnosticsConfig
+
+    def test_slow_query_log_includes_route(self):
+        with self.assertLogs('app.slow_query', level='WARNING') as logs:
+            self.client.get('/api/services')
+        self.assertTrue(any('GET /api/services' in line for line in logs.output))
+
+    def test_profile_requires_admin(self):
+        headers = self.register_and_login('mec', role='mecanico')
+        resp = self.client.get('/api/orders?__profile=1', headers=headers)
+        self.assertTrue(resp.is_json)
+
+        headers = self.register_and_login('admin', role='admin')
+        resp = self.client.get('/api/orders?__profile=1', headers=headers)
+        self.assertIn('cumulative', resp.get_data(as_text=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
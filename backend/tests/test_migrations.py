@@ -0,0 +1,187 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, inspect
+
+from app import create_app, db
+from app.migrations import MigrationRunner, Operations
+from support import TestConfig
+
+
+class MigrationRunnerTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.path}")
+        self.app = create_app(TestConfig)
+        self.runner = MigrationRunner(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def test_upgrade_is_recorded_and_idempotent(self):
+        with self.app.app_context():
+            applied = self.runner.upgrade()
+            self.assertEqual([m.revision for m in applied], [m.revision for m in self.runner.discover()])
+            self.assertEqual(self.runner.upgrade(), [])
+            self.assertEqual(self.runner.pending(), [])
+
+        tables = inspect(self.engine).get_table_names()
+        self.assertIn('work_orders', tables)
+        self.assertIn('schema_migrations', tables)
+
+    def test_initial_revision_is_the_pre_migration_schema(self):
+        with self.app.app_context():
+            self.runner.upgrade('0001')
+        inspector = inspect(self.engine)
+        self.assertEqual(set(inspector.get_table_names()) - {'schema_migrations'},
+                         {'users', 'clients', 'vehicles', 'services', 'work_orders', 'order_items', 'payments',
+                          'car_listings'})
+        columns = {c['name'] for c in inspector.get_columns('work_orders')}
+        self.assertEqual(columns, {'id', 'vehicle_id', 'user_id', 'status', 'total', 'created_at'})
+
+    def test_replayed_history_matches_the_models(self):
+        """Un cambio en app/models.py sin su migración hace fallar esta prueba."""
+        def schema(engine):
+            inspector = inspect(engine)
+            result = {}
+            for table in inspector.get_table_names():
+                if table == 'schema_migrations':
+                    continue
+                result[table] = (
+                    sorted((c['name'], str(c['type']), c['nullable'], str(c['default']))
+                           for c in inspector.get_columns(table)),
+                    sorted((i['name'], tuple(i['column_names']), bool(i['unique']),
+                            str(i['dialect_options'].get('sqlite_where', ''))) for i in inspector.get_indexes(table)),
+                    sorted(tuple(u['column_names']) for u in inspector.get_unique_constraints(table)),
+                    sorted((tuple(f['constrained_columns']), f['referred_table'], f['options'].get('ondelete'))
+                           for f in inspector.get_foreign_keys(table)),
+                )
+            return result
+
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        models_engine = create_engine(f"sqlite:///{path}")
+        try:
+            with self.app.app_context():
+                self.runner.upgrade()
+                db.metadata.create_all(models_engine)
+            self.assertEqual(schema(self.engine), schema(models_engine))
+        finally:
+            models_engine.dispose()
+            os.remove(path)
+
+    def test_downgrade_reverts_later_revisions(self):
+        with self.app.app_context():
+            self.runner.upgrade('0002')
+            reverted = self.runner.downgrade('0001')
+        self.assertEqual([m.revision for m in reverted], ['0002'])
+        columns = [c['name'] for c in inspect(self.engine).get_columns('clients')]
+        self.assertNotIn('user_id', columns)
+
+    def test_rebuild_table_keeps_rows(self):
+        with self.app.app_context():
+            self.runner.upgrade()
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "INSERT INTO services (name, description, base_price) VALUES ('Frenos', '', 10)")
+                op = Operations(conn)
+                op.rebuild_table(db.metadata.tables['services'])
+                op.create_index('ix_services_name', 'services', ['name'])
+                self.assertTrue(op.has_index('services', 'ix_services_name'))
+                self.assertEqual(conn.exec_driver_sql("SELECT name FROM services").scalar(), 'Frenos')
+
+    def test_balance_backfill_from_payments(self):
+        with self.app.app_context():
+            self.runner.upgrade()
+            self.runner.downgrade('0004')
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "INSERT INTO users (id, username, email, password_hash, role) VALUES (1, 'a', 'a@x', 'x', 'admin')")
+                conn.exec_driver_sql("INSERT INTO clients (id, first_name, last_name) VALUES (1, 'Ana', 'Pérez')")
+                conn.exec_driver_sql(
+                    "INSERT INTO vehicles (id, client_id, plate, brand, model, year) VALUES (1, 1, 'A1', 'B', 'M', 2015)")
+                conn.exec_driver_sql(
+                    "INSERT INTO work_orders (id, vehicle_id, user_id, status, total) VALUES (1, 1, 1, 'finalizado', 100)")
+                conn.exec_driver_sql(
+                    "INSERT INTO payments (work_order_id, amount, payment_method, status) VALUES "
+                    "(1, 30, 'efectivo', 'pagado'), (1, 20, 'tarjeta', 'pendiente')")
+            self.runner.upgrade()
+
+        with self.engine.connect() as conn:
+            row = conn.exec_driver_sql("SELECT amount_paid, balance FROM work_orders WHERE id = 1").one()
+        self.assertEqual(tuple(row), (30, 70))
+
+    def test_updated_at_backfill(self):
+        with self.app.app_context():
+            self.runner.upgrade('0007')
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql("INSERT INTO clients (id, first_name, last_name, created_at) "
+                                     "VALUES (1, 'Ana', 'Pérez', '2025-01-01 10:00:00.000000')")
+                conn.exec_driver_sql("INSERT INTO services (name, base_price) VALUES ('Frenos', 10)")
+            self.runner.upgrade()
+
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT updated_at FROM clients").scalar(),
+                             '2025-01-01 10:00:00.000000')
+            self.assertIsNotNone(conn.exec_driver_sql("SELECT updated_at FROM services").scalar())
+        indexes = {i['name'] for i in inspect(self.engine).get_indexes('services')}
+        self.assertIn('ix_services_updated_at', indexes)
+
+    def test_cascade_foreign_keys(self):
+        def ondelete(table):
+            return {fk['referred_table']: fk['options'].get('ondelete')
+                    for fk in inspect(self.engine).get_foreign_keys(table)}
+
+        with self.app.app_context():
+            self.runner.upgrade()
+            self.runner.downgrade('0011')
+            self.assertEqual(ondelete('work_orders')['vehicles'], None)
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql("INSERT INTO users (id, username, email, password_hash, role) "
+                                     "VALUES (1, 'admin', 'a@example.com', 'x', 'admin')")
+                conn.exec_driver_sql("INSERT INTO clients (id, first_name, last_name) VALUES (1, 'Ana', 'Pérez')")
+                conn.exec_driver_sql("INSERT INTO vehicles (id, client_id, plate, brand, model, year) "
+                                     "VALUES (1, 1, 'ABC123', 'Toyota', 'Corolla', 2015)")
+                conn.exec_driver_sql("INSERT INTO work_orders (id, vehicle_id, user_id) VALUES (1, 1, 1)")
+            self.runner.upgrade()
+
+        self.assertEqual(ondelete('vehicles')['clients'], 'CASCADE')
+        self.assertEqual(ondelete('order_items')['work_orders'], 'CASCADE')
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+            self.assertEqual(conn.exec_driver_sql("SELECT COUNT(*) FROM work_orders").scalar(), 1)
+            conn.exec_driver_sql("DELETE FROM clients WHERE id = 1")
+            self.assertEqual(conn.exec_driver_sql("SELECT COUNT(*) FROM work_orders").scalar(), 0)
+
+    def test_archive_index_backfill(self):
+        with self.app.app_context():
+            self.runner.upgrade()
+            self.runner.downgrade('0012')
+            with self.engine.begin() as conn:
+                # Enero sigue en las tablas de archivo; febrero ya estaba exportado
+                conn.exec_driver_sql("INSERT INTO archived_months (month, orders, revenue, archived_at, file) VALUES "
+                                     "('2024-01-01', 1, '{}', '2024-03-01 00:00:00', NULL), "
+                                     "('2024-02-01', 1, '{}', '2024-03-01 00:00:00', 'orders-2024-02.jsonl.gz')")
+                conn.exec_driver_sql("INSERT INTO work_orders_archive (id, created_at, vehicle_id, user_id, "
+                                     "amount_paid, balance, archived_at) VALUES "
+                                     "(1, '2024-01-05 10:00:00.000000', 7, 1, 0, 0, '2024-03-01 00:00:00')")
+                conn.exec_driver_sql("INSERT INTO payments_archive (id, order_created_at, work_order_id, amount, "
+                                     "payment_method, created_at) VALUES "
+                                     "(1, '2024-01-05 10:00:00.000000', 1, 10, 'efectivo', '2024-01-06 09:00:00.000000')")
+            self.runner.upgrade()
+
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql("SELECT month, first_payment_at, indexed FROM archived_months "
+                                        "ORDER BY month").all()
+            self.assertEqual([tuple(row) for row in rows], [('2024-01-01', '2024-01-06 09:00:00.000000', 1),
+                                                            ('2024-02-01', None, 0)])
+            self.assertEqual(conn.exec_driver_sql("SELECT vehicle_id, month, orders, last_order_at "
+                                                  "FROM archived_vehicle_months").all(),
+                             [(7, '2024-01-01', 1, '2024-01-05 10:00:00.000000')])
+
+
+if __name__ == '__main__':
+    unittest.main()
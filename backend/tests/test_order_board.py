@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import event
+
+from app import db
+from app.services import order_service
+from app.services.client_service import ClientService
+from app.services.order_service import ORDER_STATUSES, OrderService
+from support import DatabaseTestCase
+
+
+class OrderBoardTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        ana = ClientService.create_client('Ana', 'Pérez')
+        luis = ClientService.create_client('Luis', 'Gómez')
+        corolla = ClientService.add_vehicle(ana.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        fiesta = ClientService.add_vehicle(luis.id, 'XYZ789', 'Ford', 'Fiesta', 2012)
+
+        # 5 pendientes, 2 en progreso, 1 finalizada (ninguna entregada)
+        statuses = ['pendiente'] * 5 + ['en_progreso'] * 2 + ['finalizado']
+        orders = []
+        for i, status in enumerate(statuses):
+            order = OrderService.create_order((corolla if i % 2 == 0 else fiesta).id, user_id=1)
+            order.created_at = datetime(2025, 4, 1) + timedelta(days=i)
+            order.status = status
+            orders.append(order)
+        db.session.commit()
+        self.ids = [order.id for order in orders]
+
+    def board(self, **params):
+        db.session.remove()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            resp = self.client.get('/api/orders/board', query_string=params, headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(resp.status_code, 200, resp.get_json())
+        return resp.get_json()['columns'], [s for s in statements if 'users' not in s]
+
+    def test_counts_and_newest_orders_per_status(self):
+        columns, statements = self.board(limit=3)
+        self.assertEqual(len(statements), 1, statements)  # conteos y top-N en una consulta
+
+        self.assertEqual([c['status'] for c in columns], list(ORDER_STATUSES))
+        self.assertEqual([c['count'] for c in columns], [5, 2, 1, 0])
+        pending = columns[0]['orders']
+        self.assertEqual([o['id'] for o in pending], [self.ids[i] for i in (4, 3, 2)])
+        self.assertEqual((pending[0]['vehicle_plate'], pending[0]['client_name']), ('ABC123', 'Ana Pérez'))
+        self.assertEqual(pending[1]['client_name'], 'Luis Gómez')
+        self.assertEqual(columns[3]['orders'], [])
+
+    def test_fallback_without_window_functions(self):
+        expected = OrderService.get_board(3)
+        with mock.patch.object(order_service, '_supports_window_functions', return_value=False):
+            self.assertEqual(OrderService.get_board(3), expected)
+
+    def test_status_change_invalidates_cached_board(self):
+        self.board()
+        _, statements = self.board()
+        self.assertEqual(statements, [])  # servido desde la caché
+
+        resp = self.client.put(f'/api/orders/{self.ids[0]}/status',
+                               json={'status': 'entregado'}, headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        columns, _ = self.board()
+        self.assertEqual([c['count'] for c in columns], [4, 2, 1, 1])
+        self.assertEqual(columns[3]['orders'][0]['id'], self.ids[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from support import DatabaseTestCase, TestConfig
+
+
+def parse_events(body):
+    """Convierte el texto SSE en una lista de (id, event, data)."""
+    events = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class OrderEventsTests(DatabaseTestCase):
+    """El hilo lector usa su propia conexión: base en archivo temporal."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'events.db')
+
+        class Config(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+            EVENTS_POLL_INTERVAL = 0.05
+            EVENTS_STREAM_TIMEOUT = 0.5
+            EVENTS_HEARTBEAT = 0.1
+
+        self.config_class = Config
+        super().setUp()
+        self.headers = self.register_and_login()
+        client = ClientService.create_client('Ana', 'Pérez')
+        self.vehicle = ClientService.add_vehicle(client.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        self.service = OrderService.create_service('Frenos', 80)
+
+    def tearDown(self):
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def test_resume_from_last_event_id(self):
+        order = OrderService.create_order(self.vehicle.id, user_id=1)
+        OrderService.add_order_item(order.id, self.service.id)
+        OrderService.update_order_status(order.id, 'en_progreso')
+
+        resp = self.client.get('/api/orders/events', headers={**self.headers, 'Last-Event-ID': '0'})
+        self.assertEqual(resp.mimetype, 'text/event-stream')
+        events = parse_events(resp.get_data(as_text=True))
+        self.assertEqual([e[1] for e in events], ['order_created', 'order_item_added', 'order_status_changed'])
+        self.assertEqual(events[1][2]['data']['total'], 80)
+        self.assertEqual(events[2][2]['data'], {'status': 'en_progreso', 'previous_status': 'pendiente'})
+
+        # Reanudar desde el primer evento solo reenvía los posteriores
+        resp = self.client.get(f'/api/orders/events?last_event_id={events[0][0]}', headers=self.headers)
+        self.assertEqual([e[0] for e in parse_events(resp.get_data(as_text=True))], [events[1][0], events[2][0]])
+
+    def ticket(self):
+        resp = self.client.post('/api/orders/events/ticket', headers=self.headers)
+        self.assertEqual(resp.status_code, 200)
+        return resp.get_json()['ticket']
+
+    def test_live_events_with_stream_ticket(self):
+        resp = self.client.get(f'/api/orders/events?ticket={self.ticket()}', buffered=False)
+        self.assertEqual(resp.status_code, 200)
+        chunks = iter(resp.response)
+        self.assertTrue(next(chunks).startswith(b'retry:'))
+
+        order = OrderService.create_order(self.vehicle.id, user_id=1)
+        received = []
+        for chunk in chunks:
+            received += parse_events(chunk.decode())
+            if received:
+                break
+        resp.close()
+        self.assertEqual(received[0][1], 'order_created')
+        self.assertEqual(received[0][2]['work_order_id'], order.id)
+
+    def test_requires_token(self):
+        self.assertEqual(self.client.get('/api/orders/events').status_code, 401)
+        # El JWT no se acepta en el query string (quedaría en los logs de acceso)
+        token = self.headers['Authorization'].split()[1]
+        self.assertEqual(self.client.get(f'/api/orders/events?jwt={token}').status_code, 401)
+        self.assertEqual(self.client.get('/api/orders/events?ticket=falso').status_code, 401)
+        # Y el ticket no sirve como JWT
+        resp = self.client.get('/api/orders', headers={'Authorization': f'Bearer {self.ticket()}'})
+        self.assertIn(resp.status_code, (401, 422))
+
+    def test_concurrent_streams_are_capped(self):
+        self.app.extensions['order_events'].max_streams = 1
+        first = self.client.get('/api/orders/events', headers=self.headers, buffered=False)
+        self.assertEqual(first.status_code, 200)
+        busy = self.client.get('/api/orders/events', headers=self.headers)
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(busy.headers['Retry-After'], '10')
+
+        first.close()
+        resp = self.client.get('/api/orders/events', headers=self.headers, buffered=False)
+        self.assertEqual(resp.status_code, 200)
+        resp.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
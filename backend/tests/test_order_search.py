@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from support import DatabaseTestCase
+
+
+class OrderSearchTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        self.register_and_login('mecanico', role='mecanico')  # usuario 2
+        ana = ClientService.create_client('Ana', 'Pérez')
+        luis = ClientService.create_client('Luis', 'Gómez')
+        self.corolla = ClientService.add_vehicle(ana.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        self.fiesta = ClientService.add_vehicle(luis.id, 'XYZ789', 'Ford', 'Fiesta', 2012)
+        self.luis = luis
+
+        # 6 órdenes, una por día, alternando vehículo, estado y mecánico
+        self.orders = []
+        for i in range(6):
+            vehicle = self.corolla if i % 2 == 0 else self.fiesta
+            order = OrderService.create_order(vehicle.id, user_id=1 + i % 2)
+            order.created_at = datetime(2025, 3, 1) + timedelta(days=i)
+            order.status = 'finalizado' if i < 3 else 'pendiente'
+            self.orders.append(order)
+        db.session.commit()
+
+    def search(self, **params):
+        resp = self.client.get('/api/orders', query_string=params, headers=self.headers)
+        self.assertEqual(resp.status_code, 200, resp.get_json())
+        return resp.get_json()
+
+    def ids(self, *indexes):
+        return [self.orders[i].id for i in indexes]
+
+    def test_filters(self):
+        def found(**params):
+            return [o['id'] for o in self.search(fields='id', include='', **params)['orders']]
+
+        self.assertEqual(found(status='finalizado'), self.ids(2, 1, 0))
+        self.assertEqual(found(user_id=2), self.ids(5, 3, 1))
+        self.assertEqual(found(vehicle_id=self.corolla.id, status='pendiente'), self.ids(4))
+        self.assertEqual(found(plate='XYZ789'), self.ids(5, 3, 1))
+        self.assertEqual(found(plate='NOEXISTE'), [])
+        self.assertEqual(found(client_id=self.luis.id), self.ids(5, 3, 1))
+        self.assertEqual(found(**{'from': '2025-03-02', 'to': '2025-03-04'}), self.ids(3, 2, 1))
+
+    def test_cursor_pagination(self):
+        first = self.search(limit=4, fields='id,status', include='')
+        self.assertEqual([o['id'] for o in first['orders']], self.ids(5, 4, 3, 2))
+        second = self.search(limit=4, cursor=first['next_cursor'], fields='id', include='')
+        self.assertEqual([o['id'] for o in second['orders']], self.ids(1, 0))
+        self.assertIsNone(second['next_cursor'])
+
+    def test_without_search_params_returns_full_list(self):
+        resp = self.client.get('/api/orders', headers=self.headers)
+        self.assertEqual(len(resp.get_json()), 6)
+
+    def test_invalid_filters(self):
+        for params in ({'status': 'perdida'}, {'from': 'ayer'}, {'user_id': 'uno'}, {'cursor': 'basura'}):
+            resp = self.client.get('/api/orders', query_string=params, headers=self.headers)
+            self.assertEqual(resp.status_code, 400, params)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import WorkOrder
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from support import DatabaseTestCase
+
+
+class PaymentBalanceTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        client = ClientService.create_client('Ana', 'Pérez')
+        vehicle = ClientService.add_vehicle(client.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        service = OrderService.create_service('Frenos', 100)
+
+        self.orders = []
+        for i in range(3):
+            order = OrderService.create_order(vehicle.id, user_id=1)
+            order.created_at = datetime(2025, 1, 1) + timedelta(days=i)
+            OrderService.add_order_item(order.id, service.id)
+            self.orders.append(order)
+        db.session.commit()
+
+    def pay(self, order, amount, status='pagado'):
+        return self.client.post('/api/payments/', json={
+            'work_order_id': order.id, 'amount': amount, 'payment_method': 'efectivo', 'status': status
+        }, headers=self.headers)
+
+    def test_payment_updates_balance(self):
+        self.assertEqual(self.pay(self.orders[0], 40).status_code, 201)
+        self.pay(self.orders[0], 25, status='pendiente')  # no cuenta hasta que se pague
+
+        order = db.session.get(WorkOrder, self.orders[0].id)
+        db.session.refresh(order)
+        self.assertEqual((order.amount_paid, order.balance), (40, 60))
+        self.assertEqual(self.pay(self.orders[0], -5).status_code, 400)
+
+    def test_outstanding_orders(self):
+        self.pay(self.orders[1], 100)
+        self.pay(self.orders[2], 30)
+
+        first = self.client.get('/api/payments/outstanding?limit=1', headers=self.headers).get_json()
+        self.assertEqual([o['id'] for o in first['orders']], [self.orders[0].id])
+        self.assertEqual(first['summary'], {'orders': 2, 'total_outstanding': 170})
+
+        second = self.client.get(f"/api/payments/outstanding?cursor={first['next_cursor']}",
+                                 headers=self.headers).get_json()
+        self.assertEqual([(o['id'], o['balance']) for o in second['orders']], [(self.orders[2].id, 70)])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_reconcile_detects_and_repairs_drift(self):
+        self.pay(self.orders[0], 40)
+        db.session.execute(db.update(WorkOrder).where(WorkOrder.id == self.orders[1].id).values(balance=5))
+        db.session.commit()
+
+        report = PaymentService.reconcile(batch_size=2)
+        self.assertEqual((report['checked'], report['drifted'], report['repaired']), (3, 1, 0))
+        self.assertEqual(report['samples'][0]['expected_balance'], 100)
+
+        self.assertEqual(PaymentService.reconcile(repair=True)['repaired'], 1)
+        self.assertEqual(PaymentService.reconcile()['drifted'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
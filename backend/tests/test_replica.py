@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from app import create_app, db
+from app.models import Service
+from support import TestConfig
+
+
+class ReplicaTestCase(unittest.TestCase):
+    """Primario y réplica como dos archivos SQLite independientes."""
+    sticky_seconds = 0
+    replica_ok = True
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        primary = os.path.join(self.tmpdir, 'primary.db')
+        replica = os.path.join(self.tmpdir, 'replica.db')
+        if not self.replica_ok:
+            replica = os.path.join(self.tmpdir, 'no-existe', 'replica.db')
+
+        class Config(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{primary}"
+            SQLALCHEMY_REPLICA_URI = f"sqlite:///{replica}"
+            REPLICA_STICKY_SECONDS = self.sticky_seconds
+
+        self.app = create_app(Config)
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        if self.replica_ok:
+            db.metadata.create_all(self.app.extensions['replica'].engine())
+
+    def tearDown(self):
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        self.app.extensions['replica'].dispose()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir)
+
+    def admin_headers(self):
+        self.client.post('/api/auth/register', json={
+            'username': 'admin', 'email': 'admin@example.com', 'password': 'secret', 'role': 'admin'
+        })
+        # El login es POST: lee el usuario del primario
+        resp = self.client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'secret'})
+        return {'Authorization': f"Bearer {resp.get_json()['access_token']}"}
+
+    def add_service_to_primary(self):
+        db.session.add(Service(name='Cambio de aceite', base_price=30))
+        db.session.commit()
+        # Una sesión que ya escribió queda fijada al primario
+        db.session.remove()
+
+
+class ReplicaRoutingTests(ReplicaTestCase):
+
+    def test_get_reads_from_replica(self):
+        self.add_service_to_primary()
+        # La réplica (sin replicación real) sigue vacía
+        self.assertEqual(self.client.get('/api/services/1').status_code, 404)
+
+    def test_cache_fills_read_from_primary(self):
+        self.add_service_to_primary()
+        # Una réplica atrasada no debe quedar guardada en la caché durante el TTL
+        services = self.client.get('/api/services').get_json()
+        self.assertEqual([s['name'] for s in services], ['Cambio de aceite'])
+
+    def test_writes_go_to_primary(self):
+        headers = self.admin_headers()
+        resp = self.client.post('/api/services', json={'name': 'Frenos', 'base_price': 80}, headers=headers)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(Service.query.count(), 1)
+
+
+class ReadYourWritesTests(ReplicaTestCase):
+    sticky_seconds = 60
+
+    def test_reads_after_write_use_primary(self):
+        headers = self.admin_headers()
+        self.client.post('/api/services', json={'name': 'Frenos', 'base_price': 80}, headers=headers)
+        services = self.client.get('/api/services', headers=headers).get_json()
+        self.assertEqual([s['name'] for s in services], ['Frenos'])
+
+    def test_write_pins_only_its_user(self):
+        headers = self.admin_headers()
+        self.client.post('/api/auth/register', json={
+            'username': 'mec', 'email': 'mec@example.com', 'password': 'secret', 'role': 'mecanico'
+        })
+        resp = self.client.post('/api/auth/login', json={'email': 'mec@example.com', 'password': 'secret'})
+        other = {'Authorization': f"Bearer {resp.get_json()['access_token']}"}
+
+        # Misma IP (la del cliente de pruebas), otro usuario: sigue leyendo la réplica
+        self.client.post('/api/services', json={'name': 'Frenos', 'base_price': 80}, headers=headers)
+        db.session.remove()  # cada petición real tiene su sesión
+        self.assertEqual(self.client.get('/api/services/1', headers=other).status_code, 404)
+
+    def test_login_and_register_do_not_pin_the_ip(self):
+        self.admin_headers()
+        db.session.remove()
+        self.add_service_to_primary()
+        self.assertEqual(self.client.get('/api/services/1').status_code, 404)
+
+    def test_invalid_token_is_checked_once_per_request(self):
+        import flask_jwt_extended
+        verify = mock.Mock(side_effect=flask_jwt_extended.verify_jwt_in_request)
+        with mock.patch.object(flask_jwt_extended, 'verify_jwt_in_request', verify), \
+                self.app.test_request_context('/api/services', headers={'Authorization': 'Bearer vencido'}):
+            for _ in range(3):
+                Service.query.all()
+            db.session.remove()
+        self.assertEqual(verify.call_count, 1)
+
+
+class ReplicaSlowQueryTests(ReplicaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = 0.000001
+        from app.utils.profiling import init_slow_query_log
+        init_slow_query_log(self.app, db)
+
+    def test_replica_queries_are_logged(self):
+        with self.assertLogs('app.slow_query', level='WARNING') as logs:
+            self.assertEqual(self.client.get('/api/services/1').status_code, 404)
+        self.assertTrue(any('FROM services' in line for line in logs.output))
+
+
+class UnhealthyReplicaTests(ReplicaTestCase):
+    replica_ok = False
+
+    def test_falls_back_to_primary(self):
+        self.add_service_to_primary()
+        with self.assertLogs(self.app.logger, level='WARNING'):
+            resp = self.client.get('/api/services/1')
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(self.app.extensions['replica'].is_healthy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import unittest
+
+from app import create_app, db
+from support import TestConfig
+
+
+class SqlitePragmaTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'taller.db')
+
+        class FileConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+            SQLITE_MAINTENANCE_INTERVAL = 60
+
+        self.app = create_app(FileConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def pragma(self, name):
+        with db.engine.connect() as conn:
+            return conn.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+    def test_every_connection_gets_the_pragmas(self):
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('foreign_keys'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -65536)
+        self.assertEqual(self.pragma('mmap_size'), 256 * 1024 * 1024)
+
+    def test_maintenance_runs_when_a_connection_returns_to_the_pool(self):
+        maintenance = next(iter(self.app.extensions['sqlite_maintenance'].values()))
+        maintenance.last_run = time.monotonic() - 60  # intervalo vencido
+        self.pragma('journal_mode')
+        self.assertEqual(maintenance.runs, 1)
+        self.pragma('journal_mode')
+        self.assertEqual(maintenance.runs, 1)  # aún dentro del intervalo
+
+    def test_in_memory_database_has_no_maintenance(self):
+        app = create_app(TestConfig)
+        self.assertNotIn('sqlite_maintenance', app.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
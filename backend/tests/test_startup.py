@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import unittest
+
+from app import create_app
+from startup_profile import BACKEND_DIR, measure_startup
+from support import TestConfig
+
+# Presupuesto de arranque: holgado para CI, pero detecta importaciones pesadas nuevas
+STARTUP_BUDGET_SECONDS = 2.0
+STARTUP_MODULE_BUDGET = 700
+LAZY_MODULES = ('app.routes.ai', 'app.routes.marketplace', 'app.routes.users')
+
+
+class EagerConfig(TestConfig):
+    LAZY_BLUEPRINTS = False
+
+
+def route_table(app):
+    return {
+        (rule.rule, rule.endpoint, frozenset(rule.methods - {'HEAD', 'OPTIONS'}))
+        for rule in app.url_map.iter_rules()
+    }
+
+
+class StartupTests(unittest.TestCase):
+    def test_lazy_manifest_matches_blueprints(self):
+        self.assertEqual(route_table(create_app(TestConfig)), route_table(create_app(EagerConfig)))
+
+    def test_lazy_view_dispatches(self):
+        resp = create_app(TestConfig).test_client().post('/api/ai/ask', json={'question': 'hola'})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_create_app_within_budget(self):
+        seconds, modules, _ = measure_startup()
+        self.assertLess(seconds, STARTUP_BUDGET_SECONDS)
+        self.assertLess(modules, STARTUP_MODULE_BUDGET)
+
+    def test_rarely_used_blueprints_not_imported(self):
+        probe = ("import sys; from app import create_app; create_app(); "
+                 f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])")
+        output = subprocess.run([sys.executable, '-c', probe], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime
+
+from app import db
+from app.models import Service, SyncTombstone
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from support import DatabaseTestCase, TestConfig
+
+
+class SyncConfig(TestConfig):
+    SYNC_SETTLE_SECONDS = 0
+
+
+class SyncTests(DatabaseTestCase):
+    config_class = SyncConfig
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        self.client_row = ClientService.create_client('Ana', 'Pérez')
+        self.vehicle = ClientService.add_vehicle(self.client_row.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        self.service = OrderService.create_service('Frenos', 80)
+
+    def sync(self, **params):
+        resp = self.client.get('/api/sync', query_string=params, headers=self.headers)
+        self.assertEqual(resp.status_code, 200, resp.get_json())
+        return resp.get_json()
+
+    def test_only_changes_since_last_sync(self):
+        first = self.sync()
+        self.assertEqual(set(first['changes']), {'clients', 'vehicles', 'services'})
+        self.assertFalse(first['has_more'])
+        self.assertEqual(self.sync(since=first['next_since'])['changes'], {})
+
+        ClientService.update_client(self.client_row.id, {'phone': '555-1234'})
+        order = OrderService.create_order(self.vehicle.id, user_id=1)
+        OrderService.add_order_item(order.id, self.service.id)
+        second = self.sync(since=first['next_since'])
+        self.assertEqual(set(second['changes']), {'clients', 'work_orders', 'order_items'})
+        self.assertEqual(second['changes']['clients']['updated'][0]['phone'], '555-1234')
+        self.assertEqual(second['changes']['work_orders']['updated'][0]['total'], 80)
+
+        # El borrado en cascada (vehículo -> órdenes -> items) también deja tombstones
+        other_id = ClientService.add_vehicle(self.client_row.id, 'XYZ789', 'Ford', 'Fiesta', 2012).id
+        other_order = OrderService.create_order(other_id, user_id=1)
+        item, _ = OrderService.add_order_item(other_order.id, self.service.id)
+        order_id, item_id = other_order.id, item.id
+        since = self.sync(since=second['next_since'])['next_since']
+        ClientService.delete_vehicle(other_id)
+        third = self.sync(since=since, entities='vehicles,work_orders,order_items')
+        self.assertEqual(third['changes']['vehicles'], {'updated': [], 'deleted': [other_id]})
+        self.assertEqual(third['changes']['work_orders']['deleted'], [order_id])
+        self.assertEqual(third['changes']['order_items']['deleted'], [item_id])
+
+    def test_pages_rows_sharing_updated_at(self):
+        for i in range(4):
+            OrderService.create_service(f'Servicio {i}', 10)
+        # Misma fecha para todas las filas (como tras una actualización masiva)
+        db.session.execute(db.update(Service).values(updated_at=datetime(2025, 1, 1)))
+        db.session.commit()
+
+        seen, since = [], '2024-12-31T00:00:00'
+        while True:
+            page = self.sync(since=since, entities='services', limit=2)
+            seen += [row['id'] for row in page['changes'].get('services', {}).get('updated', [])]
+            since = page['next_since']
+            if not page['has_more']:
+                break
+        self.assertEqual(sorted(seen), [s.id for s in Service.query.order_by(Service.id)])
+
+    def test_tombstones_are_recorded_on_delete(self):
+        OrderService.delete_service(self.service.id)
+        tombstone = SyncTombstone.query.one()
+        self.assertEqual((tombstone.entity, tombstone.entity_id), ('services', self.service.id))
+
+    def test_invalid_parameters(self):
+        bad_since = self.client.get('/api/sync?since=basura', headers=self.headers)
+        self.assertEqual(bad_since.status_code, 400)
+        bad_entity = self.client.get('/api/sync?entities=users', headers=self.headers)
+        self.assertEqual(bad_entity.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
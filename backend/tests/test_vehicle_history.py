@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+from support import DatabaseTestCase
+
+
+class VehicleHistoryTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        client = ClientService.create_client('Ana', 'Pérez')
+        self.vehicle = ClientService.add_vehicle(client.id, 'ABC123', 'Toyota', 'Corolla', 2015)
+        oil = OrderService.create_service('Cambio de aceite', 30)
+        brakes = OrderService.create_service('Frenos', 80)
+
+        start = datetime(2025, 1, 1)
+        self.orders = []
+        for i, services in enumerate([[oil], [oil, brakes], [oil]]):
+            order = OrderService.create_order(self.vehicle.id, user_id=1)
+            order.created_at = start + timedelta(days=30 * i)
+            for service in services:
+                OrderService.add_order_item(order.id, service.id)
+            self.orders.append(order)
+        db.session.commit()
+        PaymentService.register_payment(self.orders[1], 110, 'tarjeta')
+
+    def get_history(self, **params):
+        return self.client.get(f'/api/vehicles/{self.vehicle.id}/history', query_string=params, headers=self.headers)
+
+    def test_cursor_pagination(self):
+        first = self.get_history(limit=2).get_json()
+        self.assertEqual([o['id'] for o in first['orders']], [self.orders[2].id, self.orders[1].id])
+        self.assertEqual(first['orders'][1]['amount_paid'], 110)
+        self.assertEqual(len(first['orders'][1]['items']), 2)
+
+        second = self.get_history(limit=2, cursor=first['next_cursor']).get_json()
+        self.assertEqual([o['id'] for o in second['orders']], [self.orders[0].id])
+        self.assertIsNone(second['next_cursor'])
+
+        self.assertEqual(self.get_history(cursor='basura').status_code, 400)
+
+    def test_summary_is_cached_and_invalidated(self):
+        summary = self.get_history(summary=1).get_json()['summary']
+        self.assertEqual(summary['total_orders'], 3)
+        self.assertEqual(summary['lifetime_spend'], 170)
+        self.assertEqual(summary['total_paid'], 110)
+        self.assertEqual(summary['last_visit'], '2025-03-02T00:00:00')
+        self.assertEqual(summary['most_frequent_service']['name'], 'Cambio de aceite')
+
+        self.client.post('/api/payments/', json={
+            'work_order_id': self.orders[0].id, 'amount': 30, 'payment_method': 'efectivo'
+        }, headers=self.headers)
+        self.assertEqual(self.get_history(summary=1).get_json()['summary']['total_paid'], 140)
+
+    def test_constant_number_of_queries(self):
+        db.session.remove()  # sesión limpia, como en una petición real
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            self.get_history()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        # vehículo + órdenes + items/servicios + pagos + meses archivados (ninguno)
+        self.assertEqual(len(statements), 5, statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.utils.writes import raise_constraint_error
+from support import DatabaseTestCase
+
+
+class SingleRoundTripWriteTests(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.headers = self.register_and_login()
+        self.client_id = ClientService.create_client('Ana', 'Pérez', email='ana@example.com').id
+        self.vehicle_id = ClientService.add_vehicle(self.client_id, 'ABC123', 'Toyota', 'Corolla', 2015).id
+        self.service_id = OrderService.create_service('Frenos', 100).id
+
+    def request(self, method, url, json, status):
+        db.session.remove()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            resp = getattr(self.client, method)(url, json=json, headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(resp.status_code, status, resp.get_json())
+        return resp.get_json(), [s for s in statements if not s.startswith('SELECT users')]
+
+    def test_register_is_a_single_insert(self):
+        body, statements = self.request('post', '/api/auth/register', {
+            'username': 'luis', 'email': 'luis@example.com', 'password': 'secret'}, 201)
+        self.assertEqual(len(statements), 1, statements)
+        self.assertEqual(body['user']['username'], 'luis')
+
+        body, _ = self.request('post', '/api/auth/register', {
+            'username': 'luis', 'email': 'otro@example.com', 'password': 'secret'}, 400)
+        self.assertEqual(body['msg'], "El nombre de usuario ya existe")
+        body, _ = self.request('post', '/api/auth/register', {
+            'username': 'otro', 'email': 'luis@example.com', 'password': 'secret'}, 400)
+        self.assertEqual(body['msg'], "El correo electrónico ya está registrado")
+
+    def test_add_vehicle_validates_owner_in_the_insert(self):
+        body, statements = self.request('post', f'/api/clients/{self.client_id}/vehicles', {
+            'plate': 'XYZ789', 'brand': 'Ford', 'model': 'Fiesta', 'year': 2012}, 201)
+        self.assertEqual(len(statements), 1, statements)
+        self.assertEqual(body['vehicle']['client_id'], self.client_id)
+
+        body, _ = self.request('post', f'/api/clients/{self.client_id}/vehicles', {
+            'plate': 'XYZ789', 'brand': 'Ford', 'model': 'Fiesta', 'year': 2012}, 400)
+        self.assertEqual(body['msg'], "La placa o el VIN ya existen")
+
+        # Un cliente con borrado lógico sigue existiendo para la FK, pero no admite vehículos
+        other = ClientService.create_client('Luis', 'Gómez').id
+        ClientService.delete_client(other, soft=True)
+        body, _ = self.request('post', f'/api/clients/{other}/vehicles', {
+            'plate': 'JKL456', 'brand': 'Ford', 'model': 'Ka', 'year': 2010}, 400)
+        self.assertEqual(body['msg'], "Cliente no encontrado")
+
+    def test_update_vehicle_owner_without_lookup(self):
+        other = ClientService.create_client('Luis', 'Gómez').id
+        body, statements = self.request('put', f'/api/vehicles/{self.vehicle_id}', {'client_id': other, 'year': 2016}, 200)
+        self.assertEqual(len(statements), 2, statements)  # SELECT del vehículo + UPDATE
+        self.assertEqual((body['vehicle']['client_id'], body['vehicle']['year']), (other, 2016))
+
+        body, _ = self.request('put', f'/api/vehicles/{self.vehicle_id}', {'client_id': 999}, 400)
+        self.assertEqual(body['msg'], "El cliente asignado no existe")
+
+    def test_reference_from_json_string_keeps_the_column_type(self):
+        other = ClientService.create_client('Luis', 'Gómez').id
+        body, _ = self.request('put', f'/api/vehicles/{self.vehicle_id}', {'client_id': str(other)}, 200)
+        self.assertEqual(body['vehicle']['client_id'], other)
+        body, _ = self.request('post', f'/api/clients/{other}/vehicles', {
+            'plate': 'XYZ789', 'brand': 'Ford', 'model': 'Fiesta', 'year': 2012}, 201)
+        self.assertIsInstance(body['vehicle']['client_id'], int)
+
+    def test_add_order_item_without_update_returning(self):
+        # SQLite < 3.35: synchronize_session='fetch' lee el total con un SELECT
+        order_id = OrderService.create_order(self.vehicle_id, user_id=1).id
+        with mock.patch.object(db.engine.dialect, 'update_returning', False):
+            body, _ = self.request('post', f'/api/orders/{order_id}/items', {'service_id': self.service_id}, 201)
+        self.assertEqual(body['order_total'], 100)
+
+    def test_add_order_item_returns_total_from_update(self):
+        order_id = OrderService.create_order(self.vehicle_id, user_id=1).id
+        for expected in (100, 200):
+            body, statements = self.request('post', f'/api/orders/{order_id}/items',
+                                            {'service_id': self.service_id}, 201)
+            self.assertEqual(body['order_total'], expected)
+        self.assertEqual(len(statements), 5, statements)
+        self.assertFalse([s for s in statements if s.startswith('SELECT work_orders.total')])
+
+    def test_postgres_constraint_messages(self):
+        def error(message):
+            return IntegrityError('INSERT', {}, Exception(message))
+
+        messages = {'vehicles.client_id': 'cliente', 'vehicles.plate': 'placa'}
+        with self.assertRaisesRegex(ValueError, 'placa'):
+            raise_constraint_error(error('duplicate key value violates unique constraint "vehicles_plate_key"'),
+                                   messages)
+        with self.assertRaisesRegex(ValueError, 'cliente'):
+            raise_constraint_error(error('null value in column "client_id" of relation "vehicles" '
+                                         'violates not-null constraint'), messages)
+        with self.assertRaises(IntegrityError):
+            raise_constraint_error(error('check constraint "otra" failed'), messages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import requests
 import time
 
-BASE_URL = "http://127.0.0.1:5000"
+BASE_URL = "http://127.0.0.1:5000/api"
 
 def verify_ai():
     print("Iniciando prueba de AI Endpoint...")
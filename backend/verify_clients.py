@@ -2,7 +2,7 @@ import requests
 import time
 import random
 
-BASE_URL = "http://127.0.0.1:5000"
+BASE_URL = "http://127.0.0.1:5000/api"
 
 def verify_clients_vehicles():
     print("Iniciando pruebas de Clientes y Vehículos...")
@@ -2,7 +2,7 @@ import requests
 import random
 import time
 
-BASE_URL = "http://127.0.0.1:5000"
+BASE_URL = "http://127.0.0.1:5000/api"
 
 def verify_orders_workflow():
     print("Iniciando pruebas de Órdenes y Servicios...")
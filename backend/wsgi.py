@@ -0,0 +1,11 @@
+from app import create_app
+
+# ==============================================================================
+# Punto de Entrada WSGI (Producción)
+# ==============================================================================
+# Usado por gunicorn (Linux) y waitress (Windows):
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#   python serve.py
+# ==============================================================================
+
+app = create_app()
@@ -6,29 +6,35 @@ const OrdersPage = () => {
     const [orders, setOrders] = useState([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
+    const [status, setStatus] = useState('');
+    const [nextCursor, setNextCursor] = useState(null);
 
-    useEffect(() => {
-        const fetchOrders = async () => {
-            try {
-                // I am assuming this endpoint exists based on standard CRUD practices.
-                // If it creates a 404, I will advise the user to implement it in the backend.
-                const response = await api.get('/orders');
-                setOrders(response.data);
-                setLoading(false);
-            } catch (err) {
-                console.error("Error fetching orders", err);
-                // Fallback or nice error
-                if (err.response && err.response.status === 404) {
-                    setError("El endpoint GET /orders no está implementado en el backend. Lista no disponible.");
-                } else {
-                    setError("No se pudieron cargar las órdenes.");
-                }
-                setLoading(false);
+    // Filtra y pagina en el backend: solo los campos que muestra la tabla (sin items embebidos)
+    const fetchOrders = async (cursor = null) => {
+        try {
+            const params = { fields: 'id,vehicle_id,vehicle_plate,total,status,created_at', include: '', limit: 50 };
+            if (status) params.status = status;
+            if (cursor) params.cursor = cursor;
+            const response = await api.get('/orders', { params });
+            setOrders(prev => cursor ? [...prev, ...response.data.orders] : response.data.orders);
+            setNextCursor(response.data.next_cursor);
+            setLoading(false);
+        } catch (err) {
+            console.error("Error fetching orders", err);
+            // Fallback or nice error
+            if (err.response && err.response.status === 404) {
+                setError("El endpoint GET /orders no está implementado en el backend. Lista no disponible.");
+            } else {
+                setError("No se pudieron cargar las órdenes.");
             }
-        };
+            setLoading(false);
+        }
+    };
 
+    useEffect(() => {
+        setLoading(true);
         fetchOrders();
-    }, []);
+    }, [status]);
 
     const getStatusBadge = (status) => {
         const styles = {
@@ -56,6 +62,20 @@ const OrdersPage = () => {
                 </Link>
             </div>
 
+            <div className="mb-4">
+                <select
+                    value={status}
+                    onChange={(e) => setStatus(e.target.value)}
+                    className="border border-gray-300 rounded px-3 py-2 text-sm"
+                >
+                    <option value="">Todos los estados</option>
+                    <option value="pendiente">Pendiente</option>
+                    <option value="en_progreso">En progreso</option>
+                    <option value="finalizado">Finalizado</option>
+                    <option value="entregado">Entregado</option>
+                </select>
+            </div>
+
             {error && (
                 <div className="bg-orange-100 border-l-4 border-orange-500 text-orange-700 p-4 mb-4" role="alert">
                     <p>{error}</p>
@@ -106,6 +126,17 @@ const OrdersPage = () => {
                     </tbody>
                 </table>
             </div>
+
+            {nextCursor && !loading && (
+                <div className="mt-4 text-center">
+                    <button
+                        onClick={() => fetchOrders(nextCursor)}
+                        className="text-blue-600 hover:text-blue-900 text-sm font-semibold"
+                    >
+                        Cargar más
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
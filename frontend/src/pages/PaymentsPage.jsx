@@ -4,19 +4,24 @@ import api from '../api/axios';
 const PaymentsPage = () => {
     const [payments, setPayments] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState(null);
 
-    useEffect(() => {
-        const fetchPayments = async () => {
-            try {
-                const response = await api.get('/payments/history');
-                setPayments(response.data);
-            } catch (error) {
-                console.error("Error fetching payments", error);
-            } finally {
-                setLoading(false);
-            }
-        };
+    // Paginado en el backend: cada página solo lee los meses archivados que necesita
+    const fetchPayments = async (cursor = null) => {
+        try {
+            const params = { limit: 50 };
+            if (cursor) params.cursor = cursor;
+            const response = await api.get('/payments/history', { params });
+            setPayments(prev => cursor ? [...prev, ...response.data.payments] : response.data.payments);
+            setNextCursor(response.data.next_cursor);
+        } catch (error) {
+            console.error("Error fetching payments", error);
+        } finally {
+            setLoading(false);
+        }
+    };
 
+    useEffect(() => {
         fetchPayments();
     }, []);
 
@@ -85,6 +90,17 @@ const PaymentsPage = () => {
                     </div>
                 )}
             </div>
+
+            {nextCursor && !loading && (
+                <div className="mt-4 text-center">
+                    <button
+                        onClick={() => fetchPayments(nextCursor)}
+                        className="text-blue-600 hover:text-blue-900 text-sm font-semibold"
+                    >
+                        Cargar más
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
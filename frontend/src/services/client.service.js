@@ -27,6 +27,16 @@ const ClientService = {
         } catch (error) {
             throw error;
         }
+    },
+
+    // Cliente, vehículos, órdenes abiertas y saldo pendiente en una sola petición
+    getClientSummary: async (clientId) => {
+        try {
+            const response = await api.get(`/clients/${clientId}/summary`);
+            return response.data;
+        } catch (error) {
+            throw error;
+        }
     }
 };
 
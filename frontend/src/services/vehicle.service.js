@@ -10,6 +10,18 @@ const VehicleService = {
     }
   },
 
+  // Historial paginado por cursor: pasar next_cursor de la respuesta anterior
+  getVehicleHistory: async (id, { cursor, limit, summary } = {}) => {
+    try {
+      const response = await api.get(`/vehicles/${id}/history`, {
+        params: { cursor, limit, summary: summary ? 1 : undefined }
+      });
+      return response.data;
+    } catch (error) {
+      throw error;
+    }
+  },
+
   createVehicle: async (vehicleData) => {
     try {
       // vehicleData expects: { client_id, plate, brand, model, year, vin }
@@ -1,7 +1,7 @@
 # start_all.ps1
 Write-Host "Iniciando Sistema Full Stack..." -ForegroundColor Green
 
-# 1. Iniciar Backend
+# 1. Iniciar Backend (servidor de desarrollo; en producción usar "python serve.py")
 Write-Host "Procesando Backend..." -ForegroundColor Cyan
 Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd backend; .\venv\Scripts\activate; python run.py"
 